@@ -4,18 +4,18 @@ import os
 from flask import Flask, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
 from dotenv import load_dotenv
 
 from lumus.config.database import db
 from lumus.config.config import Config
 from lumus.routes import register_blueprints
-from lumus.models.base import BaseModel
-from lumus.models.schedule import Schedule
-from lumus.models.course import Course
-from lumus.models.student import Student
-from lumus.models.user import User
-from lumus.models.lab import Lab
+from lumus.commands import register_commands
+from lumus.utils.instrumentation import register_instrumentation
+from lumus.utils.metrics import register_metrics
+from lumus.utils.ratelimit import register_rate_limits
+from lumus.utils.compression import register_compression
+from lumus.utils.outbox import register_outbox
+from lumus.utils.jobs import register_jobs
 
 load_dotenv()
 
@@ -27,14 +27,14 @@ def create_app(config_class=Config):
     app.url_map.strict_slashes = False
 
     db.init_app(app)
-    migrate = Migrate(app, db)
+    import lumus.models  # noqa: F401 - register every table on db.metadata
     jwt = JWTManager(app)
     
     # CORS configuration for development
     CORS(app, 
          origins=["http://localhost:3000", "http://localhost:5173", "http://localhost:5174", 
                   "http://127.0.0.1:3000", "http://127.0.0.1:5173", "http://127.0.0.1:5174"],
-         allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin"],
+         allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin", "Idempotency-Key"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
          supports_credentials=True
     )
@@ -49,7 +49,7 @@ def create_app(config_class=Config):
             if 'Access-Control-Allow-Origin' not in response.headers:
                 response.headers['Access-Control-Allow-Origin'] = origin
             if 'Access-Control-Allow-Headers' not in response.headers:
-                response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization,X-Requested-With,Accept,Origin'
+                response.headers['Access-Control-Allow-Headers'] = 'Content-Type,Authorization,X-Requested-With,Accept,Origin,Idempotency-Key'
             if 'Access-Control-Allow-Methods' not in response.headers:
                 response.headers['Access-Control-Allow-Methods'] = 'GET,POST,PUT,DELETE,OPTIONS,PATCH'
             if 'Access-Control-Allow-Credentials' not in response.headers:
@@ -57,6 +57,13 @@ def create_app(config_class=Config):
         return response
 
     register_blueprints(app)
+    register_commands(app)
+    register_instrumentation(app)
+    register_metrics(app)
+    register_rate_limits(app)
+    register_compression(app)
+    register_outbox(app)
+    register_jobs(app)
 
     return app
 
@@ -0,0 +1,12 @@
+"""
+Lumus performance benchmarks.
+
+Run from the ``lumus`` directory::
+
+    python -m benchmarks                 # micro + load, compared to baseline.json
+    python -m benchmarks micro --save-baseline
+    python -m benchmarks load --url http://localhost:3001 --concurrency 16
+
+Exits with status 1 when a result regresses past ``--threshold`` and with
+status 2 when there is no baseline to compare against.
+"""
@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+from benchmarks.compression import run_compression
+from benchmarks.enrollment import run_enrollment_stress
+from benchmarks.fixtures import create_benchmark_app
+from benchmarks.load import AppClient, HttpClient, run_load
+from benchmarks.micro import run_micro
+from benchmarks.startup import check_budget, run_startup
+from benchmarks.stats import compare_to_baseline, format_results, load_baseline, save_baseline
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Lumus API benchmarks')
+    parser.add_argument('suite', nargs='?', choices=['micro', 'load', 'startup', 'enrollment', 'compression', 'all'], default='all')
+    parser.add_argument('--iterations', type=int, default=2000, help='calls per micro-benchmark')
+    parser.add_argument('--flows', type=int, default=200, help='booking flows in the load scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients')
+    parser.add_argument('--schedules', type=int, default=2000, help='seeded schedules')
+    parser.add_argument('--startup-runs', type=int, default=5, help='cold starts to measure')
+    parser.add_argument('--startup-budget-ms', type=float,
+                        default=float(os.environ.get('STARTUP_BUDGET_MS', 1000)),
+                        help='maximum median import + create_app time')
+    parser.add_argument('--compression-iterations', type=int, default=20,
+                        help='requests per endpoint and encoding in the compression benchmark')
+    parser.add_argument('--capacity', type=int, default=50, help='course capacity in the enrollment stress test')
+    parser.add_argument('--url', help='run the load scenario against a running server instead of in-process')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--threshold', type=float,
+                        default=float(os.environ.get('BENCHMARK_THRESHOLD', 0.2)),
+                        help='allowed regression as a fraction (0.2 = 20%%)')
+    parser.add_argument('--save-baseline', action='store_true', help='store results as the new baseline')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {}
+    failures = []
+
+    if args.suite in ('startup', 'all'):
+        startup_results, slowest_imports = run_startup(args.startup_runs)
+        results.update(startup_results)
+        print('Slowest imports (-X importtime):')
+        for module, cumulative_ms in slowest_imports:
+            print(f"  {module:<40} {cumulative_ms:>8.1f} ms")
+        print()
+        budget_failure = check_budget(startup_results, args.startup_budget_ms)
+        if budget_failure:
+            failures.append(budget_failure)
+
+    if args.suite in ('micro', 'load', 'enrollment', 'compression', 'all'):
+        app = create_benchmark_app(schedules=args.schedules)
+        lab_nicknames = app.config['BENCHMARK_LABS']
+        course_codes = app.config['BENCHMARK_COURSES']
+
+        try:
+            if args.suite in ('micro', 'all'):
+                results.update(run_micro(app, args.iterations))
+
+            if args.suite in ('load', 'all'):
+                make_client = (lambda: HttpClient(args.url)) if args.url else (lambda: AppClient(app))
+                results.update(run_load(make_client, lab_nicknames, course_codes,
+                                        concurrency=args.concurrency, flows=args.flows))
+
+            if args.suite in ('enrollment', 'all'):
+                enrollment_results, enrollment_failure = run_enrollment_stress(
+                    app, capacity=args.capacity, attempts=args.capacity * 8,
+                    concurrency=args.concurrency
+                )
+                results.update(enrollment_results)
+                print(f"Enrollments per second: "
+                      f"{enrollment_results['enrollment.stress']['enrollments_per_second']:.1f}")
+                if enrollment_failure:
+                    failures.append(enrollment_failure)
+
+            if args.suite in ('compression', 'all'):
+                results.update(run_compression(app, args.compression_iterations))
+        finally:
+            os.remove(app.config['BENCHMARK_DB_PATH'])
+
+    print(format_results(results))
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline before "
+              f"using the results as a regression gate", file=sys.stderr)
+        return 2
+    else:
+        baseline = load_baseline(args.baseline)
+        unchecked = sorted(set(results) - set(baseline))
+        if unchecked:
+            print(f"\nWarning: no baseline for {', '.join(unchecked)}; these results were not checked",
+                  file=sys.stderr)
+        failures.extend(compare_to_baseline(results, baseline, args.threshold))
+
+    if failures:
+        print(f"\nFailures (regression threshold {args.threshold:.0%}):")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import gzip
+from time import perf_counter
+from flask_jwt_extended import create_access_token
+from lumus.models import User
+from lumus.utils.compression import available_encodings
+from benchmarks.fixtures import BENCHMARK_ADMIN_EMAIL
+from benchmarks.stats import summarize
+
+
+# name -> (bandwidth in bits per second, round-trip time in seconds)
+LINKS = {
+    '3g': (1_600_000, 0.150),
+    'dsl': (8_000_000, 0.030),
+    'lan': (100_000_000, 0.002)
+}
+
+
+def _decoders():
+    decoders = {'gzip': gzip.decompress, 'identity': lambda data: data}
+    try:
+        import brotli
+        decoders['br'] = brotli.decompress
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        decoders['zstd'] = lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    except ImportError:
+        pass
+    return decoders
+
+
+def _fetch(client, path, headers):
+    response = client.get(path, headers=headers, buffered=False)
+    body = b''.join(response.response)
+    response.close()
+    return response, body
+
+
+def run_compression(app, iterations=20):
+    """Measure response size and server latency per encoding and estimate transfer time on slow links"""
+    with app.app_context():
+        user = User.get_by_email(BENCHMARK_ADMIN_EMAIL)
+        token = create_access_token(identity=str(user.id))
+
+    lab = app.config['BENCHMARK_LABS'][0]
+    endpoints = {
+        'public': '/api/schedules/public',
+        'by_lab': f'/api/schedules/by-lab/{lab}',
+        'export_csv': '/api/schedules/export'
+    }
+    encodings = ['identity'] + available_encodings(app.config.get('COMPRESSION_ENCODINGS', ['gzip']))
+    decoders = _decoders()
+    client = app.test_client()
+
+    results, rows = {}, []
+    for endpoint, path in endpoints.items():
+        for encoding in encodings:
+            headers = {'Authorization': f'Bearer {token}', 'Accept-Encoding': encoding}
+            _fetch(client, path, headers)
+
+            samples, decode_samples, size = [], [], 0
+            started = perf_counter()
+            for _ in range(iterations):
+                t0 = perf_counter()
+                response, body = _fetch(client, path, headers)
+                samples.append(perf_counter() - t0)
+                size = len(body)
+
+                t0 = perf_counter()
+                decoders[response.headers.get('Content-Encoding', 'identity')](body)
+                decode_samples.append(perf_counter() - t0)
+
+            result = summarize(samples, perf_counter() - started)
+            result['bytes'] = size
+            results[f'compression.{endpoint}.{encoding}'] = result
+
+            decode_ms = sum(decode_samples) / len(decode_samples) * 1000
+            link_ms = {
+                name: result['p50_ms'] + decode_ms + (rtt + size * 8 / bandwidth) * 1000
+                for name, (bandwidth, rtt) in LINKS.items()
+            }
+            rows.append((endpoint, encoding, size, result['p50_ms'], decode_ms, link_ms))
+
+    print(format_compression(rows))
+    print()
+    return results
+
+
+def format_compression(rows):
+    """Render sizes and estimated end-to-end latency per link as a table"""
+    links = list(LINKS)
+    lines = [
+        f"{'endpoint':<12} {'encoding':<9} {'bytes':>10} {'saved':>7} {'server ms':>10} {'decode ms':>10} "
+        + ' '.join(f'{name + " ms":>10}' for name in links)
+    ]
+    identity = {endpoint: size for endpoint, encoding, size, *_ in rows if encoding == 'identity'}
+    for endpoint, encoding, size, server_ms, decode_ms, link_ms in rows:
+        saved = 1 - size / identity[endpoint] if identity.get(endpoint) else 0
+        lines.append(
+            f"{endpoint:<12} {encoding:<9} {size:>10} {saved:>7.1%} {server_ms:>10.2f} {decode_ms:>10.2f} "
+            + ' '.join(f'{link_ms[name]:>10.1f}' for name in links)
+        )
+    return '\n'.join(lines)
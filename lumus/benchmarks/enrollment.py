@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from lumus.config.database import db
+from lumus.models import Course, CourseFullError, Student
+from benchmarks.stats import summarize
+
+
+def run_enrollment_stress(app, capacity=50, attempts=400, concurrency=16):
+    """Race ``attempts`` enrollments into one course and verify capacity holds"""
+    with app.app_context():
+        course = Course(
+            name='Enrollment Stress', nickname='STRESS', course_code='STRESS',
+            period='2026.1', capacity=capacity
+        )
+        db.session.add(course)
+        db.session.commit()
+        course_id = course.id
+
+    samples = []
+    outcomes = {'enrolled': 0, 'full': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def enroll(i):
+        with app.app_context():
+            t0 = perf_counter()
+            try:
+                db.session.add(Student(
+                    name=f'Stress Student {i}',
+                    email=f'stress{i}@lumus.local',
+                    course_id=course_id
+                ))
+                db.session.commit()
+                outcome = 'enrolled'
+            except CourseFullError:
+                db.session.rollback()
+                outcome = 'full'
+            except Exception:
+                db.session.rollback()
+                outcome = 'errors'
+            elapsed = perf_counter() - t0
+
+        with lock:
+            samples.append(elapsed)
+            outcomes[outcome] += 1
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(enroll, range(attempts)))
+    elapsed = perf_counter() - started
+
+    with app.app_context():
+        enrolled_count = db.session.get(Course, course_id).enrolled_count
+        student_rows = Student.query.filter_by(course_id=course_id).count()
+
+    result = summarize(samples, elapsed, outcomes['errors'])
+    result['enrollments_per_second'] = round(outcomes['enrolled'] / elapsed, 2) if elapsed else 0.0
+
+    failure = None
+    if student_rows > capacity or enrolled_count != student_rows:
+        failure = (
+            f"enrollment.stress: capacity {capacity} violated "
+            f"({student_rows} students, enrolled_count={enrolled_count})"
+        )
+    elif outcomes['enrolled'] != min(capacity, attempts - outcomes['errors']):
+        failure = (
+            f"enrollment.stress: only {outcomes['enrolled']} of {capacity} seats filled "
+            f"({outcomes['full']} rejected as full, {outcomes['errors']} errors)"
+        )
+
+    return {'enrollment.stress': result}, failure
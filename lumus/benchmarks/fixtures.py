@@ -0,0 +1,84 @@
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from app import create_app
+from lumus.config.config import Config
+from lumus.config.database import db
+from lumus.models import Course, Lab, Schedule, User, UserType, BookingStatus
+
+
+BENCHMARK_ADMIN_EMAIL = 'bench-admin@lumus.local'
+BENCHMARK_PASSWORD = 'bench-password'
+
+
+class BenchmarkConfig(Config):
+    TESTING = True
+    SQLALCHEMY_ECHO = False
+    SQL_SLOW_QUERY_MS = None
+    SQL_REPEATED_QUERY_THRESHOLD = None
+    RATELIMIT_ENABLED = False
+    ADMISSION_MAX_CONCURRENT = None
+
+
+def create_benchmark_app(db_path=None, labs=10, courses=20, schedules=2000, seed=42):
+    """Create an app backed by a seeded SQLite file database"""
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix='lumus-bench-', suffix='.db')
+        os.close(fd)
+
+    class _Config(BenchmarkConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+
+    app = create_app(_Config)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        lab_nicknames, course_codes = seed_database(
+            labs=labs, courses=courses, schedules=schedules, seed=seed
+        )
+
+    app.config['BENCHMARK_DB_PATH'] = db_path
+    app.config['BENCHMARK_LABS'] = lab_nicknames
+    app.config['BENCHMARK_COURSES'] = course_codes
+    return app
+
+
+def seed_database(labs, courses, schedules, seed=42):
+    """Insert a deterministic dataset used by the benchmarks"""
+    rng = random.Random(seed)
+    slots = Config.DEFAULT_TIME_SLOTS
+
+    admin = User(name='Benchmark Admin', email=BENCHMARK_ADMIN_EMAIL, type=UserType.ADMIN)
+    admin.set_password(BENCHMARK_PASSWORD)
+    db.session.add(admin)
+
+    lab_nicknames = [f'LAB{i:02d}' for i in range(1, labs + 1)]
+    db.session.add_all([
+        Lab(nickname=nickname, name=f'Laboratory {nickname}', capacity=30)
+        for nickname in lab_nicknames
+    ])
+
+    course_codes = [f'BENCH{i:03d}' for i in range(1, courses + 1)]
+    db.session.add_all([
+        Course(name=f'Course {code}', nickname=code, course_code=code, period='2026.1')
+        for code in course_codes
+    ])
+
+    start = date.today()
+    db.session.add_all([
+        Schedule(
+            date=start + timedelta(days=rng.randrange(0, 120)),
+            times=sorted(rng.sample(slots, rng.randint(1, 3))),
+            user_name='Benchmark User',
+            course_code=rng.choice(course_codes),
+            lab_nickname=rng.choice(lab_nicknames),
+            status=BookingStatus.CONFIRMED,
+            user_id=str(rng.randint(1, 500))
+        )
+        for _ in range(schedules)
+    ])
+
+    db.session.commit()
+    return lab_nicknames, course_codes
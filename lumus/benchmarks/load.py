@@ -0,0 +1,114 @@
+import json
+import random
+import threading
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from time import perf_counter
+from lumus.config.config import Config
+from benchmarks.fixtures import BENCHMARK_ADMIN_EMAIL, BENCHMARK_PASSWORD
+from benchmarks.stats import summarize
+
+
+class AppClient:
+    """Drive the WSGI app in-process through the Flask test client"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, payload=None, headers=None):
+        response = self.client.open(path, method=method, json=payload, headers=headers or {})
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    """Drive a running Lumus server over HTTP"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, payload=None, headers=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        req.add_header('Content-Type', 'application/json')
+        for key, value in (headers or {}).items():
+            req.add_header(key, value)
+
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                body = response.read()
+                return response.status, json.loads(body) if body else None
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+def booking_flow(client, rng, lab_nicknames, course_codes, record):
+    """Replay the umbra booking flow: login, list labs, view a week, book"""
+    def step(name, method, path, payload=None, headers=None):
+        t0 = perf_counter()
+        status, body = client.request(method, path, payload, headers)
+        record(name, perf_counter() - t0, status >= 400 and status != 409)
+        return status, body
+
+    status, body = step('load.login', 'POST', '/api/auth/login', {
+        'email': BENCHMARK_ADMIN_EMAIL,
+        'password': BENCHMARK_PASSWORD
+    })
+    token = (body or {}).get('access_token')
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+
+    step('load.list_labs', 'GET', '/api/labs', headers=headers)
+
+    lab_nickname = rng.choice(lab_nicknames)
+    week_start = date.today() + timedelta(days=rng.randrange(0, 120))
+    week_end = week_start + timedelta(days=6)
+    step(
+        'load.view_week', 'GET',
+        f'/api/schedules?lab_nickname={lab_nickname}&start_date={week_start.isoformat()}'
+        f'&end_date={week_end.isoformat()}&per_page=100',
+        headers=headers
+    )
+
+    step('load.book', 'POST', '/api/schedules', {
+        'date': (week_start + timedelta(days=rng.randrange(0, 7))).isoformat(),
+        'times': [rng.choice(Config.DEFAULT_TIME_SLOTS)],
+        'user_name': 'Load Test',
+        'course_code': rng.choice(course_codes),
+        'lab_nickname': lab_nickname,
+        'status': 'confirmed'
+    }, headers=headers)
+
+
+def run_load(make_client, lab_nicknames, course_codes, concurrency=8, flows=200, seed=42):
+    """Run ``flows`` booking flows across ``concurrency`` threads"""
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+
+    def record(name, elapsed, failed):
+        with lock:
+            samples[name].append(elapsed)
+            if failed:
+                errors[name] += 1
+
+    def worker(worker_id, count):
+        client = make_client()
+        rng = random.Random(seed + worker_id)
+        for _ in range(count):
+            booking_flow(client, rng, lab_nicknames, course_codes, record)
+
+    per_worker = [flows // concurrency + (1 if i < flows % concurrency else 0)
+                  for i in range(concurrency)]
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker, i, n) for i, n in enumerate(per_worker)]:
+            future.result()
+    elapsed = perf_counter() - started
+
+    results = {name: summarize(values, elapsed, errors[name]) for name, values in samples.items()}
+    all_samples = [value for values in samples.values() for value in values]
+    results['load.total'] = summarize(all_samples, elapsed, sum(errors.values()))
+    return results
@@ -0,0 +1,77 @@
+import random
+from time import perf_counter
+from flask_jwt_extended import create_access_token
+from lumus.config.config import Config
+from lumus.models import Schedule, User
+from lumus.utils.auth import require_permission
+from benchmarks.fixtures import BENCHMARK_ADMIN_EMAIL
+from benchmarks.stats import summarize
+
+
+def time_calls(fn, iterations, warmup=50):
+    """Call ``fn`` repeatedly and summarize per-call latency"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    started = perf_counter()
+    for _ in range(iterations):
+        t0 = perf_counter()
+        fn()
+        samples.append(perf_counter() - t0)
+
+    return summarize(samples, perf_counter() - started)
+
+
+def bench_check_conflict(app, iterations, seed=42):
+    """Benchmark Schedule.check_conflict against the seeded bookings"""
+    rng = random.Random(seed)
+
+    with app.app_context():
+        bookings = Schedule.query.limit(200).all()
+        cases = [(b.date, b.times, b.lab_nickname) for b in bookings]
+
+        def run():
+            booking_date, times, lab_nickname = rng.choice(cases)
+            Schedule.check_conflict(booking_date, [rng.choice(Config.DEFAULT_TIME_SLOTS)], lab_nickname)
+
+        return time_calls(run, iterations)
+
+
+def bench_to_dict(app, iterations):
+    """Benchmark serializing a page of schedules with to_dict"""
+    with app.app_context():
+        page = Schedule.query.limit(100).all()
+
+        def run():
+            [schedule.to_dict() for schedule in page]
+
+        return time_calls(run, iterations)
+
+
+def bench_require_permission(app, iterations):
+    """Benchmark the require_permission decorator on a no-op view"""
+    with app.app_context():
+        user = User.get_by_email(BENCHMARK_ADMIN_EMAIL)
+        token = create_access_token(identity=str(user.id))
+
+    view = require_permission('read_schedule')(lambda: 'ok')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def run():
+        with app.test_request_context('/', headers=headers):
+            view()
+
+    return time_calls(run, iterations)
+
+
+MICRO_BENCHMARKS = {
+    'micro.check_conflict': bench_check_conflict,
+    'micro.to_dict': bench_to_dict,
+    'micro.require_permission': bench_require_permission
+}
+
+
+def run_micro(app, iterations=2000):
+    """Run every micro-benchmark and return results keyed by name"""
+    return {name: bench(app, iterations) for name, bench in MICRO_BENCHMARKS.items()}
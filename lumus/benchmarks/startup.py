@@ -0,0 +1,64 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from benchmarks.stats import summarize
+
+
+LUMUS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+create_app()
+t2 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'create_app': t2 - t1, 'total': t2 - t0}))
+"""
+
+_IMPORTTIME_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def cold_start():
+    """Start a fresh interpreter, build the app and return timings plus -X importtime output"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _CHILD_SCRIPT],
+        cwd=LUMUS_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def top_imports(importtime_output, limit=10):
+    """Return the ``limit`` imports nearest the top with the largest cumulative time (ms)"""
+    top_level = []
+    for self_us, cumulative_us, indent, module in _IMPORTTIME_RE.findall(importtime_output):
+        if len(indent) <= 3:
+            top_level.append((module, int(cumulative_us) / 1000))
+    return sorted(top_level, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def run_startup(runs=5):
+    """Measure cold import and create_app time across ``runs`` fresh interpreters"""
+    samples = {'import': [], 'create_app': [], 'total': []}
+    importtime_output = ''
+
+    for _ in range(runs):
+        timings, importtime_output = cold_start()
+        for key, value in timings.items():
+            samples[key].append(value)
+
+    results = {
+        f'startup.{key}': summarize(values, sum(values))
+        for key, values in samples.items()
+    }
+    return results, top_imports(importtime_output)
+
+
+def check_budget(results, budget_ms):
+    """Return a failure message when the median cold start exceeds ``budget_ms``"""
+    p50 = results['startup.total']['p50_ms']
+    if p50 > budget_ms:
+        return f"startup.total: p50 {p50:.1f} ms exceeds budget {budget_ms:.0f} ms"
+    return None
@@ -0,0 +1,81 @@
+import json
+import os
+
+
+def percentile(sorted_samples, pct):
+    """Get a percentile from already sorted samples using linear interpolation"""
+    if not sorted_samples:
+        return 0.0
+
+    k = (len(sorted_samples) - 1) * pct / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (k - lower)
+
+
+def summarize(samples, elapsed, errors=0):
+    """Summarize latency samples (seconds) into milliseconds percentiles and throughput"""
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    return {
+        'count': count,
+        'errors': errors,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 4),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 4),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 4),
+        'mean_ms': round(sum(ordered) / count * 1000, 4) if count else 0.0,
+        'rps': round(count / elapsed, 2) if elapsed > 0 else 0.0
+    }
+
+
+def load_baseline(path):
+    """Load stored baseline results, or an empty dict if none exist yet"""
+    if not path or not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    """Write benchmark results as the new baseline"""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """Return regressions where p95 grew or throughput dropped by more than ``threshold``"""
+    regressions = []
+
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+
+        if previous.get('p95_ms') and current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.3f} ms > baseline {previous['p95_ms']:.3f} ms"
+            )
+
+        if previous.get('rps') and current['rps'] < previous['rps'] * (1 - threshold):
+            regressions.append(
+                f"{name}: {current['rps']:.1f} req/s < baseline {previous['rps']:.1f} req/s"
+            )
+
+    return regressions
+
+
+def format_results(results):
+    """Render results as a fixed-width table"""
+    lines = [
+        f"{'benchmark':<32} {'count':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'req/s':>10}"
+    ]
+    for name, r in sorted(results.items()):
+        lines.append(
+            f"{name:<32} {r['count']:>7} {r['errors']:>5} {r['p50_ms']:>9.3f} "
+            f"{r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['rps']:>10.1f}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,32 @@
+from flask import Flask
+from .migrate import LazyMigrateGroup, init_migrate
+from .seed import seed_command
+from .students import import_students_command
+from .users import import_users_command
+from .outbox import dispatch_outbox_command
+from .worker import worker_command
+from .rollups import rebuild_rollups_command
+
+
+def register_commands(app: Flask):
+    """Register all CLI commands with the Flask app"""
+    app.cli.add_command(LazyMigrateGroup(app))
+    app.cli.add_command(seed_command)
+    app.cli.add_command(import_students_command)
+    app.cli.add_command(import_users_command)
+    app.cli.add_command(dispatch_outbox_command)
+    app.cli.add_command(worker_command)
+    app.cli.add_command(rebuild_rollups_command)
+
+
+__all__ = [
+    'register_commands',
+    'init_migrate',
+    'LazyMigrateGroup',
+    'seed_command',
+    'import_students_command',
+    'import_users_command',
+    'dispatch_outbox_command',
+    'worker_command',
+    'rebuild_rollups_command'
+]
@@ -0,0 +1,32 @@
+import click
+from lumus.config.database import db
+
+
+def init_migrate(app):
+    """Initialize Flask-Migrate for the app, importing Alembic on first use"""
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    return app.extensions['migrate']
+
+
+class LazyMigrateGroup(click.Group):
+    """`flask db` group that defers importing Flask-Migrate until a subcommand runs"""
+
+    def __init__(self, app):
+        super().__init__(name='db', help='Perform database migrations.')
+        self.app = app
+
+    def _load(self):
+        init_migrate(self.app)
+        from flask_migrate.cli import db as db_group
+        return db_group
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        return self._load().make_context(info_name, args, parent=parent, **extra)
+
+    def list_commands(self, ctx):
+        return self._load().list_commands(ctx)
+
+    def get_command(self, ctx, cmd_name):
+        return self._load().get_command(ctx, cmd_name)
@@ -0,0 +1,24 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from lumus.utils.outbox import OutboxDispatcher, dispatch_once
+
+
+@click.command('dispatch-outbox')
+@click.option('--once', is_flag=True, help='Deliver one batch and exit')
+@with_appcontext
+def dispatch_outbox_command(once):
+    """Deliver queued notification mail"""
+    if not current_app.config.get('MAIL_SERVER'):
+        raise click.ClickException('MAIL_SERVER is not configured')
+
+    if once:
+        result = dispatch_once()
+        click.echo(f"Sent {result['sent']}, retrying {result['retried']}, failed {result['failed']}")
+        return
+
+    click.echo('Dispatching outbox, press Ctrl+C to stop')
+    try:
+        OutboxDispatcher(current_app._get_current_object()).run()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,13 @@
+import click
+from time import perf_counter
+from flask.cli import with_appcontext
+from lumus.models.rollups import ScheduleRollup
+
+
+@click.command('rebuild-rollups')
+@with_appcontext
+def rebuild_rollups_command():
+    """Recompute the daily schedule rollups from the schedules table"""
+    started = perf_counter()
+    rows = ScheduleRollup.rebuild()
+    click.echo(f'Rebuilt {rows} rollup rows in {perf_counter() - started:.1f}s')
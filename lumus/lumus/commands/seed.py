@@ -0,0 +1,222 @@
+import json
+import random
+from datetime import date, timedelta
+from time import perf_counter
+import click
+from flask import current_app, g
+from flask.cli import with_appcontext
+from sqlalchemy import insert, text
+from werkzeug.security import generate_password_hash
+from lumus.config.database import db
+from lumus.models import (
+    Course, Lab, Schedule, ScheduleRollup, Student, User, UserType, RepeatType, BookingStatus
+)
+
+
+FIRST_NAMES = [
+    'Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique',
+    'Isabela', 'João', 'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael',
+    'Sofia', 'Thiago', 'Vitória', 'William'
+]
+LAST_NAMES = [
+    'Almeida', 'Barbosa', 'Cardoso', 'Costa', 'Ferreira', 'Gomes', 'Lima', 'Martins',
+    'Oliveira', 'Pereira', 'Ribeiro', 'Rocha', 'Santos', 'Silva', 'Souza'
+]
+PERIODS = ['2025.1', '2025.2', '2026.1', '2026.2']
+
+# Bookings cluster around morning and evening classes; weekends are rare.
+SLOT_WEIGHTS = [
+    8, 9, 9, 6, 6, 7, 7, 6, 2, 2, 4, 5, 5, 4, 4, 4, 3, 3, 8, 9, 9, 6, 4, 3, 1, 1
+]
+WEEKDAY_WEIGHTS = [20, 20, 20, 20, 17, 2, 1]
+BLOCK_LENGTHS = [1, 2, 3, 4]
+BLOCK_WEIGHTS = [25, 45, 20, 10]
+STATUSES = [BookingStatus.CONFIRMED, BookingStatus.PENDING, BookingStatus.CANCELLED]
+STATUS_WEIGHTS = [85, 10, 5]
+REPEAT_TYPES = [RepeatType.NONE, RepeatType.WEEKLY, RepeatType.DAILY, RepeatType.MONTHLY]
+REPEAT_WEIGHTS = [80, 15, 3, 2]
+SCHEDULE_COLUMNS = (
+    'date', 'times', 'user_name', 'course_code', 'annotation', 'repeat_type', 'lab_nickname', 'status', 'user_id'
+)
+
+
+def _execute_batch(table, rows):
+    db.session.execute(insert(table), rows)
+    # Recorded queries keep every parameter set alive; drop them between batches.
+    g.pop('_sqlalchemy_queries', None)
+
+
+def _execute_driver_batch(table, columns, rows):
+    """executemany straight on the DBAPI cursor for tuples that already hold database values
+
+    Skips SQLAlchemy's per-row bind processing, which costs more than the
+    inserts themselves at seed volumes.
+    """
+    compiled = insert(table).compile(dialect=db.engine.dialect, column_keys=list(columns))
+    if compiled.positional:
+        order = [columns.index(name) for name in compiled.positiontup]
+        if order != list(range(len(columns))):
+            rows = [tuple(row[i] for i in order) for row in rows]
+    else:
+        rows = [dict(zip(columns, row)) for row in rows]
+    db.session.connection().exec_driver_sql(compiled.string, rows)
+    g.pop('_sqlalchemy_queries', None)
+
+
+def _batched_insert(table, rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        _execute_batch(table, rows[start:start + batch_size])
+
+
+def _person_name(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+
+def generate_labs(rng, count):
+    return [{
+        'nickname': f'LAB{i:03d}',
+        'name': f'Laboratório {i:03d}',
+        'capacity': rng.choice([20, 25, 30, 40]),
+        'location': f'Bloco {chr(65 + i % 6)}, sala {100 + i}',
+        'description': '',
+        'is_active': rng.random() > 0.05
+    } for i in range(1, count + 1)]
+
+
+def generate_courses(rng, count):
+    return [{
+        'name': f'Turma {i:04d}',
+        'nickname': f'T{i:04d}',
+        'course_code': f'CRS{i:04d}',
+        'period': rng.choice(PERIODS),
+        'capacity': rng.choice([25, 30, 35, 40, 50]),
+        'description': ''
+    } for i in range(1, count + 1)]
+
+
+def generate_users(rng, count, password_hash):
+    types = [UserType.PROFESSOR, UserType.USER, UserType.STUDENT, UserType.ADMIN]
+    return [{
+        'name': _person_name(rng),
+        'email': f'user{i:06d}@seed.lumus.local',
+        'password_hash': password_hash,
+        'type': rng.choices(types, weights=[20, 30, 48, 2])[0],
+        'is_active': True,
+        'login_count': 0
+    } for i in range(1, count + 1)]
+
+
+def generate_students(rng, count, course_capacities):
+    seats = [course_id for course_id, capacity in course_capacities for _ in range(capacity)]
+    return [{
+        'name': _person_name(rng),
+        'email': f'student{i:06d}@seed.lumus.local',
+        'course_id': course_id,
+        'phone': f'+55 11 9{rng.randrange(10000000, 99999999)}',
+        'registration_number': f'R{i:08d}'
+    } for i, course_id in enumerate(rng.sample(seats, min(count, len(seats))), start=1)]
+
+
+def generate_schedules(rng, count, lab_nicknames, course_codes, user_ids, start_date, days):
+    """Rows of database values in SCHEDULE_COLUMNS order"""
+    slots = current_app.config['DEFAULT_TIME_SLOTS']
+    slot_count = len(slots)
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    date_weights = [WEEKDAY_WEIGHTS[day.weekday()] for day in dates]
+    dates = [day.isoformat() for day in dates]
+    blocks = {
+        (first, length): json.dumps(slots[min(first, slot_count - length):][:length])
+        for first in range(slot_count) for length in BLOCK_LENGTHS
+    }
+    user_ids = [str(user_id) for user_id in user_ids]
+
+    chosen_dates = rng.choices(dates, weights=date_weights, k=count)
+    first_slots = rng.choices(range(slot_count), weights=SLOT_WEIGHTS, k=count)
+    lengths = rng.choices(BLOCK_LENGTHS, weights=BLOCK_WEIGHTS, k=count)
+    statuses = rng.choices([status.name for status in STATUSES], weights=STATUS_WEIGHTS, k=count)
+    repeat_types = rng.choices([repeat.name for repeat in REPEAT_TYPES], weights=REPEAT_WEIGHTS, k=count)
+    chosen_courses = rng.choices(course_codes, k=count)
+    chosen_labs = rng.choices(lab_nicknames, k=count)
+    chosen_users = rng.choices(user_ids, k=count)
+
+    return [(
+        chosen_dates[i],
+        blocks[first_slots[i], lengths[i]],
+        'Seed User',
+        chosen_courses[i],
+        '',
+        repeat_types[i],
+        chosen_labs[i],
+        statuses[i],
+        chosen_users[i]
+    ) for i in range(count)]
+
+
+@click.command('seed')
+@click.option('--schedules', default=100_000, show_default=True, help='Number of schedules to create')
+@click.option('--students', default=5_000, show_default=True, help='Number of students to create')
+@click.option('--courses', default=200, show_default=True, help='Number of courses to create')
+@click.option('--labs', default=100, show_default=True, help='Number of labs to create')
+@click.option('--users', default=1_000, show_default=True, help='Number of users to create')
+@click.option('--seed', 'rng_seed', default=42, show_default=True, help='Random seed for deterministic data')
+@click.option('--start-date', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='First booking date (default: today)')
+@click.option('--days', default=180, show_default=True, help='Number of days bookings are spread over')
+@click.option('--batch-size', default=10_000, show_default=True, help='Rows per executemany batch')
+@click.option('--password', default='seed-password', show_default=True, help='Password for every seeded user')
+@click.option('--reset', is_flag=True, help='Drop and recreate all tables first')
+@with_appcontext
+def seed_command(schedules, students, courses, labs, users, rng_seed, start_date, days,
+                 batch_size, password, reset):
+    """Fill the database with deterministic synthetic data"""
+    rng = random.Random(rng_seed)
+    start_date = start_date.date() if start_date else date.today()
+    started = perf_counter()
+
+    if reset:
+        db.drop_all()
+        db.create_all()
+
+    if db.engine.dialect.name == 'sqlite':
+        db.session.execute(text('PRAGMA synchronous = OFF'))
+        db.session.execute(text('PRAGMA journal_mode = MEMORY'))
+        db.session.execute(text('PRAGMA cache_size = -262144'))
+
+    lab_rows = generate_labs(rng, labs)
+    _batched_insert(Lab.__table__, lab_rows, batch_size)
+
+    course_rows = generate_courses(rng, courses)
+    _batched_insert(Course.__table__, course_rows, batch_size)
+    course_capacities = db.session.execute(
+        Course.__table__.select().with_only_columns(Course.id, Course.capacity)
+        .where(Course.course_code.in_([row['course_code'] for row in course_rows]))
+    ).all()
+
+    user_rows = generate_users(rng, users, generate_password_hash(password))
+    _batched_insert(User.__table__, user_rows, batch_size)
+    user_ids = db.session.execute(
+        User.__table__.select().with_only_columns(User.id)
+        .where(User.email.like('%@seed.lumus.local'))
+    ).scalars().all() or ['guest']
+
+    student_rows = generate_students(rng, students, course_capacities)
+    _batched_insert(Student.__table__, student_rows, batch_size)
+    db.session.commit()
+    Course.recount_enrollments()
+    if len(student_rows) < students:
+        click.echo(f'Courses only have {len(student_rows)} seats; skipped {students - len(student_rows)} students')
+    click.echo(f'Inserted {labs} labs, {courses} courses, {users} users, {len(student_rows)} students')
+
+    lab_nicknames = [row['nickname'] for row in lab_rows]
+    course_codes = [row['course_code'] for row in course_rows]
+    for start in range(0, schedules, batch_size):
+        rows = generate_schedules(
+            rng, min(batch_size, schedules - start), lab_nicknames, course_codes,
+            user_ids, start_date, days
+        )
+        _execute_driver_batch(Schedule.__table__, SCHEDULE_COLUMNS, rows)
+    db.session.commit()
+    Schedule.backfill_change_seq()
+    ScheduleRollup.rebuild()
+
+    click.echo(f'Inserted {schedules} schedules in {perf_counter() - started:.1f}s')
@@ -0,0 +1,19 @@
+import click
+from flask.cli import with_appcontext
+from lumus.utils.bulk_import import StudentImport, detect_format, iter_records
+
+
+@click.command('import-students')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None,
+              help='Input format (default: guessed from the file name)')
+@click.option('--chunk-size', default=1000, show_default=True, help='Rows resolved and inserted per batch')
+@with_appcontext
+def import_students_command(source, fmt, chunk_size):
+    """Import students from a CSV or NDJSON file ('-' for stdin)"""
+    fmt = fmt or detect_format(filename=source.name)
+    summary = StudentImport(chunk_size=chunk_size).run(iter_records(source, fmt))
+
+    for error in summary['errors']:
+        click.echo(f"row {error['row']}: {error['error']} ({error['email']})", err=True)
+    click.echo(f"Inserted {summary['inserted']} students, {summary['failed']} failed")
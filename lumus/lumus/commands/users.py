@@ -0,0 +1,30 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from lumus.utils.bulk_import import UserImport, detect_format, iter_records
+
+
+@click.command('import-users')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None,
+              help='Input format (default: guessed from the file name)')
+@click.option('--chunk-size', default=500, show_default=True, help='Rows hashed and inserted per batch')
+@click.option('--workers', type=int, default=None,
+              help='Password hashing threads (default: PASSWORD_HASH_WORKERS or the CPU count)')
+@with_appcontext
+def import_users_command(source, fmt, chunk_size, workers):
+    """Provision users from a CSV or NDJSON file ('-' for stdin)"""
+    fmt = fmt or detect_format(filename=source.name)
+    importer = UserImport(
+        chunk_size=chunk_size,
+        workers=workers or current_app.config.get('PASSWORD_HASH_WORKERS')
+    )
+    summary = importer.run(iter_records(source, fmt))
+
+    for error in summary['errors']:
+        click.echo(f"row {error['row']}: {error['error']} ({error['email']})", err=True)
+    click.echo(
+        f"Inserted {summary['inserted']} users, {summary['failed']} failed "
+        f"in {summary['elapsed_seconds']:.1f}s ({summary['rows_per_second']:.0f} rows/s, "
+        f"{summary['workers']} workers)"
+    )
@@ -0,0 +1,33 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from lumus.utils.jobs import JobScheduler
+
+
+@click.command('worker')
+@click.option('--once', is_flag=True, help='Run the jobs that are due and exit')
+@click.option('--job', 'job_name', help='Run one job now, even if it is not due')
+@with_appcontext
+def worker_command(once, job_name):
+    """Run periodic maintenance jobs"""
+    scheduler = JobScheduler(current_app._get_current_object())
+
+    if job_name:
+        if job_name not in scheduler.jobs:
+            raise click.ClickException(f"Unknown job '{job_name}'. Choose from: {', '.join(scheduler.jobs)}")
+        result = scheduler.run_job(job_name, force=True)
+        if result is None:
+            raise click.ClickException(f'{job_name} is running on another worker')
+        click.echo(f'{job_name}: {result[0]} ({result[1]} rows)')
+        return
+
+    if once:
+        for name, result in scheduler.run_pending().items():
+            click.echo(f'{name}: ' + ('skipped' if result is None else f'{result[0]} ({result[1]} rows)'))
+        return
+
+    click.echo(f'Running jobs as {scheduler.holder}, press Ctrl+C to stop')
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
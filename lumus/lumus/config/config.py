@@ -10,15 +10,55 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_RECORD_QUERIES = True
     
+    SQL_SERVER_TIMING = True
+    SQL_SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS') or 100)
+    SQL_REPEATED_QUERY_THRESHOLD = 5
+    SQL_QUERY_BUDGET = None
+    SQL_QUERY_BUDGETS = {}
+    SQL_QUERY_BUDGET_STRICT = os.environ.get('SQL_QUERY_BUDGET_STRICT', 'false').lower() in ['true', 'on', '1']
+    
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ['true', 'on', '1']
+    METRICS_EXCLUDED_ENDPOINTS = ['metrics.get_metrics']
+    
+    ENABLED_BLUEPRINTS = None
+    
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or 0) or None
+    
     API_VERSION = 'v1'
     API_PREFIX = '/api'
     
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
+    PAGINATION_COUNT_MODE = os.environ.get('PAGINATION_COUNT_MODE') or 'none'
+    PAGINATION_COUNT_CACHE_TTL = int(os.environ.get('PAGINATION_COUNT_CACHE_TTL') or 60)
+    
+    EXPORT_BATCH_SIZE = 5000
+    
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'true').lower() in ['true', 'on', '1']
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL')
+    RATELIMIT_TRUST_FORWARDED = os.environ.get('RATELIMIT_TRUST_FORWARDED', 'false').lower() in ['true', 'on', '1']
+    RATE_LIMITS = {
+        'schedule.get_schedules_public': '120/minute',
+        'schedule.get_schedules_by_date': '120/minute',
+        'course.get_courses_public': '120/minute',
+        'schedule.create_schedule': '20/minute'
+    }
+    
+    ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT') or 64)
+    ADMISSION_QUEUE_TIMEOUT = 0.1
+    ADMISSION_EXCLUDED_ENDPOINTS = ['metrics.get_metrics', 'schedule.stream_schedules']
+    
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() in ['true', 'on', '1']
+    COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']
+    COMPRESSION_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_MIMETYPES = [
+        'application/json', 'text/csv', 'text/calendar', 'text/plain', 'text/html'
+    ]
     
     CORS_ORIGINS = ['http://localhost:3000', 'http://localhost:5173']
     
@@ -33,11 +73,49 @@ class Config:
         "21:05", "21:15", "22:00", "22:45", "23:30"
     ]
     
+    CALENDAR_PAST_DAYS = 90
+    
+    ANALYTICS_DEFAULT_DAYS = 120
+    ANALYTICS_MAX_DAYS = 400
+    ANALYTICS_WEEKDAYS = [0, 1, 2, 3, 4, 5]
+    
+    EVENT_BROKER_URL = os.environ.get('EVENT_BROKER_URL')
+    SSE_KEEPALIVE_SECONDS = 15
+    SSE_QUEUE_SIZE = 100
+    
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    MAIL_TIMEOUT = 10
+    
+    OUTBOX_DISPATCHER_ENABLED = os.environ.get('OUTBOX_DISPATCHER_ENABLED', 'false').lower() in ['true', 'on', '1']
+    OUTBOX_POLL_INTERVAL = 5
+    OUTBOX_BATCH_SIZE = 50
+    OUTBOX_LEASE_SECONDS = 300
+    OUTBOX_MAX_ATTEMPTS = 8
+    OUTBOX_BACKOFF_BASE = 30
+    OUTBOX_BACKOFF_MAX = 3600
+    OUTBOX_RETENTION_DAYS = 14
+    
+    IDEMPOTENCY_KEY_TTL_HOURS = 24
+    
+    JOBS_ENABLED = os.environ.get('JOBS_ENABLED', 'false').lower() in ['true', 'on', '1']
+    JOB_POLL_INTERVAL = 30
+    JOB_LEASE_SECONDS = 600
+    JOB_BATCH_SIZE = 500
+    JOB_INTERVALS = {
+        'expire_pending_schedules': 300,
+        'reconcile_counters': 3600,
+        'prune_sync_tombstones': 86400,
+        'prune_outbox': 86400,
+        'prune_idempotency_keys': 3600,
+        'rebuild_rollups': 0
+    }
+    PENDING_EXPIRY_HOURS = None
+    TOMBSTONE_RETENTION_DAYS = 30
 
 
 class DevelopmentConfig(Config):
@@ -54,6 +132,13 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    
+    SQL_SLOW_QUERY_MS = None
+    SQL_QUERY_BUDGET = 15
+    SQL_QUERY_BUDGET_STRICT = True
+    
+    RATELIMIT_ENABLED = False
+    ADMISSION_MAX_CONCURRENT = None
 
 
 config = {
@@ -1,10 +1,15 @@
 
 from .base import BaseModel
 from .schedule import Schedule, RepeatType, BookingStatus
-from .course import Course
+from .course import Course, CourseFullError
 from .student import Student
 from .user import User, UserType
 from .lab import Lab
+from .changes import ScheduleChangeCounter, ScheduleTombstone
+from .outbox import OutboxMessage, OutboxStatus
+from .jobs import JobLock
+from .rollups import ScheduleRollup
+from .idempotency import IdempotencyKey
 
 __all__ = [
     'BaseModel',
@@ -12,8 +17,16 @@ __all__ = [
     'RepeatType',
     'BookingStatus',
     'Course',
+    'CourseFullError',
     'Student',
     'User',
     'UserType',
-    'Lab'
+    'Lab',
+    'ScheduleChangeCounter',
+    'ScheduleTombstone',
+    'OutboxMessage',
+    'OutboxStatus',
+    'JobLock',
+    'ScheduleRollup',
+    'IdempotencyKey'
 ]
@@ -0,0 +1,86 @@
+from sqlalchemy import BigInteger, Column, Date, Integer, String, delete, event, func, insert, select, update
+from lumus.models.base import BaseModel
+from lumus.config.database import db
+
+
+class ScheduleChangeCounter(BaseModel):
+    """Single-row counter that hands out schedule change sequence numbers
+    
+    Incrementing the row takes a row lock until commit, so sequence numbers
+    become visible in the order they were assigned.
+    """
+    __tablename__ = 'schedule_change_counter'
+    
+    value = Column(BigInteger, nullable=False, default=0, server_default='0')
+    pruned_through = Column(BigInteger, nullable=False, default=0, server_default='0')
+    
+    @classmethod
+    def next_value(cls, connection):
+        table = cls.__table__
+        statement = update(table).where(table.c.id == 1).values(value=table.c.value + 1)
+        
+        if connection.dialect.update_returning:
+            value = connection.execute(statement.returning(table.c.value)).scalar()
+            if value is not None:
+                return value
+        elif connection.execute(statement).rowcount:
+            return connection.execute(select(table.c.value).where(table.c.id == 1)).scalar_one()
+        
+        connection.execute(insert(table).values(id=1, value=1, pruned_through=0))
+        return 1
+    
+    @classmethod
+    def current(cls, connection=None):
+        connection = connection or db.session.connection()
+        row = connection.execute(
+            select(cls.__table__.c.value, cls.__table__.c.pruned_through)
+            .where(cls.__table__.c.id == 1)
+        ).first()
+        return (row.value, row.pruned_through) if row else (0, 0)
+
+
+@event.listens_for(ScheduleChangeCounter.__table__, 'after_create')
+def _create_counter_row(target, connection, **kw):
+    connection.execute(insert(target).values(id=1, value=0, pruned_through=0))
+
+
+class ScheduleTombstone(BaseModel):
+    """Record of a deleted schedule, kept so delta sync clients can drop it"""
+    __tablename__ = 'schedule_tombstones'
+    
+    schedule_id = Column(Integer, nullable=False, index=True)
+    change_seq = Column(BigInteger, nullable=False, unique=True, index=True)
+    date = Column(Date)
+    lab_nickname = Column(String(10))
+    
+    def to_dict(self):
+        return {
+            'id': self.schedule_id,
+            'change_seq': self.change_seq,
+            'date': self.date.isoformat() if self.date else None,
+            'lab_nickname': self.lab_nickname
+        }
+    
+    @classmethod
+    def prune(cls, older_than):
+        """Delete tombstones recorded before ``older_than`` and advance ``pruned_through``
+        
+        Clients holding a token older than the newest pruned tombstone then get
+        a 410 and resync instead of silently missing deletions.
+        """
+        table = cls.__table__
+        counter = ScheduleChangeCounter.__table__
+        through = db.session.execute(
+            select(func.max(table.c.change_seq)).where(table.c.created_at < older_than)
+        ).scalar()
+        if through is None:
+            return 0
+        
+        db.session.execute(
+            update(counter)
+            .where(counter.c.id == 1, counter.c.pruned_through < through)
+            .values(pruned_through=through)
+        )
+        result = db.session.execute(delete(table).where(table.c.change_seq <= through))
+        db.session.commit()
+        return result.rowcount
@@ -1,11 +1,21 @@
-from sqlalchemy import Column, String, Integer, Text
+from sqlalchemy import Column, String, Integer, Text, func, or_, select, update
 from sqlalchemy.orm import relationship
 from lumus.models.base import BaseModel
+from lumus.models.search import SearchableMixin
 from lumus.config.database import db
 
 
-class Course(BaseModel):
+class CourseFullError(ValueError):
+    """Raised when an enrollment would push a course past its capacity"""
+    
+    def __init__(self, course_id):
+        self.course_id = course_id
+        super().__init__(f"Course {course_id} is at maximum capacity")
+
+
+class Course(SearchableMixin, BaseModel):
     __tablename__ = 'courses'
+    __search_columns__ = ('name', 'nickname', 'course_code')
     
     name = Column(String(100), nullable=False)
     nickname = Column(String(20), nullable=False, unique=True, index=True)
@@ -13,10 +23,19 @@ class Course(BaseModel):
     period = Column(String(20), nullable=False)
     
     capacity = Column(Integer, default=30)
+    enrolled_count = Column(Integer, nullable=False, default=0, server_default='0')
     
     description = Column(Text)
     
-    students = relationship("Student", back_populates="course", cascade="all, delete-orphan")
+    version = Column(Integer, nullable=False, server_default='1')
+    
+    students = relationship(
+        "Student", back_populates="course", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    
+    # Updates run as UPDATE ... WHERE id = ? AND version = ?; enrollment counters
+    # are adjusted with Core statements and leave the version alone
+    __mapper_args__ = {'version_id_col': version}
     
     def __repr__(self):
         return f"<Course(id={self.id}, name={self.name}, nickname={self.nickname})>"
@@ -25,6 +44,7 @@ class Course(BaseModel):
         result = super().to_dict()
         
         if include_students:
+            # Callers must load students up front, e.g. with selectinload(Course.students)
             result['students'] = [student.to_dict() for student in self.students]
         
         return result
@@ -41,51 +61,94 @@ class Course(BaseModel):
     def get_by_period(cls, period):
         return cls.query.filter_by(period=period).all()
     
-    @classmethod
-    def search(cls, query_string):
-        return cls.query.filter(
-            (cls.name.ilike(f'%{query_string}%')) |
-            (cls.nickname.ilike(f'%{query_string}%')) |
-            (cls.course_code.ilike(f'%{query_string}%'))
-        ).all()
-    
     def get_student_count(self):
-        return len(self.students)
+        return self.enrolled_count or 0
     
     def is_at_capacity(self):
-        return len(self.students) >= self.capacity
+        return self.get_student_count() >= self.capacity
     
     def get_available_slots(self):
-        return max(0, self.capacity - len(self.students))
+        return max(0, self.capacity - self.get_student_count())
+    
+    @classmethod
+    def adjust_enrolled_count(cls, connection, course_id, delta):
+        """Atomically add ``delta`` to a course's enrolled_count"""
+        if course_id is None:
+            return
+        connection.execute(
+            update(cls.__table__)
+            .where(cls.__table__.c.id == course_id)
+            .values(enrolled_count=cls.__table__.c.enrolled_count + delta)
+        )
+    
+    @classmethod
+    def reserve_seat(cls, connection, course_id, count=1):
+        """Atomically take seats with UPDATE ... WHERE enrolled_count + count <= capacity"""
+        table = cls.__table__
+        result = connection.execute(
+            update(table)
+            .where(
+                table.c.id == course_id,
+                or_(table.c.capacity.is_(None), table.c.enrolled_count + count <= table.c.capacity)
+            )
+            .values(enrolled_count=table.c.enrolled_count + count)
+        )
+        if result.rowcount != 1:
+            raise CourseFullError(course_id)
+    
+    @classmethod
+    def recount_enrollments(cls):
+        """Recompute enrolled_count for every course from the students table"""
+        from lumus.models.student import Student
+        student_count = (
+            select(func.count(Student.id))
+            .where(Student.course_id == cls.id)
+            .scalar_subquery()
+        )
+        result = db.session.execute(
+            update(cls.__table__)
+            .values(enrolled_count=student_count)
+            .where(cls.__table__.c.enrolled_count != student_count)
+        )
+        db.session.commit()
+        return result.rowcount
     
     def add_student(self, student):
         if self.is_at_capacity():
             raise ValueError(f"Course '{self.nickname}' is at maximum capacity")
         
-        if student in self.students:
+        if student.course_id == self.id:
             raise ValueError(f"Student '{student.name}' is already enrolled in this course")
         
-        self.students.append(student)
-        db.session.commit()
+        student.course_id = self.id
+        db.session.add(student)
+        try:
+            db.session.commit()
+        except CourseFullError:
+            db.session.rollback()
+            raise
         
         return student
     
     def remove_student(self, student):
-        if student not in self.students:
+        if student.course_id != self.id:
             raise ValueError(f"Student '{student.name}' is not enrolled in this course")
         
-        self.students.remove(student)
+        db.session.delete(student)
         db.session.commit()
         
         return student
     
     def get_students_by_name(self, name_query):
-        return [student for student in self.students 
-                if name_query.lower() in student.name.lower()]
+        from lumus.models.student import Student
+        return Student.query.filter(
+            Student.course_id == self.id,
+            Student.name.ilike(f'%{name_query}%')
+        ).all()
     
     @classmethod
     def get_courses_with_availability(cls):
-        return [course for course in cls.query.all() if not course.is_at_capacity()]
+        return cls.query.filter(cls.enrolled_count < cls.capacity).all()
     
     @classmethod
     def bulk_create(cls, courses_data):
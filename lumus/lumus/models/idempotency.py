@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint, delete
+from lumus.models.base import BaseModel
+from lumus.config.database import db
+
+
+class IdempotencyKey(BaseModel):
+    """Stored outcome of a request sent with an Idempotency-Key header
+    
+    The row is inserted in the same transaction as the change it guards, so a
+    retry either finds the committed response or waits on the unique
+    constraint until the first attempt commits or rolls back.
+    """
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        UniqueConstraint('scope', 'key', name='uq_idempotency_keys_scope_key'),
+    )
+    
+    scope = Column(String(150), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey(scope={self.scope}, key={self.key}, status_code={self.status_code})>"
+    
+    @property
+    def completed(self):
+        return self.status_code is not None
+    
+    @classmethod
+    def lookup(cls, scope, key):
+        """The unexpired record for ``key`` in ``scope``, if any"""
+        return cls.query.filter(
+            cls.scope == scope,
+            cls.key == key,
+            cls.expires_at > datetime.utcnow()
+        ).first()
+    
+    @classmethod
+    def reserve(cls, scope, key, request_hash, ttl_seconds):
+        """Insert an in-progress record and flush it; raises IntegrityError if the key is taken"""
+        now = datetime.utcnow()
+        db.session.execute(
+            delete(cls.__table__).where(
+                cls.__table__.c.scope == scope,
+                cls.__table__.c.key == key,
+                cls.__table__.c.expires_at <= now
+            )
+        )
+        record = cls(
+            scope=scope,
+            key=key,
+            request_hash=request_hash,
+            expires_at=now + timedelta(seconds=ttl_seconds)
+        )
+        db.session.add(record)
+        db.session.flush()
+        return record
+    
+    def complete(self, status_code, response_body):
+        """Store the response; it is committed together with the guarded change"""
+        self.status_code = status_code
+        self.response_body = response_body
+    
+    @classmethod
+    def prune(cls, now=None):
+        """Delete expired records"""
+        deleted = db.session.execute(
+            delete(cls.__table__).where(cls.__table__.c.expires_at <= (now or datetime.utcnow()))
+        ).rowcount
+        db.session.commit()
+        return deleted
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from sqlalchemy import Column, DateTime, Float, String, Text, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from lumus.models.base import BaseModel
+from lumus.config.database import db
+
+
+class JobLock(BaseModel):
+    """Per-job lease and schedule shared by every worker
+    
+    A worker may only run a job after taking its lease, and the lease is only
+    granted once the job is due, so each run happens on exactly one worker.
+    """
+    __tablename__ = 'job_locks'
+    
+    name = Column(String(100), nullable=False, unique=True, index=True)
+    holder = Column(String(100))
+    lease_expires_at = Column(DateTime)
+    next_run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    last_started_at = Column(DateTime)
+    last_finished_at = Column(DateTime)
+    last_status = Column(String(20))
+    last_duration = Column(Float)
+    last_error = Column(Text)
+    
+    def __repr__(self):
+        return f"<JobLock(name={self.name}, holder={self.holder})>"
+    
+    @classmethod
+    def acquire(cls, name, holder, lease_seconds, force=False):
+        """Take the lease on ``name`` if it is due (or ``force``) and not held elsewhere"""
+        now = datetime.utcnow()
+        table = cls.__table__
+        conditions = [
+            table.c.name == name,
+            or_(table.c.holder.is_(None), table.c.lease_expires_at <= now)
+        ]
+        if not force:
+            conditions.append(table.c.next_run_at <= now)
+        
+        result = db.session.execute(
+            update(table)
+            .where(*conditions)
+            .values(holder=holder, lease_expires_at=now + timedelta(seconds=lease_seconds), last_started_at=now)
+        )
+        if result.rowcount == 1:
+            db.session.commit()
+            return True
+        
+        exists = db.session.execute(select(table.c.id).where(table.c.name == name)).first()
+        if exists:
+            db.session.commit()
+            return False
+        
+        try:
+            db.session.execute(insert(table).values(
+                name=name,
+                holder=holder,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                next_run_at=now,
+                last_started_at=now
+            ))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+            return False
+    
+    @classmethod
+    def release(cls, name, holder, interval, status, duration, error=None):
+        """Record the run and schedule the next one; False if the lease was lost meanwhile"""
+        now = datetime.utcnow()
+        table = cls.__table__
+        result = db.session.execute(
+            update(table)
+            .where(table.c.name == name, table.c.holder == holder)
+            .values(
+                holder=None,
+                lease_expires_at=None,
+                next_run_at=now + timedelta(seconds=interval),
+                last_finished_at=now,
+                last_status=status,
+                last_duration=duration,
+                last_error=str(error)[:2000] if error else None
+            )
+        )
+        db.session.commit()
+        return result.rowcount == 1
@@ -0,0 +1,115 @@
+import enum
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import Column, DateTime, Enum, Integer, String, Text, select, update
+from lumus.models.base import BaseModel
+from lumus.config.database import db
+
+
+class OutboxStatus(enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboxMessage(BaseModel):
+    """Notification written in the same transaction as the change it reports"""
+    __tablename__ = 'outbox_messages'
+    
+    kind = Column(String(50), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    
+    schedule_id = Column(Integer, index=True)
+    
+    status = Column(Enum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    claimed_by = Column(String(36), index=True)
+    last_error = Column(Text)
+    sent_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<OutboxMessage(id={self.id}, kind={self.kind}, status={self.status})>"
+    
+    @classmethod
+    def enqueue(cls, kind, recipient, subject, body, schedule_id=None):
+        """Add a message to the current session; it is committed with the caller's change"""
+        message = cls(
+            kind=kind,
+            recipient=recipient,
+            subject=subject,
+            body=body,
+            schedule_id=schedule_id,
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=datetime.utcnow()
+        )
+        db.session.add(message)
+        return message
+    
+    @classmethod
+    def claim_batch(cls, limit=50, lease_seconds=300):
+        """Lease up to ``limit`` due messages to this dispatcher and return them
+        
+        The lease moves ``next_attempt_at`` forward, so a dispatcher that dies
+        mid-batch only delays its messages until the lease expires.
+        """
+        now = datetime.utcnow()
+        token = str(uuid.uuid4())
+        table = cls.__table__
+        
+        due_ids = db.session.execute(
+            select(table.c.id)
+            .where(table.c.status == OutboxStatus.PENDING, table.c.next_attempt_at <= now)
+            .order_by(table.c.next_attempt_at, table.c.id)
+            .limit(limit)
+        ).scalars().all()
+        if not due_ids:
+            return []
+        
+        db.session.execute(
+            update(table)
+            .where(
+                table.c.id.in_(due_ids),
+                table.c.status == OutboxStatus.PENDING,
+                table.c.next_attempt_at <= now
+            )
+            .values(claimed_by=token, next_attempt_at=now + timedelta(seconds=lease_seconds))
+        )
+        db.session.commit()
+        
+        return cls.query.filter_by(claimed_by=token, status=OutboxStatus.PENDING).order_by(cls.id).all()
+    
+    def mark_sent(self):
+        self.status = OutboxStatus.SENT
+        self.sent_at = datetime.utcnow()
+        self.attempts += 1
+        self.claimed_by = None
+        self.last_error = None
+    
+    def release(self):
+        """Return a claimed message to the queue without counting an attempt"""
+        self.claimed_by = None
+        self.next_attempt_at = datetime.utcnow()
+    
+    def mark_failed(self, error, max_attempts, backoff):
+        """Schedule a retry after ``backoff(attempts)`` seconds, or give up after ``max_attempts``"""
+        self.attempts += 1
+        self.claimed_by = None
+        self.last_error = str(error)[:2000]
+        if self.attempts >= max_attempts:
+            self.status = OutboxStatus.FAILED
+        else:
+            self.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff(self.attempts))
+    
+    @classmethod
+    def prune_sent(cls, older_than):
+        """Delete delivered messages sent before ``older_than``"""
+        deleted = cls.query.filter(
+            cls.status == OutboxStatus.SENT,
+            cls.sent_at < older_than
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
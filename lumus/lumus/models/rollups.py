@@ -0,0 +1,167 @@
+from collections import Counter
+from sqlalchemy import Column, Date, Integer, String, UniqueConstraint, delete, event, func, insert, or_, select, update
+from sqlalchemy.orm import attributes
+from lumus.models.base import BaseModel
+from lumus.models.schedule import BookingStatus, Schedule
+from lumus.config.database import db
+
+
+ROLLUP_DIMENSIONS = ('lab', 'course', 'status')
+
+
+def _status_key(status):
+    if isinstance(status, BookingStatus):
+        return status.value
+    if isinstance(status, str) and status.upper() in BookingStatus.__members__:
+        return BookingStatus[status.upper()].value
+    return str(status or BookingStatus.CONFIRMED.value).lower()
+
+
+def rollup_keys(lab_nickname, course_code, status):
+    """``(dimension, key)`` pairs a booking counts towards
+
+    Lab and course counts only include bookings that still hold the lab;
+    status counts include every booking.
+    """
+    status = _status_key(status)
+    keys = [('status', status)]
+    if status != BookingStatus.CANCELLED.value:
+        keys.extend([('lab', lab_nickname), ('course', course_code)])
+    return keys
+
+
+class ScheduleRollup(BaseModel):
+    """Daily booking counts per lab, course and status, kept in step with schedule writes"""
+    __tablename__ = 'schedule_rollups'
+    __table_args__ = (
+        UniqueConstraint('day', 'dimension', 'key', name='uq_schedule_rollups_day_dimension_key'),
+    )
+    
+    day = Column(Date, nullable=False, index=True)
+    dimension = Column(String(10), nullable=False)
+    key = Column(String(50), nullable=False)
+    bookings = Column(Integer, nullable=False, default=0, server_default='0')
+    
+    def __repr__(self):
+        return f"<ScheduleRollup(day={self.day}, {self.dimension}={self.key}, bookings={self.bookings})>"
+    
+    @classmethod
+    def apply(cls, connection, deltas):
+        """Add ``{(day, dimension, key): delta}`` to the rollup rows, creating missing ones"""
+        table = cls.__table__
+        for (day, dimension, key), delta in deltas.items():
+            if not delta or day is None or key is None:
+                continue
+            values = {'day': day, 'dimension': dimension, 'key': key, 'bookings': delta}
+        
+            if connection.dialect.name in ('postgresql', 'sqlite'):
+                if connection.dialect.name == 'postgresql':
+                    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+                statement = dialect_insert(table).values(**values)
+                connection.execute(statement.on_conflict_do_update(
+                    index_elements=['day', 'dimension', 'key'],
+                    set_={'bookings': table.c.bookings + statement.excluded.bookings}
+                ))
+                continue
+        
+            result = connection.execute(
+                update(table)
+                .where(table.c.day == day, table.c.dimension == dimension, table.c.key == key)
+                .values(bookings=table.c.bookings + delta)
+            )
+            if not result.rowcount:
+                connection.execute(insert(table).values(**values))
+    
+    @classmethod
+    def record(cls, connection, old=None, new=None):
+        """Move one booking's counts from ``old`` to ``new`` ``(day, lab, course, status)`` values"""
+        deltas = Counter()
+        for values, sign in ((old, -1), (new, 1)):
+            if values:
+                day, lab_nickname, course_code, status = values
+                for dimension, key in rollup_keys(lab_nickname, course_code, status):
+                    deltas[(day, dimension, key)] += sign
+        cls.apply(connection, deltas)
+    
+    @classmethod
+    def rebuild(cls):
+        """Recompute every rollup row from the schedules table in one transaction"""
+        table = cls.__table__
+        schedules = Schedule.__table__
+        active = or_(schedules.c.status.is_(None), schedules.c.status != BookingStatus.CANCELLED)
+        
+        db.session.execute(delete(table))
+        for dimension, column, condition in (
+            ('lab', schedules.c.lab_nickname, active),
+            ('course', schedules.c.course_code, active),
+            ('status', schedules.c.status, None)
+        ):
+            query = select(schedules.c.date, column, func.count()).group_by(schedules.c.date, column)
+            if condition is not None:
+                query = query.where(condition)
+        
+            # NULL and CONFIRMED statuses share a key, so merge before inserting
+            counts = Counter()
+            for day, key, count in db.session.execute(query):
+                counts[(day, _status_key(key) if dimension == 'status' else key)] += count
+        
+            rows = [
+                {'day': day, 'dimension': dimension, 'key': key, 'bookings': count}
+                for (day, key), count in counts.items()
+            ]
+            if rows:
+                db.session.execute(insert(table), rows)
+        
+        db.session.commit()
+        return db.session.execute(select(func.count()).select_from(table)).scalar()
+    
+    @classmethod
+    def totals(cls, dimension, start_date=None, end_date=None):
+        """``{key: bookings}`` for one dimension over an optional date window"""
+        query = db.session.query(cls.key, func.sum(cls.bookings)).filter(cls.dimension == dimension)
+        if start_date:
+            query = query.filter(cls.day >= start_date)
+        if end_date:
+            query = query.filter(cls.day <= end_date)
+        
+        return {key: int(total) for key, total in query.group_by(cls.key).order_by(cls.key) if total}
+    
+    @classmethod
+    def daily(cls, dimension, start_date=None, end_date=None):
+        """``[(day, key, bookings)]`` rows for one dimension, oldest first"""
+        query = cls.query.filter(cls.dimension == dimension, cls.bookings != 0)
+        if start_date:
+            query = query.filter(cls.day >= start_date)
+        if end_date:
+            query = query.filter(cls.day <= end_date)
+        
+        return [(row.day, row.key, row.bookings) for row in query.order_by(cls.day, cls.key)]
+
+
+def _committed(target, name):
+    history = attributes.get_history(target, name)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, name)
+
+
+def _rollup_values(target, committed=False):
+    value = _committed if committed else getattr
+    return tuple(value(target, name) for name in ('date', 'lab_nickname', 'course_code', 'status'))
+
+
+@event.listens_for(Schedule, 'after_insert')
+def _rollup_insert(mapper, connection, target):
+    ScheduleRollup.record(connection, new=_rollup_values(target))
+
+
+@event.listens_for(Schedule, 'after_update')
+def _rollup_update(mapper, connection, target):
+    ScheduleRollup.record(connection, old=_rollup_values(target, committed=True), new=_rollup_values(target))
+
+
+@event.listens_for(Schedule, 'after_delete')
+def _rollup_delete(mapper, connection, target):
+    ScheduleRollup.record(connection, old=_rollup_values(target, committed=True))
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Date, JSON, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Integer, String, Text, Date, JSON, Enum, event, func, insert, select, update
+from sqlalchemy.orm import object_session, relationship
 from lumus.models.base import BaseModel
 from lumus.config.database import db
 import enum
@@ -34,6 +34,13 @@ class Schedule(BaseModel):
     
     user_id = Column(String(50), index=True)
     
+    change_seq = Column(BigInteger, index=True)
+    
+    version = Column(Integer, nullable=False, server_default='1')
+    
+    # Updates run as UPDATE ... WHERE id = ? AND version = ? and raise StaleDataError on a lost race
+    __mapper_args__ = {'version_id_col': version}
+    
     def __repr__(self):
         return f"<Schedule(id={self.id}, date={self.date}, lab={self.lab_nickname})>"
     
@@ -101,6 +108,79 @@ class Schedule(BaseModel):
                 booking_times = booking.times
             
             if set(times) & set(booking_times):
+                from lumus.utils.metrics import record_booking_conflict
+                record_booking_conflict(lab_nickname)
                 return True, booking
         
         return False, None
+    
+    @classmethod
+    def backfill_change_seq(cls):
+        """Give rows inserted without a change sequence (e.g. bulk Core inserts) one"""
+        from lumus.models.changes import ScheduleChangeCounter
+        connection = db.session.connection()
+        counter = ScheduleChangeCounter.__table__
+        base, _ = ScheduleChangeCounter.current(connection)
+        max_id = connection.execute(
+            select(func.max(cls.id)).where(cls.change_seq.is_(None))
+        ).scalar()
+        if max_id is None:
+            return 0
+        
+        result = connection.execute(
+            update(cls.__table__)
+            .where(cls.__table__.c.change_seq.is_(None))
+            .values(change_seq=cls.__table__.c.id + base)
+        )
+        connection.execute(
+            update(counter).where(counter.c.id == 1).values(value=base + max_id)
+        )
+        db.session.commit()
+        return result.rowcount
+    
+    @classmethod
+    def get_changes(cls, since=0, limit=500):
+        """Rows and tombstones changed after ``since``, oldest first, capped at ``limit``"""
+        from lumus.models.changes import ScheduleTombstone
+        upserts = cls.query.filter(cls.change_seq > since).order_by(cls.change_seq).limit(limit + 1).all()
+        tombstones = ScheduleTombstone.query.filter(
+            ScheduleTombstone.change_seq > since
+        ).order_by(ScheduleTombstone.change_seq).limit(limit + 1).all()
+        
+        merged = sorted(upserts + tombstones, key=lambda change: change.change_seq)
+        has_more = len(merged) > limit
+        merged = merged[:limit]
+        
+        return {
+            'updated': [change for change in merged if isinstance(change, cls)],
+            'deleted': [change for change in merged if not isinstance(change, cls)],
+            'last_seq': merged[-1].change_seq if merged else since,
+            'has_more': has_more
+        }
+
+
+@event.listens_for(Schedule, 'before_insert')
+def _assign_insert_change_seq(mapper, connection, target):
+    from lumus.models.changes import ScheduleChangeCounter
+    target.change_seq = ScheduleChangeCounter.next_value(connection)
+
+
+@event.listens_for(Schedule, 'before_update')
+def _assign_update_change_seq(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and not session.is_modified(target, include_collections=False):
+        return
+    
+    from lumus.models.changes import ScheduleChangeCounter
+    target.change_seq = ScheduleChangeCounter.next_value(connection)
+
+
+@event.listens_for(Schedule, 'after_delete')
+def _write_tombstone(mapper, connection, target):
+    from lumus.models.changes import ScheduleChangeCounter, ScheduleTombstone
+    connection.execute(insert(ScheduleTombstone.__table__).values(
+        schedule_id=target.id,
+        change_seq=ScheduleChangeCounter.next_value(connection),
+        date=target.date,
+        lab_nickname=target.lab_nickname
+    ))
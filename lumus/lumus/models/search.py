@@ -0,0 +1,148 @@
+import re
+from sqlalchemy import event, false, func, literal_column, or_, select, text
+from lumus.config.database import db
+
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_SEARCH_OBJECT_RE = re.compile(r'^(\w+_fts(_data|_idx|_config|_docsize)?|ix_\w+_trgm)$')
+
+
+def _tokens(query_string):
+    return _TOKEN_RE.findall(query_string or '')
+
+
+def _fts_table(table_name):
+    return f'{table_name}_fts'
+
+
+def _sqlite_ddl(table_name, columns):
+    fts = _fts_table(table_name)
+    cols = ', '.join(columns)
+    new_values = ', '.join(f'new.{c}' for c in columns)
+    old_values = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table_name}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+    ]
+
+
+def _postgresql_ddl(table_name, columns):
+    statements = ['CREATE EXTENSION IF NOT EXISTS pg_trgm']
+    for column in columns:
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{column}_trgm "
+            f"ON {table_name} USING gin ({column} gin_trgm_ops)"
+        )
+    return statements
+
+
+def is_search_index_object(name, type_):
+    """True for FTS5 shadow tables and pg_trgm indexes, which live outside the models' metadata"""
+    return type_ in ('table', 'index') and bool(_SEARCH_OBJECT_RE.match(name or ''))
+
+
+def create_search_index(connection, table_name, columns):
+    """Create the dialect's search index for a table (FTS5 on SQLite, pg_trgm on PostgreSQL)"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        statements = _sqlite_ddl(table_name, columns)
+    elif dialect == 'postgresql':
+        statements = _postgresql_ddl(table_name, columns)
+    else:
+        return
+
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def drop_search_index(connection, table_name, columns):
+    """Drop the search index created by create_search_index"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        fts = _fts_table(table_name)
+        for suffix in ('ai', 'ad', 'au'):
+            connection.execute(text(f'DROP TRIGGER IF EXISTS {fts}_{suffix}'))
+        connection.execute(text(f'DROP TABLE IF EXISTS {fts}'))
+    elif dialect == 'postgresql':
+        for column in columns:
+            connection.execute(text(f'DROP INDEX IF EXISTS ix_{table_name}_{column}_trgm'))
+
+
+class SearchableMixin:
+    """Indexed, ranked search over ``__search_columns__``"""
+
+    __search_columns__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__dict__.get('__search_columns__') and hasattr(cls, '__table__'):
+            table = cls.__table__
+            columns = list(cls.__search_columns__)
+            event.listen(
+                table, 'after_create',
+                lambda target, connection, **kw: create_search_index(connection, target.name, columns)
+            )
+            event.listen(
+                table, 'before_drop',
+                lambda target, connection, **kw: drop_search_index(connection, target.name, columns)
+            )
+
+    @classmethod
+    def _fts_match(cls, query_string, prefix):
+        tokens = _tokens(query_string)
+        if not tokens:
+            return None
+        if prefix:
+            return ' '.join(f'"{token}"*' for token in tokens)
+        return ' '.join(f'"{token}"' for token in tokens[:-1]) + f' "{tokens[-1]}"*'
+
+    @classmethod
+    def apply_search(cls, query, query_string, prefix=False):
+        """Filter ``query`` to rows matching ``query_string``, best matches first"""
+        columns = [getattr(cls, name) for name in cls.__search_columns__]
+        dialect = db.engine.dialect.name
+
+        if dialect == 'sqlite':
+            match = cls._fts_match(query_string, prefix)
+            if match is None:
+                return query.filter(false())
+            fts = _fts_table(cls.__tablename__)
+            ranked = (
+                select(
+                    literal_column('rowid').label('id'),
+                    literal_column(f'bm25({fts})').label('rank')
+                )
+                .select_from(text(fts))
+                .where(text(f'{fts} MATCH :match').bindparams(match=match))
+                .subquery()
+            )
+            return query.join(ranked, ranked.c.id == cls.id).order_by(ranked.c.rank)
+
+        pattern = f'{query_string}%' if prefix else f'%{query_string}%'
+        query = query.filter(or_(*[column.ilike(pattern) for column in columns]))
+        if dialect == 'postgresql':
+            query = query.order_by(
+                func.greatest(*[func.similarity(column, query_string) for column in columns]).desc()
+            )
+        return query
+
+    @classmethod
+    def search(cls, query_string, limit=None):
+        query = cls.apply_search(cls.query, query_string)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    @classmethod
+    def autocomplete(cls, prefix, limit=10):
+        """Fast prefix lookup for search boxes"""
+        return cls.apply_search(cls.query, prefix, prefix=True).limit(limit).all()
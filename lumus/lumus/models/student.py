@@ -1,17 +1,20 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, ForeignKey, event
+from sqlalchemy.orm import joinedload, relationship
+from sqlalchemy.orm.attributes import get_history
 from lumus.models.base import BaseModel
+from lumus.models.search import SearchableMixin
 from lumus.config.database import db
 
 
-class Student(BaseModel):
+class Student(SearchableMixin, BaseModel):
     __tablename__ = 'students'
+    __search_columns__ = ('name', 'email', 'registration_number')
     
     name = Column(String(100), nullable=False)
     email = Column(String(100), nullable=False, unique=True, index=True)
     
     course_id = Column(Integer, ForeignKey('courses.id'), nullable=False, index=True)
-    course = relationship("Course", back_populates="students")
+    course = relationship("Course", back_populates="students", lazy="raise_on_sql")
     
     phone = Column(String(20))
     registration_number = Column(String(20), unique=True, index=True)
@@ -33,9 +36,14 @@ class Student(BaseModel):
         
         return result
     
+    @classmethod
+    def with_course(cls):
+        """Query students with their course eagerly joined, for to_dict(include_course=True)"""
+        return cls.query.options(joinedload(cls.course))
+    
     @classmethod
     def get_by_email(cls, email):
-        return cls.query.filter_by(email=email).first()
+        return cls.with_course().filter_by(email=email).first()
     
     @classmethod
     def get_by_course(cls, course_id):
@@ -46,13 +54,6 @@ class Student(BaseModel):
         from lumus.models.course import Course
         return cls.query.join(Course).filter(Course.course_code == course_code).all()
     
-    @classmethod
-    def search(cls, query_string):
-        return cls.query.filter(
-            (cls.name.ilike(f'%{query_string}%')) |
-            (cls.email.ilike(f'%{query_string}%'))
-        ).all()
-    
     @classmethod
     def get_by_registration_number(cls, registration_number):
         return cls.query.filter_by(registration_number=registration_number).first()
@@ -63,7 +64,11 @@ class Student(BaseModel):
         
         old_course_id = self.course_id
         self.course_id = new_course.id
-        db.session.commit()
+        try:
+            db.session.commit()
+        except ValueError:
+            db.session.rollback()
+            raise
         
         return {
             'student': self,
@@ -72,10 +77,39 @@ class Student(BaseModel):
         }
     
     def get_schedules(self):
+        from lumus.models.course import Course
+        from lumus.models.schedule import Schedule
+        return Schedule.query.join(
+            Course, Course.course_code == Schedule.course_code
+        ).filter(Course.id == self.course_id).all()
+    
+    @classmethod
+    def get_timetables(cls, course_id=None, student_id=None, start_date=None, end_date=None):
+        """Load students and their courses' schedules with two queries
+        
+        Returns ``(students, schedules_by_course_code)``. Students share their
+        course's schedules, so each list is loaded and returned once per course.
+        """
         from lumus.models.schedule import Schedule
-        return Schedule.query.filter_by(
-            course_code=self.course.course_code
-        ).all()
+        
+        query = cls.with_course()
+        if course_id is not None:
+            query = query.filter(cls.course_id == course_id)
+        if student_id is not None:
+            query = query.filter(cls.id == student_id)
+        students = query.order_by(cls.name, cls.id).all()
+        
+        schedules = {student.course.course_code: [] for student in students}
+        if schedules:
+            schedule_query = Schedule.query.filter(Schedule.course_code.in_(schedules))
+            if start_date:
+                schedule_query = schedule_query.filter(Schedule.date >= start_date)
+            if end_date:
+                schedule_query = schedule_query.filter(Schedule.date <= end_date)
+            for schedule in schedule_query.order_by(Schedule.date, Schedule.id):
+                schedules[schedule.course_code].append(schedule)
+        
+        return students, schedules
     
     @classmethod
     def bulk_create(cls, students_data):
@@ -88,3 +122,27 @@ class Student(BaseModel):
         db.session.commit()
         
         return students
+
+
+@event.listens_for(Student, 'after_insert')
+def _increment_enrolled_count(mapper, connection, target):
+    from lumus.models.course import Course
+    Course.reserve_seat(connection, target.course_id)
+
+
+@event.listens_for(Student, 'after_delete')
+def _decrement_enrolled_count(mapper, connection, target):
+    from lumus.models.course import Course
+    Course.adjust_enrolled_count(connection, target.course_id, -1)
+
+
+@event.listens_for(Student, 'after_update')
+def _move_enrolled_count(mapper, connection, target):
+    history = get_history(target, 'course_id')
+    if not history.has_changes() or not history.deleted:
+        return
+    
+    from lumus.models.course import Course
+    Course.reserve_seat(connection, target.course_id)
+    for old_course_id in history.deleted:
+        Course.adjust_enrolled_count(connection, old_course_id, -1)
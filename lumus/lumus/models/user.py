@@ -1,8 +1,11 @@
+import hmac
+import secrets
 from sqlalchemy import Column, String, Integer, DateTime, Boolean, Enum
 from sqlalchemy.sql import func
 from werkzeug.security import generate_password_hash, check_password_hash
 from enum import Enum as PyEnum
 from lumus.models.base import BaseModel
+from lumus.models.search import SearchableMixin
 from lumus.config.database import db
 
 
@@ -13,8 +16,9 @@ class UserType(PyEnum):
     PROFESSOR = "professor"
 
 
-class User(BaseModel):
+class User(SearchableMixin, BaseModel):
     __tablename__ = 'users'
+    __search_columns__ = ('name', 'email')
     
     name = Column(String(100), nullable=False)
     email = Column(String(100), nullable=False, unique=True, index=True)
@@ -31,6 +35,8 @@ class User(BaseModel):
     profile_image = Column(String(255))
     bio = Column(String(500))
     
+    calendar_token = Column(String(64))
+    
     def __repr__(self):
         return f"<User(id={self.id}, name={self.name}, email={self.email}, type={self.type})>"
     
@@ -50,6 +56,7 @@ class User(BaseModel):
         
         if not include_sensitive:
             result.pop('password_hash', None)
+            result.pop('calendar_token', None)
         
         return result
     
@@ -69,13 +76,6 @@ class User(BaseModel):
     def get_admins(cls):
         return cls.query.filter_by(type=UserType.ADMIN).all()
     
-    @classmethod
-    def search(cls, query_string):
-        return cls.query.filter(
-            (cls.name.ilike(f'%{query_string}%')) |
-            (cls.email.ilike(f'%{query_string}%'))
-        ).all()
-    
     def is_admin(self):
         return self.type == UserType.ADMIN
     
@@ -98,6 +98,14 @@ class User(BaseModel):
         self.login_count += 1
         db.session.commit()
     
+    def regenerate_calendar_token(self):
+        self.calendar_token = secrets.token_urlsafe(32)
+        db.session.commit()
+        return self.calendar_token
+    
+    def check_calendar_token(self, token):
+        return bool(self.calendar_token and token) and hmac.compare_digest(self.calendar_token, token)
+    
     def change_password(self, new_password):
         self.set_password(new_password)
         db.session.commit()
@@ -1,29 +1,50 @@
-
+from importlib import import_module
 from flask import Flask
-from .auth import auth_bp
-from .user import user_bp
-from .course import course_bp
-from .student import student_bp
-from .schedule import schedule_bp
-from .lab import lab_bp
+
+
+# Blueprint name -> (module, attribute). Modules are imported on registration
+# so importing this package stays cheap.
+BLUEPRINTS = {
+    'auth': ('.auth', 'auth_bp'),
+    'user': ('.user', 'user_bp'),
+    'course': ('.course', 'course_bp'),
+    'student': ('.student', 'student_bp'),
+    'schedule': ('.schedule', 'schedule_bp'),
+    'lab': ('.lab', 'lab_bp'),
+    'analytics': ('.analytics', 'analytics_bp'),
+    'metrics': ('.metrics', 'metrics_bp')
+}
+
+
+def load_blueprint(name):
+    """Import and return a blueprint by name"""
+    module_name, attr = BLUEPRINTS[name]
+    return getattr(import_module(module_name, __name__), attr)
 
 
 def register_blueprints(app: Flask):
     """Register all blueprints with the Flask app"""
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(user_bp)
-    app.register_blueprint(course_bp)
-    app.register_blueprint(student_bp)
-    app.register_blueprint(schedule_bp)
-    app.register_blueprint(lab_bp)
+    enabled = app.config.get('ENABLED_BLUEPRINTS') or BLUEPRINTS.keys()
+    for name in enabled:
+        app.register_blueprint(load_blueprint(name))
+
+
+def __getattr__(attr):
+    for name, (_, bp_attr) in BLUEPRINTS.items():
+        if bp_attr == attr:
+            return load_blueprint(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
 __all__ = [
     'register_blueprints',
+    'load_blueprint',
     'auth_bp',
     'user_bp',
     'course_bp',
     'student_bp',
     'schedule_bp',
-    'lab_bp'
+    'lab_bp',
+    'analytics_bp',
+    'metrics_bp'
 ]
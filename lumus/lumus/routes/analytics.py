@@ -0,0 +1,58 @@
+from flask import Blueprint, current_app, request, jsonify
+from flask_jwt_extended import jwt_required
+from lumus.utils.auth import require_permission
+from lumus.utils.analytics import compute_utilization, numpy_available
+from datetime import datetime, date, timedelta
+
+
+analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/analytics')
+
+
+@analytics_bp.route('/utilization', methods=['GET'])
+@jwt_required()
+@require_permission('read_schedule')
+def get_utilization():
+    """Occupancy heatmaps and utilization percentages per lab"""
+    try:
+        if not numpy_available():
+            return jsonify({'error': 'Utilization analytics require numpy'}), 501
+        
+        config = current_app.config
+        try:
+            end_date = request.args.get('end')
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else date.today()
+            start_date = request.args.get('start')
+            start_date = (
+                datetime.strptime(start_date, '%Y-%m-%d').date() if start_date
+                else end_date - timedelta(days=config.get('ANALYTICS_DEFAULT_DAYS', 120) - 1)
+            )
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        if start_date > end_date:
+            return jsonify({'error': 'start must not be after end'}), 400
+        if (end_date - start_date).days >= config.get('ANALYTICS_MAX_DAYS', 400):
+            return jsonify({'error': f"Window is limited to {config.get('ANALYTICS_MAX_DAYS', 400)} days"}), 400
+        
+        weekdays = request.args.get('weekdays')
+        try:
+            weekdays = (
+                [int(day) for day in weekdays.split(',')] if weekdays
+                else config.get('ANALYTICS_WEEKDAYS', list(range(7)))
+            )
+        except ValueError:
+            weekdays = None
+        if not weekdays or any(day < 0 or day > 6 for day in weekdays):
+            return jsonify({'error': 'weekdays must be a comma-separated list of 0 (Monday) to 6 (Sunday)'}), 400
+        
+        result = compute_utilization(
+            start_date,
+            end_date,
+            config['DEFAULT_TIME_SLOTS'],
+            weekdays=weekdays,
+            lab_nickname=request.args.get('lab')
+        )
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,12 +1,19 @@
 
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
 from werkzeug.exceptions import BadRequest, NotFound
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from lumus.models.course import Course
 from lumus.models.student import Student
 from lumus.config.database import db
 from lumus.utils.auth import require_permission
+from lumus.utils.concurrency import check_if_match, precondition_failed, with_version_etag
+from lumus.utils.instrumentation import query_budget
+from lumus.utils.pagination import count_mode, paginate
+from lumus.utils.calendar import calendar_response, feed_query
 
 
 course_bp = Blueprint('course', __name__, url_prefix='/api/courses')
@@ -31,6 +38,7 @@ def get_courses_public():
 
 
 @course_bp.route('', methods=['GET'])
+@query_budget(3)
 def get_courses():
     """Get all courses with pagination and filtering"""
     try:
@@ -39,48 +47,58 @@ def get_courses():
         search = request.args.get('search', '')
         period = request.args.get('period', '')
         
+        try:
+            count = count_mode(request.args.get('count'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         query = Course.query
         
         if search:
-            query = query.filter(
-                (Course.name.ilike(f'%{search}%')) |
-                (Course.nickname.ilike(f'%{search}%')) |
-                (Course.course_code.ilike(f'%{search}%'))
-            )
+            query = Course.apply_search(query, search)
         
         if period:
             query = query.filter(Course.period == period)
         
-        paginated = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        paginated = paginate(query, page, per_page, count=count)
         
         courses = [course.to_dict() for course in paginated.items]
         
         return jsonify({
             'courses': courses,
-            'pagination': {
-                'page': paginated.page,
-                'pages': paginated.pages,
-                'per_page': paginated.per_page,
-                'total': paginated.total
-            }
+            'pagination': paginated.to_dict()
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@course_bp.route('/available', methods=['GET'])
+def get_available_courses():
+    """Get courses that still have free seats"""
+    try:
+        courses = Course.get_courses_with_availability()
+        
+        return jsonify({
+            'courses': [
+                dict(course.to_dict(), available_slots=course.get_available_slots())
+                for course in courses
+            ],
+            'total': len(courses)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @course_bp.route('/<int:course_id>', methods=['GET'])
 @jwt_required()
 @require_permission('read_course')
 def get_course(course_id):
     """Get a specific course"""
     try:
-        course = Course.query.get_or_404(course_id)
-        return jsonify(course.to_dict(include_students=True))
+        course = Course.query.options(selectinload(Course.students)).get_or_404(course_id)
+        return with_version_etag(jsonify(course.to_dict(include_students=True)), course)
     except NotFound:
         return jsonify({'error': 'Course not found'}), 404
     except Exception as e:
@@ -130,7 +148,7 @@ def create_course():
 @jwt_required()
 @require_permission('update_course')
 def update_course(course_id):
-    """Update a course"""
+    """Update a course; an If-Match ETag makes the update fail with 412 if the course changed"""
     try:
         course = Course.query.get_or_404(course_id)
         data = request.get_json()
@@ -138,16 +156,23 @@ def update_course(course_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
+        stale = check_if_match(course, 'Course was modified by another request')
+        if stale is not None:
+            return stale
+        
         for field in ['name', 'nickname', 'course_code', 'period', 'capacity', 'description']:
             if field in data:
                 setattr(course, field, data[field])
         
         db.session.commit()
         
-        return jsonify(course.to_dict())
+        return with_version_etag(jsonify(course.to_dict()), course)
         
     except NotFound:
         return jsonify({'error': 'Course not found'}), 404
+    except StaleDataError:
+        db.session.rollback()
+        return precondition_failed('Course was modified by another request')
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -161,7 +186,10 @@ def delete_course(course_id):
     try:
         course = Course.query.get_or_404(course_id)
         
-        if course.students:
+        has_students = db.session.query(
+            Student.query.filter_by(course_id=course.id).exists()
+        ).scalar()
+        if has_students:
             return jsonify({'error': 'Cannot delete course with enrolled students'}), 409
         
         db.session.delete(course)
@@ -177,17 +205,114 @@ def delete_course(course_id):
 
 
 @course_bp.route('/<int:course_id>/students', methods=['GET'])
+@query_budget(4)
 @jwt_required()
 @require_permission('read_student')
 def get_course_students(course_id):
-    """Get all students in a course"""
+    """Get the students in a course with pagination and search"""
+    try:
+        course = Course.query.get_or_404(course_id)
+        
+        page = request.args.get('page', 1, type=int)
+        per_page = min(request.args.get('per_page', 20, type=int), 100)
+        search = request.args.get('search', '')
+        
+        try:
+            count = count_mode(request.args.get('count'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = Student.query.filter(Student.course_id == course.id)
+        
+        if search:
+            query = Student.apply_search(query, search)
+        else:
+            query = query.order_by(Student.name, Student.id)
+        
+        paginated = paginate(query, page, per_page, count=count)
+        
+        return jsonify({
+            'course': course.to_dict(),
+            'students': [student.to_dict() for student in paginated.items],
+            'total_students': course.get_student_count(),
+            'pagination': paginated.to_dict()
+        })
+        
+    except NotFound:
+        return jsonify({'error': 'Course not found'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@course_bp.route('/<course_code>/calendar.ics', methods=['GET'])
+@cross_origin()
+def get_course_calendar(course_code):
+    """iCalendar feed of a course code's bookings"""
+    try:
+        if not Course.query.filter_by(course_code=course_code).first():
+            return jsonify({'error': 'Course not found'}), 404
+        
+        return calendar_response(feed_query(course_code=course_code), f'Course {course_code}')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@course_bp.route('/autocomplete', methods=['GET'])
+def autocomplete_courses():
+    """Prefix autocomplete for the courses search box"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        limit = min(request.args.get('limit', 10, type=int), 50)
+        
+        if not prefix:
+            return jsonify({'courses': []}), 200
+        
+        courses = Course.autocomplete(prefix, limit=limit)
+        
+        return jsonify({
+            'courses': [{
+                'id': course.id,
+                'name': course.name,
+                'nickname': course.nickname,
+                'course_code': course.course_code
+            } for course in courses]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@course_bp.route('/<int:course_id>/timetable', methods=['GET'])
+@query_budget(4)
+@jwt_required()
+@require_permission('read_schedule')
+def get_course_timetable(course_id):
+    """Get a course's schedules and the students who share them"""
     try:
         course = Course.query.get_or_404(course_id)
-        students = [student.to_dict() for student in course.students]
+        
+        start_date = request.args.get('start')
+        end_date = request.args.get('end')
+        
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        students, schedules = Student.get_timetables(
+            course_id=course_id, start_date=start_date, end_date=end_date
+        )
+        schedules = schedules.get(course.course_code, [])
         
         return jsonify({
             'course': course.to_dict(),
-            'students': students,
+            'start': start_date.isoformat() if start_date else None,
+            'end': end_date.isoformat() if end_date else None,
+            'schedules': [schedule.to_dict() for schedule in schedules],
+            'total_schedules': len(schedules),
+            'students': [student.to_dict() for student in students],
             'total_students': len(students)
         })
         
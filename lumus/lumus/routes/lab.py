@@ -4,6 +4,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from lumus.models.base import db
 from lumus.models.schedule import Schedule
 from lumus.models.lab import Lab
+from lumus.utils.calendar import calendar_response, feed_query
 from sqlalchemy import distinct
 
 lab_bp = Blueprint('lab', __name__, url_prefix='/api/labs')
@@ -88,6 +89,21 @@ def get_lab(nickname):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@lab_bp.route('/<nickname>/calendar.ics', methods=['GET'])
+@cross_origin()
+def get_lab_calendar(nickname):
+    """iCalendar feed of a lab's bookings"""
+    try:
+        lab = Lab.get_by_nickname(nickname)
+        if not lab:
+            return jsonify({'error': 'Lab not found'}), 404
+        
+        return calendar_response(feed_query(lab_nickname=lab.nickname), f'Lab {lab.nickname}')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @lab_bp.route('/<nickname>/availability', methods=['GET'])
 @cross_origin()
 def get_lab_availability(nickname):
@@ -0,0 +1,22 @@
+from flask import Blueprint, Response, current_app, jsonify
+from lumus.utils.metrics import generate_metrics
+
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose application metrics in the Prometheus text format"""
+    if not current_app.config.get('METRICS_ENABLED', True):
+        return jsonify({'error': 'Metrics are disabled'}), 404
+
+    try:
+        data, content_type = generate_metrics()
+        return Response(data, content_type=content_type)
+
+    except Exception as e:
+        current_app.logger.error(f"Metrics error: {str(e)}")
+        return jsonify({
+            'error': 'Internal server error'
+        }), 500
@@ -1,12 +1,23 @@
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
 from werkzeug.exceptions import BadRequest, NotFound
-from lumus.models.schedule import Schedule
+from sqlalchemy.orm.exc import StaleDataError
+from lumus.models.schedule import Schedule, BookingStatus
 from lumus.models.course import Course
+from lumus.models.changes import ScheduleChangeCounter
+from lumus.models.rollups import ScheduleRollup
 from lumus.config.database import db
 from lumus.utils.auth import require_permission
+from lumus.utils.concurrency import check_if_match, precondition_failed, with_version_etag
+from lumus.utils.events import get_broker, publish_schedule_event, stream_events
+from lumus.utils.idempotency import IdempotentRequest
+from lumus.utils.instrumentation import query_budget
+from lumus.utils.outbox import enqueue_booking_notification
+from lumus.utils.export import (
+    EXPORT_FORMATS, iter_batches, parquet_available, schedule_export_query, stream_csv, stream_parquet
+)
 from datetime import datetime, date
 
 
@@ -41,6 +52,7 @@ def create_schedule_public():
 
 
 @schedule_bp.route('', methods=['GET'])
+@query_budget(3)
 @cross_origin()
 def get_schedules():
     """Get all schedules with pagination and filtering"""
@@ -108,6 +120,149 @@ def get_schedules():
         return jsonify({'error': str(e)}), 500
 
 
+@schedule_bp.route('/export', methods=['GET'])
+@jwt_required()
+@require_permission('read_schedule')
+def export_schedules():
+    """Stream schedules as CSV or Parquet"""
+    try:
+        fmt = request.args.get('format', 'csv').lower()
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': 'Invalid format. Use csv or parquet'}), 400
+        
+        if fmt == 'parquet' and not parquet_available():
+            return jsonify({'error': 'Parquet export requires pyarrow'}), 501
+        
+        start_date = request.args.get('start')
+        end_date = request.args.get('end')
+        lab_nickname = request.args.get('lab')
+        
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        query = schedule_export_query(start_date, end_date, lab_nickname)
+        batches = iter_batches(query, current_app.config.get('EXPORT_BATCH_SIZE', 5000))
+        body = stream_csv(batches) if fmt == 'csv' else stream_parquet(batches)
+        
+        filename = '-'.join(
+            ['schedules'] + [part.isoformat() for part in (start_date, end_date) if part]
+        ) + f'.{fmt}'
+        
+        return Response(
+            stream_with_context(body),
+            content_type=EXPORT_FORMATS[fmt],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@schedule_bp.route('/summary', methods=['GET'])
+@query_budget(6)
+@jwt_required()
+@require_permission('read_schedule')
+def get_schedule_summary():
+    """Booking counts per lab, course, status and day, read from the daily rollups"""
+    try:
+        start_date = request.args.get('start')
+        end_date = request.args.get('end')
+        
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        by_lab = ScheduleRollup.totals('lab', start_date, end_date)
+        
+        daily = {}
+        for day, lab_nickname, bookings in ScheduleRollup.daily('lab', start_date, end_date):
+            entry = daily.setdefault(day, {'date': day.isoformat(), 'bookings': 0, 'by_lab': {}})
+            entry['bookings'] += bookings
+            entry['by_lab'][lab_nickname] = bookings
+        
+        return jsonify({
+            'start': start_date.isoformat() if start_date else None,
+            'end': end_date.isoformat() if end_date else None,
+            'bookings': sum(by_lab.values()),
+            'by_status': ScheduleRollup.totals('status', start_date, end_date),
+            'by_lab': by_lab,
+            'by_course': ScheduleRollup.totals('course', start_date, end_date),
+            'daily': list(daily.values())
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@schedule_bp.route('/changes', methods=['GET'])
+@query_budget(4)
+@cross_origin()
+def get_schedule_changes():
+    """Schedules created, updated or deleted since a change token"""
+    try:
+        token = request.args.get('since', '0') or '0'
+        try:
+            since = int(token)
+            if since < 0:
+                raise ValueError
+        except ValueError:
+            return jsonify({'error': 'Invalid change token'}), 400
+        
+        limit = min(request.args.get('limit', 500, type=int), 1000)
+        
+        _, pruned_through = ScheduleChangeCounter.current()
+        if since and since < pruned_through:
+            return jsonify({'error': 'Change token expired, resync from since=0'}), 410
+        
+        changes = Schedule.get_changes(since=since, limit=limit)
+        
+        return jsonify({
+            'updated': [schedule.to_dict() for schedule in changes['updated']],
+            'deleted': [tombstone.to_dict() for tombstone in changes['deleted']],
+            'next_token': str(changes['last_seq']),
+            'has_more': changes['has_more']
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@schedule_bp.route('/stream', methods=['GET'])
+@cross_origin()
+def stream_schedules():
+    """Server-sent events for schedule creates, updates and deletes"""
+    try:
+        lab_nickname = request.args.get('lab') or None
+        date_str = request.args.get('date') or None
+        
+        if date_str:
+            try:
+                date_str = datetime.strptime(date_str, '%Y-%m-%d').date().isoformat()
+            except ValueError:
+                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        events = stream_events(
+            get_broker(),
+            lab=lab_nickname,
+            date=date_str,
+            keepalive=current_app.config.get('SSE_KEEPALIVE_SECONDS', 15)
+        )
+        
+        return Response(
+            events,
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @schedule_bp.route('/<int:schedule_id>', methods=['GET'])
 @jwt_required()
 @require_permission('read_schedule')
@@ -115,20 +270,41 @@ def get_schedule(schedule_id):
     """Get a specific schedule"""
     try:
         schedule = Schedule.query.get_or_404(schedule_id)
-        return jsonify(schedule.to_dict())
+        return with_version_etag(jsonify(schedule.to_dict()), schedule)
     except NotFound:
         return jsonify({'error': 'Schedule not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _booking_conflict(schedule_date, times, lab_nickname, status, exclude_id=None):
+    """409 response when the booking overlaps a confirmed one, otherwise None"""
+    if str(getattr(status, 'value', status)).lower() == BookingStatus.CANCELLED.value:
+        return None
+    
+    conflict, existing = Schedule.check_conflict(schedule_date, times, lab_nickname, exclude_id=exclude_id)
+    if not conflict:
+        return None
+    
+    return jsonify({
+        'error': 'Time slot already booked',
+        'conflict': existing.to_dict()
+    }), 409
+
+
 @schedule_bp.route('', methods=['POST'])
 @cross_origin()
 def create_schedule():
-    """Create a new schedule"""
+    """Create a new schedule; retries carrying the same Idempotency-Key replay the first response"""
     try:
         data = request.get_json()
         
+        idempotent = IdempotentRequest.from_request()
+        if idempotent:
+            replay = idempotent.replay()
+            if replay is not None:
+                return replay
+        
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
@@ -181,17 +357,27 @@ def create_schedule():
             'user_id': data.get('user_id', 'guest')
         }
         
+        conflict = _booking_conflict(schedule_date, data['times'], schedule_data['lab_nickname'], status)
+        if conflict is not None:
+            return conflict
+        
+        if idempotent:
+            conflict = idempotent.reserve()
+            if conflict is not None:
+                return conflict
+        
         from sqlalchemy import text
         
         sql = text("""
-            INSERT INTO schedules (date, times, user_name, course_code, annotation, repeat_type, lab_nickname, status, user_id, created_at, updated_at)
-            VALUES (:date, :times, :user_name, :course_code, :annotation, :repeat_type, :lab_nickname, :status, :user_id, datetime('now'), datetime('now'))
+            INSERT INTO schedules (date, times, user_name, course_code, annotation, repeat_type, lab_nickname, status, user_id, change_seq, created_at, updated_at)
+            VALUES (:date, :times, :user_name, :course_code, :annotation, :repeat_type, :lab_nickname, :status, :user_id, :change_seq, datetime('now'), datetime('now'))
+            RETURNING id
         """)
         
         import json
         times_json = json.dumps(data['times'])
         
-        result = db.session.execute(sql, {
+        schedule_id = db.session.execute(sql, {
             'date': schedule_date.isoformat(),
             'times': times_json,
             'user_name': data['user_name'],
@@ -200,21 +386,19 @@ def create_schedule():
             'repeat_type': repeat_type.value.upper(),  # Use uppercase
             'lab_nickname': data.get('lab_nickname', 'LAB01'),
             'status': status.value.upper(),  # Use uppercase
-            'user_id': data.get('user_id', 'guest')
-        })
-        
-        db.session.commit()
+            'user_id': data.get('user_id', 'guest'),
+            'change_seq': ScheduleChangeCounter.next_value(db.session.connection())
+        }).scalar()
+        ScheduleRollup.record(
+            db.session.connection(),
+            new=(schedule_date, schedule_data['lab_nickname'], data['course_code'], status)
+        )
         
         latest_schedule = db.session.execute(text("""
-            SELECT id, date, times, user_name, course_code, annotation, repeat_type, lab_nickname, status, user_id
+            SELECT id, date, times, user_name, course_code, annotation, repeat_type, lab_nickname, status, user_id, version
             FROM schedules 
-            WHERE user_name = :user_name AND course_code = :course_code AND date = :date
-            ORDER BY id DESC LIMIT 1
-        """), {
-            'user_name': data['user_name'],
-            'course_code': data['course_code'],
-            'date': schedule_date.isoformat()
-        }).fetchone()
+            WHERE id = :id
+        """), {'id': schedule_id}).fetchone()
         
         if latest_schedule:
             created_schedule = {
@@ -227,7 +411,8 @@ def create_schedule():
                 'repeat_type': latest_schedule[6].upper() if latest_schedule[6] else 'NONE',
                 'lab_nickname': latest_schedule[7],
                 'status': latest_schedule[8].upper() if latest_schedule[8] else 'PENDING',
-                'user_id': latest_schedule[9]
+                'user_id': latest_schedule[9],
+                'version': latest_schedule[10]
             }
         else:
             created_schedule = {
@@ -240,9 +425,17 @@ def create_schedule():
                 'repeat_type': repeat_type.value.upper(),
                 'lab_nickname': data.get('lab_nickname', 'LAB01'),
                 'status': status.value.upper(),
-                'user_id': data.get('user_id', 'guest')
+                'user_id': data.get('user_id', 'guest'),
+                'version': 1
             }
         
+        enqueue_booking_notification('booking_confirmation', created_schedule)
+        if idempotent:
+            idempotent.complete(201, created_schedule)
+        db.session.commit()
+        
+        publish_schedule_event('created', created_schedule)
+        
         return jsonify(created_schedule), 201
         
     except Exception as e:
@@ -258,7 +451,7 @@ def create_schedule():
 @jwt_required()
 @require_permission('update_schedule')
 def update_schedule(schedule_id):
-    """Update a schedule"""
+    """Update a schedule; an If-Match ETag makes the update fail with 412 if the schedule changed"""
     try:
         schedule = Schedule.query.get_or_404(schedule_id)
         data = request.get_json()
@@ -266,6 +459,13 @@ def update_schedule(schedule_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
+        stale = check_if_match(schedule, 'Schedule was modified by another request')
+        if stale is not None:
+            return stale
+        
+        previous = {'lab_nickname': schedule.lab_nickname, 'date': schedule.date.isoformat()}
+        previous_status = schedule.status
+        
         if 'date' in data:
             try:
                 schedule_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
@@ -288,12 +488,34 @@ def update_schedule(schedule_id):
             if field in data:
                 setattr(schedule, field, data[field])
         
+        if {'date', 'times', 'lab_nickname', 'status'} & data.keys():
+            with db.session.no_autoflush:
+                conflict = _booking_conflict(
+                    schedule.date, schedule.times, schedule.lab_nickname, schedule.status, exclude_id=schedule.id
+                )
+            if conflict is not None:
+                db.session.rollback()
+                return conflict
+        
+        if db.session.is_modified(schedule):
+            db.session.flush()
+            db.session.refresh(schedule)
+            cancelled = schedule.status == BookingStatus.CANCELLED and previous_status != BookingStatus.CANCELLED
+            enqueue_booking_notification(
+                'booking_cancelled' if cancelled else 'booking_changed', schedule.to_dict()
+            )
         db.session.commit()
         
-        return jsonify(schedule.to_dict())
+        result = schedule.to_dict()
+        publish_schedule_event('updated', result, previous=previous)
+        
+        return with_version_etag(jsonify(result), schedule)
         
     except NotFound:
         return jsonify({'error': 'Schedule not found'}), 404
+    except StaleDataError:
+        db.session.rollback()
+        return precondition_failed('Schedule was modified by another request')
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -306,10 +528,15 @@ def delete_schedule(schedule_id):
     """Delete a schedule"""
     try:
         schedule = Schedule.query.get_or_404(schedule_id)
+        deleted = schedule.to_dict()
         
         db.session.delete(schedule)
+        if schedule.status != BookingStatus.CANCELLED:
+            enqueue_booking_notification('booking_cancelled', deleted)
         db.session.commit()
         
+        publish_schedule_event('deleted', deleted)
+        
         return jsonify({'message': 'Schedule deleted successfully'})
         
     except NotFound:
@@ -1,17 +1,22 @@
 
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.exceptions import BadRequest, NotFound
 from lumus.models.student import Student
-from lumus.models.course import Course
+from lumus.models.course import Course, CourseFullError
 from lumus.config.database import db
 from lumus.utils.auth import require_permission
+from lumus.utils.bulk_import import StudentImport, detect_format, iter_records
+from lumus.utils.pagination import count_mode, paginate
+from lumus.utils.instrumentation import query_budget
 
 
 student_bp = Blueprint('student', __name__, url_prefix='/api/students')
 
 
 @student_bp.route('', methods=['GET'])
+@query_budget(3)
 @jwt_required()
 @require_permission('read_student')
 def get_students():
@@ -22,34 +27,26 @@ def get_students():
         search = request.args.get('search', '')
         course_id = request.args.get('course_id', type=int)
         
-        query = Student.query
+        try:
+            count = count_mode(request.args.get('count'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = Student.with_course()
         
         if search:
-            query = query.filter(
-                (Student.name.ilike(f'%{search}%')) |
-                (Student.email.ilike(f'%{search}%')) |
-                (Student.registration_number.ilike(f'%{search}%'))
-            )
+            query = Student.apply_search(query, search)
         
         if course_id:
             query = query.filter(Student.course_id == course_id)
         
-        paginated = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        paginated = paginate(query, page, per_page, count=count)
         
         students = [student.to_dict(include_course=True) for student in paginated.items]
         
         return jsonify({
             'students': students,
-            'pagination': {
-                'page': paginated.page,
-                'pages': paginated.pages,
-                'per_page': paginated.per_page,
-                'total': paginated.total
-            }
+            'pagination': paginated.to_dict()
         })
         
     except Exception as e:
@@ -62,7 +59,7 @@ def get_students():
 def get_student(student_id):
     """Get a specific student"""
     try:
-        student = Student.query.get_or_404(student_id)
+        student = Student.with_course().get_or_404(student_id)
         return jsonify(student.to_dict(include_course=True))
     except NotFound:
         return jsonify({'error': 'Student not found'}), 404
@@ -70,6 +67,43 @@ def get_student(student_id):
         return jsonify({'error': str(e)}), 500
 
 
+@student_bp.route('/<int:student_id>/timetable', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+@require_permission('read_schedule')
+def get_student_timetable(student_id):
+    """Get a student's timetable"""
+    try:
+        start_date = request.args.get('start')
+        end_date = request.args.get('end')
+        
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        students, schedules = Student.get_timetables(
+            student_id=student_id, start_date=start_date, end_date=end_date
+        )
+        if not students:
+            return jsonify({'error': 'Student not found'}), 404
+        
+        student = students[0]
+        schedules = schedules[student.course.course_code]
+        
+        return jsonify({
+            'student': student.to_dict(),
+            'start': start_date.isoformat() if start_date else None,
+            'end': end_date.isoformat() if end_date else None,
+            'schedules': [schedule.to_dict() for schedule in schedules],
+            'total': len(schedules)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @student_bp.route('', methods=['POST'])
 @jwt_required()
 @require_permission('create_student')
@@ -110,8 +144,39 @@ def create_student():
         db.session.add(student)
         db.session.commit()
         
+        student = Student.with_course().populate_existing().get(student.id)
         return jsonify(student.to_dict(include_course=True)), 201
         
+    except CourseFullError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@student_bp.route('/import', methods=['POST'])
+@jwt_required()
+@require_permission('create_student')
+def import_students():
+    """Bulk import students from a CSV or NDJSON upload"""
+    try:
+        upload = request.files.get('file')
+        if upload:
+            stream = upload.stream
+            fmt = request.args.get('format') or detect_format(upload.mimetype, upload.filename)
+        else:
+            stream = request.stream
+            fmt = request.args.get('format') or detect_format(request.content_type)
+        
+        if fmt not in ('csv', 'ndjson'):
+            return jsonify({'error': 'Invalid format. Use csv or ndjson'}), 400
+        
+        chunk_size = min(request.args.get('chunk_size', 1000, type=int), 5000)
+        summary = StudentImport(chunk_size=chunk_size).run(iter_records(stream, fmt))
+        
+        return jsonify(summary), 200
+        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -150,10 +215,14 @@ def update_student(student_id):
         
         db.session.commit()
         
+        student = Student.with_course().populate_existing().get(student.id)
         return jsonify(student.to_dict(include_course=True))
         
     except NotFound:
         return jsonify({'error': 'Student not found'}), 404
+    except CourseFullError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -201,7 +270,7 @@ def get_student_by_email(email):
 def get_student_by_registration(registration_number):
     """Get student by registration number"""
     try:
-        student = Student.query.filter_by(registration_number=registration_number).first()
+        student = Student.with_course().filter_by(registration_number=registration_number).first()
         if not student:
             return jsonify({'error': 'Student not found'}), 404
         
@@ -209,3 +278,30 @@ def get_student_by_registration(registration_number):
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
+@student_bp.route('/autocomplete', methods=['GET'])
+@jwt_required()
+@require_permission('read_student')
+def autocomplete_students():
+    """Prefix autocomplete for the students search box"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        limit = min(request.args.get('limit', 10, type=int), 50)
+        
+        if not prefix:
+            return jsonify({'students': []}), 200
+        
+        students = Student.autocomplete(prefix, limit=limit)
+        
+        return jsonify({
+            'students': [{
+                'id': student.id,
+                'name': student.name,
+                'email': student.email,
+                'registration_number': student.registration_number
+            } for student in students]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,10 +1,13 @@
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.exceptions import BadRequest, NotFound, Forbidden
 from lumus.models.user import User, UserType
 from lumus.config.database import db
 from lumus.utils.auth import admin_required, require_permission
+from lumus.utils.bulk_import import UserImport, detect_format, iter_records
+from lumus.utils.pagination import count_mode, paginate
+from lumus.utils.calendar import calendar_response, feed_query
 
 
 user_bp = Blueprint('user', __name__, url_prefix='/api/users')
@@ -22,13 +25,17 @@ def get_users():
         user_type = request.args.get('type', '')
         active_only = request.args.get('active', 'true').lower() == 'true'
         
+        try:
+            count = count_mode(request.args.get('count'))
+        except ValueError as e:
+            return jsonify({
+                'error': str(e)
+            }), 400
+        
         query = User.query
         
         if search:
-            query = query.filter(
-                (User.name.ilike(f'%{search}%')) |
-                (User.email.ilike(f'%{search}%'))
-            )
+            query = User.apply_search(query, search)
         
         if user_type:
             try:
@@ -41,22 +48,11 @@ def get_users():
         if active_only:
             query = query.filter(User.is_active == True)
         
-        paginated = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        paginated = paginate(query, page, per_page, count=count)
         
         return jsonify({
             'users': [user.to_dict() for user in paginated.items],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages,
-                'has_next': paginated.has_next,
-                'has_prev': paginated.has_prev
-            }
+            'pagination': paginated.to_dict()
         }), 200
         
     except Exception as e:
@@ -146,3 +142,118 @@ def create_user():
         return jsonify({
             'error': 'Internal server error'
         }), 500
+
+
+@user_bp.route('/import', methods=['POST'])
+@jwt_required()
+@require_permission('create_user')
+def import_users():
+    """Bulk provision users from a CSV or NDJSON upload"""
+    try:
+        upload = request.files.get('file')
+        if upload:
+            stream = upload.stream
+            fmt = request.args.get('format') or detect_format(upload.mimetype, upload.filename)
+        else:
+            stream = request.stream
+            fmt = request.args.get('format') or detect_format(request.content_type)
+        
+        if fmt not in ('csv', 'ndjson'):
+            return jsonify({
+                'error': 'Invalid format. Use csv or ndjson'
+            }), 400
+        
+        chunk_size = min(request.args.get('chunk_size', 500, type=int), 5000)
+        importer = UserImport(
+            chunk_size=chunk_size,
+            workers=current_app.config.get('PASSWORD_HASH_WORKERS')
+        )
+        summary = importer.run(iter_records(stream, fmt))
+        
+        return jsonify(summary), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Import users error: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'error': 'Internal server error'
+        }), 500
+
+
+@user_bp.route('/<int:user_id>/calendar.ics', methods=['GET'])
+def get_user_calendar(user_id):
+    """iCalendar feed of a user's bookings, authenticated by the feed token"""
+    try:
+        user = User.query.get(user_id)
+        # Calendar apps cannot send a JWT; an unknown user and a bad token look the same
+        if not user or not user.check_calendar_token(request.args.get('token')):
+            return jsonify({
+                'error': 'User not found'
+            }), 404
+        
+        return calendar_response(feed_query(user_id=str(user.id)), user.name)
+        
+    except Exception as e:
+        current_app.logger.error(f"User calendar error: {str(e)}")
+        return jsonify({
+            'error': 'Internal server error'
+        }), 500
+
+
+@user_bp.route('/<int:user_id>/calendar-token', methods=['POST'])
+@jwt_required()
+@require_permission('read_schedule')
+def regenerate_calendar_token(user_id):
+    """Issue a new calendar feed token, revoking the previous feed URL"""
+    try:
+        current_user = User.query.get(int(get_jwt_identity()))
+        if current_user.id != user_id and not current_user.is_admin():
+            return jsonify({
+                'error': 'Cannot manage another user\'s calendar feed'
+            }), 403
+        
+        user = User.query.get(user_id)
+        if not user:
+            return jsonify({
+                'error': 'User not found'
+            }), 404
+        
+        token = user.regenerate_calendar_token()
+        
+        return jsonify({
+            'token': token,
+            'url': url_for('user.get_user_calendar', user_id=user.id, token=token, _external=True)
+        }), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Calendar token error: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'error': 'Internal server error'
+        }), 500
+
+
+@user_bp.route('/autocomplete', methods=['GET'])
+@jwt_required()
+@require_permission('read_user')
+def autocomplete_users():
+    """Prefix autocomplete for the users search box"""
+    try:
+        prefix = request.args.get('q', '').strip()
+        limit = min(request.args.get('limit', 10, type=int), 50)
+        
+        if not prefix:
+            return jsonify({'users': []}), 200
+        
+        users = User.autocomplete(prefix, limit=limit)
+        
+        return jsonify({
+            'users': [{
+                'id': user.id,
+                'name': user.name,
+                'email': user.email
+            } for user in users]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
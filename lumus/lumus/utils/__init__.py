@@ -13,6 +13,21 @@ from .auth import (
     log_user_activity,
     create_response
 )
+from .instrumentation import (
+    QueryBudgetExceeded,
+    query_budget,
+    register_instrumentation
+)
+from .metrics import (
+    record_cache_lookup,
+    record_booking_conflict,
+    register_metrics
+)
+from .pagination import (
+    Page,
+    paginate,
+    invalidate_counts
+)
 
 __all__ = [
     'admin_required',
@@ -26,5 +41,14 @@ __all__ = [
     'can_modify_user',
     'require_self_or_admin',
     'log_user_activity',
-    'create_response'
+    'create_response',
+    'QueryBudgetExceeded',
+    'query_budget',
+    'register_instrumentation',
+    'record_cache_lookup',
+    'record_booking_conflict',
+    'register_metrics',
+    'Page',
+    'paginate',
+    'invalidate_counts'
 ]
@@ -0,0 +1,196 @@
+import json
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import String, Text, or_, select, type_coerce
+from lumus.config.database import db
+from lumus.models.lab import Lab
+from lumus.models.schedule import BookingStatus, RepeatType, Schedule
+
+
+WEEKDAY_NAMES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+REPEAT_STEPS = {
+    RepeatType.DAILY: 1,
+    RepeatType.WEEKLY: 7
+}
+
+
+def numpy_available():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def utilization_rows(start_date, end_date, lab_nickname=None):
+    """Raw ``(lab_nickname, date, times, repeat_type)`` tuples for bookings that can occupy the window
+
+    One-off bookings inside the window plus every recurring series that starts
+    before it ends; cancelled bookings are left out. ``times`` and
+    ``repeat_type`` skip their type processors so repeated values are decoded
+    once per distinct value rather than once per row.
+    """
+    table = Schedule.__table__
+    recurring = table.c.repeat_type.isnot(None) & (table.c.repeat_type != RepeatType.NONE)
+    query = select(
+        table.c.lab_nickname,
+        table.c.date,
+        type_coerce(table.c.times, Text),
+        type_coerce(table.c.repeat_type, String)
+    ).where(
+        table.c.date <= end_date,
+        or_(table.c.date >= start_date, recurring),
+        or_(table.c.status.is_(None), table.c.status != BookingStatus.CANCELLED)
+    )
+    if lab_nickname:
+        query = query.where(table.c.lab_nickname == lab_nickname)
+
+    return db.session.execute(query).all()
+
+
+def _occurrence_days(booking_date, repeat_type, start_date, end_date, days, np):
+    """Day offsets (from ``start_date``) on which one booking occurs inside the window"""
+    offset = (booking_date - start_date).days
+    step = REPEAT_STEPS.get(repeat_type)
+    if step:
+        first = offset if offset >= 0 else offset % step
+        return np.arange(first, days, step)
+
+    if repeat_type == RepeatType.MONTHLY:
+        occurrences, months = [], 0
+        while True:
+            current = booking_date + relativedelta(months=months)
+            if current > end_date:
+                break
+            if current >= start_date:
+                occurrences.append((current - start_date).days)
+            months += 1
+        return np.array(occurrences, dtype=np.int64)
+
+    return np.array([offset] if 0 <= offset < days else [], dtype=np.int64)
+
+
+def occupancy(rows, labs, slots, start_date, end_date):
+    """Boolean ``[lab, day, slot]`` array: True where at least one booking holds the slot"""
+    import numpy as np
+
+    days = (end_date - start_date).days + 1
+    lab_index = {nickname: position for position, nickname in enumerate(labs)}
+    slot_index = {slot: position for position, slot in enumerate(slots)}
+    grid = np.zeros((len(labs), days, len(slots)), dtype=bool)
+
+    row_labs, row_slots, row_counts = [], [], []
+    one_off_rows, one_off_days = [], []
+    repeat_rows, repeat_days = [], []
+    decoded = {}
+
+    for lab_nickname, booking_date, times, repeat_type in rows:
+        if lab_nickname not in lab_index:
+            continue
+        if isinstance(times, str):
+            booked = decoded.get(times)
+            if booked is None:
+                booked = decoded[times] = [slot_index[t] for t in json.loads(times) or [] if t in slot_index]
+        else:
+            booked = [slot_index[t] for t in times or [] if t in slot_index]
+        if not booked:
+            continue
+
+        row = len(row_labs)
+        row_labs.append(lab_index[lab_nickname])
+        row_slots.extend(booked)
+        row_counts.append(len(booked))
+
+        if isinstance(repeat_type, str):
+            repeat_type = RepeatType[repeat_type.upper()]
+        if repeat_type is None or repeat_type is RepeatType.NONE:
+            one_off_rows.append(row)
+            one_off_days.append((booking_date - start_date).days)
+        else:
+            occurrences = _occurrence_days(booking_date, repeat_type, start_date, end_date, days, np)
+            repeat_rows.append(np.full(len(occurrences), row, dtype=np.int64))
+            repeat_days.append(occurrences)
+
+    if not row_labs:
+        return grid
+
+    occurrence_rows = np.concatenate([np.array(one_off_rows, dtype=np.int64)] + repeat_rows)
+    occurrence_days = np.concatenate([np.array(one_off_days, dtype=np.int64)] + repeat_days)
+
+    # Expand every occurrence into one entry per booked slot without a Python loop
+    row_labs = np.array(row_labs, dtype=np.int64)
+    row_slots = np.array(row_slots, dtype=np.int64)
+    row_counts = np.array(row_counts, dtype=np.int64)
+    row_starts = np.cumsum(row_counts) - row_counts
+
+    counts = row_counts[occurrence_rows]
+    entry_rows = np.repeat(occurrence_rows, counts)
+    entry_days = np.repeat(occurrence_days, counts)
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    entry_slots = row_slots[row_starts[entry_rows] + within]
+
+    grid[row_labs[entry_rows], entry_days, entry_slots] = True
+    return grid
+
+
+def _percent(numerator, denominator, np):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(denominator > 0, numerator * 100.0 / denominator, 0.0)
+    return np.round(result, 1)
+
+
+def compute_utilization(start_date, end_date, slots, weekdays=range(7), lab_nickname=None):
+    """Occupancy heatmaps (lab x weekday x slot) and utilization percentages for a date window
+
+    Only days whose weekday is in ``weekdays`` (0 = Monday) count towards the
+    available slots.
+    """
+    import numpy as np
+
+    rows = utilization_rows(start_date, end_date, lab_nickname)
+    if lab_nickname:
+        labs = [lab_nickname]
+    else:
+        labs = sorted({lab.nickname for lab in Lab.get_active_labs()} | {row[0] for row in rows})
+
+    grid = occupancy(rows, labs, slots, start_date, end_date)
+
+    weekdays = sorted(set(weekdays))
+    days = grid.shape[1]
+    day_weekdays = (start_date.weekday() + np.arange(days)) % 7
+    # days x selected weekdays, 1 where the day falls on that weekday
+    day_matrix = (day_weekdays[:, None] == np.array(weekdays, dtype=np.int64)[None, :]).astype(np.int64)
+    weekday_days = day_matrix.sum(axis=0)
+    open_days = int(weekday_days.sum())
+
+    heat = np.einsum('lds,dw->lws', grid.astype(np.int64), day_matrix)
+    booked = heat.sum(axis=(1, 2))
+    available = open_days * len(slots)
+
+    heatmap = _percent(heat, weekday_days[None, :, None], np)
+    by_weekday = _percent(heat.sum(axis=2), weekday_days[None, :] * len(slots), np)
+    by_slot = _percent(heat.sum(axis=1), np.full((1, 1), open_days), np)
+    lab_utilization = _percent(booked, np.full(len(labs), available), np)
+
+    return {
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'days': open_days,
+        'weekdays': [WEEKDAY_NAMES[day] for day in weekdays],
+        'slots': list(slots),
+        'overall': float(_percent(booked.sum(), np.array(available * len(labs)), np)),
+        'by_slot': _percent(heat.sum(axis=(0, 1)), np.array(open_days * len(labs)), np).tolist(),
+        'labs': [
+            {
+                'lab_nickname': nickname,
+                'utilization': float(lab_utilization[position]),
+                'booked_slots': int(booked[position]),
+                'available_slots': available,
+                'by_weekday': by_weekday[position].tolist(),
+                'by_slot': by_slot[position].tolist(),
+                'heatmap': heatmap[position].tolist()
+            }
+            for position, nickname in enumerate(labs)
+        ]
+    }
+
@@ -0,0 +1,318 @@
+import csv
+import io
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from time import perf_counter
+from sqlalchemy import insert, or_, select
+from werkzeug.security import generate_password_hash
+from lumus.config.database import db
+from lumus.models.course import Course, CourseFullError
+from lumus.models.student import Student
+from lumus.models.user import User, UserType
+
+
+STUDENT_FIELDS = ('name', 'email', 'course_id', 'phone', 'registration_number')
+USER_FIELDS = ('name', 'email', 'password', 'type', 'phone', 'bio', 'is_active')
+
+
+def detect_format(content_type=None, filename=None, default='csv'):
+    """Guess ``csv`` or ``ndjson`` from a content type or file name"""
+    content_type = (content_type or '').lower()
+    filename = (filename or '').lower()
+
+    if 'ndjson' in content_type or 'jsonl' in content_type or filename.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    if 'csv' in content_type or filename.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def iter_records(stream, fmt):
+    """Yield ``(row_number, record)`` pairs from a binary CSV or NDJSON stream"""
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        reader = csv.DictReader(text_stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(text_stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None
+            continue
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _reserve_up_to(connection, course_id, wanted, attempts=3):
+    for _ in range(attempts):
+        try:
+            Course.reserve_seat(connection, course_id, wanted)
+            return wanted
+        except CourseFullError:
+            row = connection.execute(
+                select(Course.capacity, Course.enrolled_count).where(Course.id == course_id)
+            ).first()
+            if row is None or row.capacity is None:
+                return 0
+            available = row.capacity - row.enrolled_count
+            if available <= 0:
+                return 0
+            wanted = min(wanted, available)
+    return 0
+
+
+_hash_pools = {}
+_hash_pools_lock = threading.Lock()
+
+
+def _hash_pool(workers):
+    """Process-wide thread pool for password hashing, created on first use
+
+    hashlib's scrypt and pbkdf2 release the GIL, so threads hash in parallel
+    without forking a web worker that runs background threads.
+    """
+    with _hash_pools_lock:
+        pool = _hash_pools.get(workers)
+        if pool is None:
+            pool = _hash_pools[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='password-hash'
+            )
+        return pool
+
+
+def _parse_bool(value):
+    if value is None:
+        return True
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ['true', 'on', '1', 'yes']
+
+
+class BulkImport(ABC):
+    """Base class for chunked imports that collect per-row failures"""
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+        self.inserted = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    def _fail(self, row_number, record, message):
+        self.errors.append({
+            'row': row_number,
+            'email': (record or {}).get('email'),
+            'error': message
+        })
+
+    @abstractmethod
+    def _import_chunk(self, chunk):
+        """Insert one chunk of ``(row_number, record)`` pairs"""
+
+    def run(self, records):
+        """Import ``(row_number, record)`` pairs and return a summary"""
+        started = perf_counter()
+        try:
+            for chunk in chunked(records, self.chunk_size):
+                self._import_chunk(chunk)
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            self.elapsed = perf_counter() - started
+
+        return self.summary()
+
+    def summary(self):
+        return {
+            'inserted': self.inserted,
+            'failed': len(self.errors),
+            'elapsed_seconds': round(self.elapsed, 3),
+            'rows_per_second': round(self.inserted / self.elapsed, 1) if self.elapsed else 0.0,
+            'errors': sorted(self.errors, key=lambda error: error['row'])
+        }
+
+
+class StudentImport(BulkImport):
+    """Import students in chunks, resolving duplicates with one query per chunk"""
+
+    def __init__(self, chunk_size=1000):
+        super().__init__(chunk_size)
+        self._seen_emails = set()
+        self._seen_registrations = set()
+        self._known_courses = set()
+
+    def _validate(self, row_number, record):
+        if record is None:
+            self._fail(row_number, record, 'Malformed record')
+            return None
+
+        row = {field: _clean(record.get(field)) for field in STUDENT_FIELDS}
+        for field in ('name', 'email', 'course_id'):
+            if not row[field]:
+                self._fail(row_number, record, f'{field} is required')
+                return None
+
+        try:
+            row['course_id'] = int(row['course_id'])
+        except ValueError:
+            self._fail(row_number, record, 'course_id must be an integer')
+            return None
+
+        return row
+
+    def _import_chunk(self, chunk):
+        candidates = []
+        for row_number, record in chunk:
+            row = self._validate(row_number, record)
+            if row is not None:
+                candidates.append((row_number, row))
+
+        if not candidates:
+            return
+
+        emails = {row['email'] for _, row in candidates}
+        registrations = {row['registration_number'] for _, row in candidates if row['registration_number']}
+        existing = db.session.execute(
+            select(Student.email, Student.registration_number)
+            .where(or_(Student.email.in_(emails), Student.registration_number.in_(registrations)))
+        ).all()
+        existing_emails = {email for email, _ in existing}
+        existing_registrations = {number for _, number in existing if number}
+
+        missing_courses = {row['course_id'] for _, row in candidates} - self._known_courses
+        if missing_courses:
+            self._known_courses.update(db.session.execute(
+                select(Course.id).where(Course.id.in_(missing_courses))
+            ).scalars())
+
+        accepted = []
+        for row_number, row in candidates:
+            email, registration = row['email'], row['registration_number']
+            if email in existing_emails or email in self._seen_emails:
+                self._fail(row_number, row, 'Email already exists')
+            elif registration and (registration in existing_registrations
+                                   or registration in self._seen_registrations):
+                self._fail(row_number, row, 'Registration number already exists')
+            elif row['course_id'] not in self._known_courses:
+                self._fail(row_number, row, 'Course not found')
+            else:
+                self._seen_emails.add(email)
+                if registration:
+                    self._seen_registrations.add(registration)
+                accepted.append((row_number, row))
+
+        connection = db.session.connection()
+        by_course = {}
+        for row_number, row in accepted:
+            by_course.setdefault(row['course_id'], []).append((row_number, row))
+
+        rows = []
+        for course_id, course_rows in by_course.items():
+            reserved = _reserve_up_to(connection, course_id, len(course_rows))
+            rows.extend(row for _, row in course_rows[:reserved])
+            for row_number, row in course_rows[reserved:]:
+                self._fail(row_number, row, f'Course {course_id} is at maximum capacity')
+
+        if rows:
+            db.session.execute(insert(Student.__table__), rows)
+        db.session.commit()
+        self.inserted += len(rows)
+
+
+class UserImport(BulkImport):
+    """Import users in chunks, hashing passwords on a shared thread pool"""
+
+    def __init__(self, chunk_size=500, workers=None):
+        super().__init__(chunk_size)
+        self.workers = workers or os.cpu_count() or 1
+        self._seen_emails = set()
+
+    def _validate(self, row_number, record):
+        if record is None:
+            self._fail(row_number, record, 'Malformed record')
+            return None
+
+        row = {field: _clean(record.get(field)) for field in USER_FIELDS}
+        for field in ('name', 'email', 'password'):
+            if not row[field]:
+                self._fail(row_number, record, f'{field} is required')
+                return None
+
+        try:
+            row['type'] = UserType(row['type'] or 'user')
+        except ValueError:
+            self._fail(row_number, record, f"Invalid user type: {row['type']}")
+            return None
+
+        row['is_active'] = _parse_bool(record.get('is_active'))
+        return row
+
+    def _hash_passwords(self, passwords):
+        if self.workers <= 1:
+            return [generate_password_hash(password) for password in passwords]
+        return list(_hash_pool(self.workers).map(generate_password_hash, passwords))
+
+    def _import_chunk(self, chunk):
+        candidates = []
+        for row_number, record in chunk:
+            row = self._validate(row_number, record)
+            if row is not None:
+                candidates.append((row_number, row))
+
+        if not candidates:
+            return
+
+        emails = {row['email'] for _, row in candidates}
+        existing_emails = set(db.session.execute(
+            select(User.email).where(User.email.in_(emails))
+        ).scalars())
+
+        accepted = []
+        for row_number, row in candidates:
+            if row['email'] in existing_emails or row['email'] in self._seen_emails:
+                self._fail(row_number, row, 'Email already exists')
+            else:
+                self._seen_emails.add(row['email'])
+                accepted.append(row)
+
+        if not accepted:
+            return
+
+        hashes = self._hash_passwords([row.pop('password') for row in accepted])
+        for row, password_hash in zip(accepted, hashes):
+            row['password_hash'] = password_hash
+
+        db.session.execute(insert(User.__table__), accepted)
+        db.session.commit()
+        self.inserted += len(accepted)
+
+    def summary(self):
+        result = super().summary()
+        result['workers'] = self.workers
+        return result
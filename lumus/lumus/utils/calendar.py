@@ -0,0 +1,212 @@
+import hashlib
+import json
+from datetime import date, datetime, time, timedelta
+from flask import Response, current_app, request
+from sqlalchemy import and_, func, or_
+from lumus.models.schedule import BookingStatus, RepeatType, Schedule
+
+
+DEFAULT_SLOT_MINUTES = 45
+
+RRULE_FREQUENCIES = {
+    RepeatType.DAILY: 'DAILY',
+    RepeatType.WEEKLY: 'WEEKLY',
+    RepeatType.MONTHLY: 'MONTHLY'
+}
+
+EVENT_STATUSES = {
+    BookingStatus.CONFIRMED: 'CONFIRMED',
+    BookingStatus.PENDING: 'TENTATIVE',
+    BookingStatus.CANCELLED: 'CANCELLED'
+}
+
+
+def _escape(value):
+    return (str(value or '')
+            .replace('\\', '\\\\')
+            .replace(';', '\\;')
+            .replace(',', '\\,')
+            .replace('\r\n', '\\n')
+            .replace('\n', '\\n'))
+
+
+def _fold(line):
+    """Fold a content line at 75 octets as required by RFC 5545"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+
+    parts, current = [], b''
+    for char in line:
+        char_bytes = char.encode('utf-8')
+        limit = 75 if not parts else 74
+        if len(current) + len(char_bytes) > limit:
+            parts.append(current.decode('utf-8'))
+            current = b''
+        current += char_bytes
+    parts.append(current.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+
+def _parse_time(value):
+    """Parse ``HH:MM``; returns None for anything else, such as slot codes like ``M1``"""
+    try:
+        hours, minutes = str(value).split(':')[:2]
+        return time(int(hours), int(minutes))
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_times(times):
+    if isinstance(times, str):
+        times = json.loads(times)
+    return times or []
+
+
+def slot_blocks(times, slots, slot_minutes=DEFAULT_SLOT_MINUTES):
+    """Merge booked slot start times into contiguous ``(start, end)`` time ranges
+
+    A slot ends where the next configured slot starts; the last slot and any
+    time outside ``slots`` last ``slot_minutes``. Entries that are not
+    ``HH:MM`` times, booked or configured, are skipped.
+    """
+    times = _load_times(times)
+    starts = [_parse_time(slot) for slot in slots]
+
+    index = {slot: position for position, slot in enumerate(slots)}
+    known = sorted({index[t] for t in times if t in index and starts[index[t]] is not None})
+    unknown = sorted({start for start in (_parse_time(t) for t in times if t not in index) if start})
+
+    def after(start):
+        return (datetime.combine(date.min, start) + timedelta(minutes=slot_minutes)).time()
+
+    def slot_end(position):
+        if position + 1 < len(slots) and starts[position + 1] is not None:
+            return starts[position + 1]
+        return after(starts[position])
+
+    blocks = []
+    for position in known:
+        if blocks and blocks[-1][2] == position - 1:
+            blocks[-1] = (blocks[-1][0], slot_end(position), position)
+        else:
+            blocks.append((starts[position], slot_end(position), position))
+
+    ranges = [(start, end) for start, end, _ in blocks]
+    ranges.extend((start, after(start)) for start in unknown)
+
+    return sorted(ranges)
+
+
+def _format_datetime(day, moment, utc):
+    value = datetime.combine(day, moment).strftime('%Y%m%dT%H%M%S')
+    return value + 'Z' if utc else value
+
+
+def _format_stamp(value):
+    if value is None:
+        value = datetime.utcnow()
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def schedule_events(schedule, slots, timezone='UTC'):
+    """Render one schedule as VEVENT lines, one event per contiguous block of slots
+
+    Outside UTC the times are written as floating local times: a ``TZID``
+    parameter would need a matching ``VTIMEZONE`` component.
+    """
+    utc = timezone.upper() == 'UTC'
+    stamp = _format_stamp(schedule.updated_at or schedule.created_at)
+    frequency = RRULE_FREQUENCIES.get(schedule.repeat_type)
+    status = EVENT_STATUSES.get(schedule.status, 'CONFIRMED')
+
+    invalid = [t for t in _load_times(schedule.times) if _parse_time(t) is None]
+    if invalid:
+        current_app.logger.warning(f"Schedule {schedule.id} has slots that are not HH:MM times: {invalid}")
+
+    summary = f'{schedule.course_code} - {schedule.lab_nickname}'
+    lines = []
+    for position, (start, end) in enumerate(slot_blocks(schedule.times, slots)):
+        end_day = schedule.date if end > start else schedule.date + timedelta(days=1)
+        lines.extend([
+            'BEGIN:VEVENT',
+            f'UID:schedule-{schedule.id}-{position}@lumus',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{_format_datetime(schedule.date, start, utc)}',
+            f'DTEND:{_format_datetime(end_day, end, utc)}',
+            f'SUMMARY:{_escape(summary)}',
+            f'LOCATION:{_escape(schedule.lab_nickname)}',
+            f'STATUS:{status}'
+        ])
+        if schedule.annotation or schedule.user_name:
+            description = '\n'.join(filter(None, [schedule.user_name, schedule.annotation]))
+            lines.append(f'DESCRIPTION:{_escape(description)}')
+        if frequency:
+            lines.append(f'RRULE:FREQ={frequency}')
+        lines.append('END:VEVENT')
+
+    return lines
+
+
+def build_calendar(schedules, name, slots, timezone='UTC'):
+    """Build an iCalendar document for ``schedules``"""
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Lumus//Laboratory Scheduler//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(name)}'
+    ]
+    if timezone.upper() != 'UTC':
+        lines.append(f'X-WR-TIMEZONE:{timezone}')
+
+    for schedule in schedules:
+        lines.extend(schedule_events(schedule, slots, timezone))
+
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
+
+
+def feed_query(**filters):
+    """Schedules for a feed: recent one-off bookings plus every recurring series"""
+    past_days = current_app.config.get('CALENDAR_PAST_DAYS', 90)
+    cutoff = date.today() - timedelta(days=past_days)
+    recurring = and_(Schedule.repeat_type.isnot(None), Schedule.repeat_type != RepeatType.NONE)
+
+    return Schedule.query.filter_by(**filters).filter(or_(Schedule.date >= cutoff, recurring))
+
+
+def feed_etag(query):
+    """Cheap validator built from one aggregate over the feed's rows"""
+    count, max_id, last_change = query.with_entities(
+        func.count(Schedule.id),
+        func.max(Schedule.id),
+        func.max(Schedule.change_seq)
+    ).one()
+
+    config = current_app.config
+    fingerprint = json.dumps([
+        count, max_id, str(last_change), date.today().isoformat(),
+        config.get('DEFAULT_TIME_SLOTS'), config.get('TIMEZONE'), config.get('CALENDAR_PAST_DAYS')
+    ])
+    return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+
+def calendar_response(query, name):
+    """Serve ``query`` as an ICS feed, answering 304 when the client's ETag still matches"""
+    etag = feed_etag(query)
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}
+
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+
+    config = current_app.config
+    schedules = query.order_by(Schedule.date, Schedule.id).all()
+    body = build_calendar(
+        schedules, name, config['DEFAULT_TIME_SLOTS'], config.get('TIMEZONE', 'UTC')
+    )
+
+    filename = ''.join(char if char.isalnum() or char in '-_' else '-' for char in name)
+    headers['Content-Disposition'] = f'inline; filename="{filename}.ics"'
+    return Response(body, content_type='text/calendar; charset=utf-8', headers=headers)
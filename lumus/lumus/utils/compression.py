@@ -0,0 +1,187 @@
+import zlib
+from abc import ABC, abstractmethod
+from flask import request
+
+
+class Encoder(ABC):
+    """Incremental compressor for one content coding"""
+
+    name = None
+    default_level = None
+
+    def __init__(self, level=None):
+        self.level = self.default_level if level is None else level
+
+    @abstractmethod
+    def compressor(self):
+        """Return an object with ``compress(data)`` and ``flush()``"""
+
+    def compress(self, data):
+        compressor = self.compressor()
+        return compressor.compress(data) + compressor.flush()
+
+
+class GzipEncoder(Encoder):
+    name = 'gzip'
+    default_level = 6
+
+    def compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+
+class BrotliEncoder(Encoder):
+    name = 'br'
+    default_level = 4
+
+    def compressor(self):
+        import brotli
+        return _BrotliStream(brotli.Compressor(quality=self.level))
+
+
+class _BrotliStream:
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class ZstdEncoder(Encoder):
+    name = 'zstd'
+    default_level = 3
+
+    def compressor(self):
+        import zstandard
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+
+ENCODERS = {
+    'zstd': (ZstdEncoder, 'zstandard'),
+    'br': (BrotliEncoder, 'brotli'),
+    'gzip': (GzipEncoder, None)
+}
+
+
+def available_encodings(preferred):
+    """Encodings from ``preferred`` whose optional module is installed, in order"""
+    result = []
+    for name in preferred:
+        if name not in ENCODERS:
+            raise ValueError(f'Unsupported compression encoding: {name}')
+        module = ENCODERS[name][1]
+        if module:
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+        result.append(name)
+    return result
+
+
+def parse_accept_encoding(header):
+    """``{coding: q}`` from an Accept-Encoding header"""
+    weights = {}
+    for part in (header or '').split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.lower()] = q
+    return weights
+
+
+def negotiate(header, encodings):
+    """Pick the client's highest-weighted encoding, breaking ties by server preference"""
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get('*', 0.0)
+    best, best_q = None, 0.0
+    for name in encodings:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def _compress_stream(chunks, compressor):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class ResponseCompressor:
+    """after_request hook that compresses eligible responses for clients that accept it
+
+    Buffered bodies under COMPRESSION_MIN_SIZE are left alone; streamed bodies
+    are compressed chunk by chunk as they are produced. Event streams are never
+    compressed because buffering inside the compressor would delay events.
+    """
+
+    def __init__(self, app):
+        config = app.config
+        levels = config.get('COMPRESSION_LEVELS') or {}
+        self.encoders = {
+            name: ENCODERS[name][0](levels.get(name))
+            for name in available_encodings(config.get('COMPRESSION_ENCODINGS', ['gzip']))
+        }
+        self.min_size = config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.mimetypes = set(config.get('COMPRESSION_MIMETYPES') or ())
+
+    def __call__(self, response):
+        if (
+            not self.encoders
+            or request.method == 'HEAD'
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.mimetype not in self.mimetypes
+            or response.mimetype == 'text/event-stream'
+            or 'Content-Encoding' in response.headers
+            or 'no-transform' in response.headers.get('Cache-Control', '')
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        name = negotiate(request.headers.get('Accept-Encoding'), list(self.encoders))
+        if name is None:
+            return response
+        encoder = self.encoders[name]
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoder.compressor())
+            response.direct_passthrough = False
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            response.set_data(encoder.compress(body))
+
+        response.headers['Content-Encoding'] = name
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def register_compression(app):
+    """Compress responses according to the client's Accept-Encoding"""
+    if app.config.get('COMPRESSION_ENABLED', True):
+        app.after_request(ResponseCompressor(app))
@@ -0,0 +1,28 @@
+from flask import jsonify, request
+
+
+def version_etag(instance):
+    """ETag value for a row with a ``version`` column"""
+    return str(instance.version)
+
+
+def with_version_etag(response, instance):
+    response.set_etag(version_etag(instance))
+    return response
+
+
+def precondition_failed(message):
+    response = jsonify({'error': message})
+    response.status_code = 412
+    return response
+
+
+def check_if_match(instance, message):
+    """A 412 response when If-Match names a version other than the loaded one, else ``None``
+
+    Weak tags are accepted because compression weakens the ETag on its way to
+    the client; the version identifies the row either way.
+    """
+    if request.if_match and not request.if_match.contains_weak(version_etag(instance)):
+        return with_version_etag(precondition_failed(message), instance)
+    return None
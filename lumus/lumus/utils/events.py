@@ -0,0 +1,176 @@
+import itertools
+import json
+import queue
+import threading
+from abc import ABC, abstractmethod
+from flask import current_app
+from lumus.utils.metrics import SSE_SUBSCRIBERS
+
+
+class EventBackend(ABC):
+    """Carries published events to every worker's broker"""
+
+    @abstractmethod
+    def start(self, deliver):
+        """Begin passing received events to ``deliver``"""
+
+    @abstractmethod
+    def publish(self, event):
+        """Send ``event`` to every worker"""
+
+
+class LocalBackend(EventBackend):
+    """Delivers events only within the current process"""
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, event):
+        self._deliver(event)
+
+
+class RedisBackend(EventBackend):
+    """Fans events out across workers through a Redis pub/sub channel"""
+
+    def __init__(self, url, channel='lumus:events'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._thread = None
+
+    def start(self, deliver):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: lambda message: deliver(json.loads(message['data']))})
+        self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, event):
+        self.client.publish(self.channel, json.dumps(event))
+
+
+class Subscription:
+    """One stream's bounded queue of events matching its lab/date filter"""
+
+    def __init__(self, lab=None, date=None, maxsize=100):
+        self.lab = lab
+        self.date = date
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def matches(self, event):
+        candidates = [event.get('schedule') or {}, event.get('previous') or {}]
+        return any(
+            (self.lab is None or candidate.get('lab_nickname') == self.lab)
+            and (self.date is None or candidate.get('date') == self.date)
+            for candidate in candidates if candidate
+        )
+
+    def put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroker:
+    """Per-worker fan-out of published events to local subscriptions"""
+
+    def __init__(self, backend=None, queue_size=100):
+        self.backend = backend or LocalBackend()
+        self.queue_size = queue_size
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.backend.start(self._dispatch)
+
+    def subscribe(self, lab=None, date=None):
+        subscription = Subscription(lab=lab, date=date, maxsize=self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        SSE_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.discard(subscription)
+        SSE_SUBSCRIBERS.dec()
+
+    def publish(self, event_type, payload):
+        self.backend.publish(dict(payload, type=event_type))
+
+    def _dispatch(self, event):
+        event = dict(event, id=next(self._ids))
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                subscription.put(event)
+
+
+def create_backend(url):
+    if not url:
+        return LocalBackend()
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    raise ValueError(f'Unsupported event broker URL: {url}')
+
+
+_broker_lock = threading.Lock()
+
+
+def get_broker(app=None):
+    """Return the worker's broker, creating it from EVENT_BROKER_URL on first use"""
+    app = app or current_app._get_current_object()
+    broker = app.extensions.get('event_broker')
+    if broker is None:
+        with _broker_lock:
+            broker = app.extensions.get('event_broker')
+            if broker is None:
+                broker = EventBroker(
+                    create_backend(app.config.get('EVENT_BROKER_URL')),
+                    queue_size=app.config.get('SSE_QUEUE_SIZE', 100)
+                )
+                app.extensions['event_broker'] = broker
+    return broker
+
+
+def publish_schedule_event(action, schedule, previous=None):
+    """Publish ``schedule.<action>`` after a commit; delivery failures are only logged"""
+    payload = {'schedule': schedule}
+    if previous:
+        payload['previous'] = previous
+    try:
+        get_broker().publish(f'schedule.{action}', payload)
+    except Exception as e:
+        current_app.logger.warning(f"Could not publish schedule.{action}: {e}")
+
+
+def format_sse(event):
+    """Encode an event in text/event-stream framing"""
+    data = json.dumps({key: value for key, value in event.items() if key not in ('id', 'type')})
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+def stream_events(broker, lab=None, date=None, keepalive=15):
+    """Yield SSE frames for matching events until the client goes away or falls behind"""
+    subscription = broker.subscribe(lab=lab, date=date)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            event = subscription.get(timeout=keepalive)
+            if subscription.overflowed:
+                yield 'event: overflow\ndata: {}\n\n'
+                return
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(subscription)
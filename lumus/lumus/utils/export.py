@@ -0,0 +1,160 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime, timezone
+from sqlalchemy import select
+from lumus.config.database import db
+from lumus.models.schedule import Schedule
+
+
+EXPORT_COLUMNS = (
+    'id', 'date', 'times', 'user_name', 'course_code', 'annotation', 'repeat_type',
+    'lab_nickname', 'status', 'user_id', 'created_at', 'updated_at'
+)
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def schedule_export_query(start_date=None, end_date=None, lab_nickname=None):
+    """Core SELECT over the export columns, ordered for stable output"""
+    table = Schedule.__table__
+    query = select(*[table.c[name] for name in EXPORT_COLUMNS])
+
+    if start_date:
+        query = query.where(table.c.date >= start_date)
+    if end_date:
+        query = query.where(table.c.date <= end_date)
+    if lab_nickname:
+        query = query.where(table.c.lab_nickname == lab_nickname)
+
+    return query.order_by(table.c.date, table.c.id)
+
+
+def iter_batches(query, batch_size=5000):
+    """Yield lists of row mappings from a server-side cursor on a dedicated connection"""
+    with db.engine.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(query)
+        for partition in result.mappings().partitions(batch_size):
+            yield partition
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _times(value):
+    if isinstance(value, str):
+        value = json.loads(value)
+    return [str(slot) for slot in value or []]
+
+
+def stream_csv(batches):
+    """Encode row batches as CSV, yielding one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for batch in batches:
+        for row in batch:
+            values = [_plain(row[name]) for name in EXPORT_COLUMNS]
+            values[EXPORT_COLUMNS.index('times')] = json.dumps(_times(row['times']))
+            writer.writerow(values)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose bytes are drained by the generator after each row group"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _parquet_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('id', pa.int64()),
+        ('date', pa.date32()),
+        ('times', pa.list_(pa.string())),
+        ('user_name', pa.string()),
+        ('course_code', pa.string()),
+        ('annotation', pa.string()),
+        ('repeat_type', pa.string()),
+        ('lab_nickname', pa.string()),
+        ('status', pa.string()),
+        ('user_id', pa.string()),
+        ('created_at', pa.timestamp('us')),
+        ('updated_at', pa.timestamp('us'))
+    ])
+
+
+def stream_parquet(batches):
+    """Encode row batches as Parquet, writing one row group per batch"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+
+    try:
+        for batch in batches:
+            columns = {name: [] for name in EXPORT_COLUMNS}
+            for row in batch:
+                for name in EXPORT_COLUMNS:
+                    value = row[name]
+                    if name == 'times':
+                        value = _times(value)
+                    elif isinstance(value, enum.Enum):
+                        value = value.value
+                    elif isinstance(value, datetime) and value.tzinfo is not None:
+                        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+                    columns[name].append(value)
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+
+    yield sink.drain()
@@ -0,0 +1,89 @@
+import hashlib
+from flask import Response, current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy.exc import IntegrityError
+from lumus.config.database import db
+from lumus.models.idempotency import IdempotencyKey
+
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _in_progress():
+    response = jsonify({'error': f'A request with this {HEADER} is still in progress'})
+    response.status_code = 409
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+class IdempotentRequest:
+    """Replays the stored response for a retried request instead of running it again
+
+    A view calls ``replay()`` before validating, ``reserve()`` right before its
+    first write and ``complete()`` before committing.
+    """
+
+    def __init__(self, key, scope, request_hash):
+        self.key = key
+        self.scope = scope
+        self.request_hash = request_hash
+        self.record = None
+
+    @classmethod
+    def from_request(cls):
+        """Build from the current request, or ``None`` when no Idempotency-Key was sent"""
+        key = (request.headers.get(HEADER) or '').strip()
+        if not key:
+            return None
+
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+        caller = f'user:{identity}' if identity is not None else 'anonymous'
+
+        digest = hashlib.sha256()
+        digest.update(request.method.encode())
+        digest.update(request.path.encode())
+        digest.update(request.get_data())
+        return cls(key, f'{request.endpoint}:{caller}', digest.hexdigest())
+
+    def _response_for(self, record):
+        if record.request_hash != self.request_hash:
+            return jsonify({'error': f'{HEADER} was already used with a different request'}), 422
+        if not record.completed:
+            return _in_progress()
+
+        response = Response(record.response_body, status=record.status_code, mimetype='application/json')
+        response.headers['Idempotent-Replayed'] = 'true'
+        return response
+
+    def replay(self):
+        """The stored response (or a 4xx explaining why there is none) for a key seen before"""
+        if len(self.key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'}), 400
+
+        record = IdempotencyKey.lookup(self.scope, self.key)
+        if record is None:
+            return None
+        return self._response_for(record)
+
+    def reserve(self):
+        """Claim the key in the current transaction; returns a response if another attempt holds it
+
+        Call before the first write: losing the race rolls the session back.
+        """
+        ttl = current_app.config.get('IDEMPOTENCY_KEY_TTL_HOURS', 24) * 3600
+        try:
+            self.record = IdempotencyKey.reserve(self.scope, self.key, self.request_hash, ttl)
+            return None
+        except IntegrityError:
+            db.session.rollback()
+
+        record = IdempotencyKey.lookup(self.scope, self.key)
+        if record is None:
+            return _in_progress()
+        return self._response_for(record)
+
+    def complete(self, status_code, payload):
+        """Record the response that retries will receive; commits with the caller's change"""
+        self.record.complete(status_code, current_app.json.dumps(payload))
@@ -0,0 +1,131 @@
+import re
+from collections import Counter
+from time import perf_counter
+from flask import current_app, g, request
+from flask_sqlalchemy.record_queries import get_recorded_queries
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_IN_LIST_RE = re.compile(r'IN \((?:\?|%\(\w+\)s|:\w+)(?:,\s*(?:\?|%\(\w+\)s|:\w+))*\)', re.IGNORECASE)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more queries than its budget"""
+
+    def __init__(self, endpoint, budget, count):
+        self.endpoint = endpoint
+        self.budget = budget
+        self.count = count
+        super().__init__(
+            f"Endpoint '{endpoint}' executed {count} queries (budget: {budget})"
+        )
+
+
+def query_budget(limit):
+    """Decorator to declare the maximum number of queries a route may run"""
+    def decorator(f):
+        f._query_budget = limit
+        return f
+    return decorator
+
+
+def normalize_statement(statement):
+    """Collapse a SQL statement to its shape so repeated queries can be grouped"""
+    if not statement:
+        return ''
+
+    shape = _WHITESPACE_RE.sub(' ', statement).strip()
+    return _IN_LIST_RE.sub('IN (...)', shape)
+
+
+def request_queries():
+    """Queries recorded since the current request started
+
+    Requests share ``g`` when an app context was already pushed (tests, CLI),
+    so the recorded list may include queries from earlier requests.
+    """
+    return get_recorded_queries()[g.get('_request_query_offset', 0):]
+
+
+def get_query_stats():
+    """Get query count and total database time (ms) for the current request"""
+    queries = request_queries()
+    total_ms = sum(query.duration for query in queries) * 1000
+    return len(queries), total_ms
+
+
+def find_repeated_statements(queries, threshold):
+    """Return statement shapes executed at least ``threshold`` times"""
+    shapes = Counter(normalize_statement(query.statement) for query in queries)
+    return {shape: count for shape, count in shapes.items() if count >= threshold}
+
+
+def _get_budget(endpoint):
+    view = current_app.view_functions.get(request.endpoint)
+    budget = getattr(view, '_query_budget', None)
+    if budget is not None:
+        return budget
+
+    budgets = current_app.config.get('SQL_QUERY_BUDGETS') or {}
+    if endpoint in budgets:
+        return budgets[endpoint]
+
+    return current_app.config.get('SQL_QUERY_BUDGET')
+
+
+def _start_timer():
+    g._request_start_time = perf_counter()
+    g._request_query_offset = len(get_recorded_queries())
+
+
+def _report_queries(response):
+    config = current_app.config
+    queries = request_queries()
+    endpoint = request.endpoint or request.path
+
+    db_ms = sum(query.duration for query in queries) * 1000
+
+    slow_threshold = config.get('SQL_SLOW_QUERY_MS')
+    if slow_threshold is not None:
+        for query in queries:
+            duration_ms = query.duration * 1000
+            if duration_ms >= slow_threshold:
+                current_app.logger.warning(
+                    f"Slow query ({duration_ms:.1f} ms) in {endpoint} at {query.location}: "
+                    f"{normalize_statement(query.statement)} -- params: {query.parameters!r}"
+                )
+
+    repeat_threshold = config.get('SQL_REPEATED_QUERY_THRESHOLD')
+    if repeat_threshold:
+        for shape, count in find_repeated_statements(queries, repeat_threshold).items():
+            current_app.logger.warning(
+                f"Possible N+1 in {endpoint}: statement executed {count} times: {shape}"
+            )
+
+    if config.get('SQL_SERVER_TIMING', True):
+        timings = [f'db;dur={db_ms:.2f};desc="{len(queries)} queries"']
+        start_time = g.get('_request_start_time')
+        if start_time is not None:
+            total_ms = (perf_counter() - start_time) * 1000
+            timings.append(f'app;dur={max(total_ms - db_ms, 0):.2f}')
+            timings.append(f'total;dur={total_ms:.2f}')
+        response.headers.add('Server-Timing', ', '.join(timings))
+
+    budget = _get_budget(endpoint)
+    if budget is not None and len(queries) > budget:
+        if config.get('SQL_QUERY_BUDGET_STRICT'):
+            raise QueryBudgetExceeded(endpoint, budget, len(queries))
+        current_app.logger.warning(
+            f"Endpoint '{endpoint}' executed {len(queries)} queries (budget: {budget})"
+        )
+
+    return response
+
+
+def register_instrumentation(app):
+    """Register per-request SQL instrumentation hooks with the Flask app"""
+    if not app.config.get('SQLALCHEMY_RECORD_QUERIES'):
+        return
+
+    app.before_request(_start_timer)
+    app.after_request(_report_queries)
@@ -0,0 +1,179 @@
+import os
+import socket
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from sqlalchemy import or_
+from lumus.config.database import db
+from lumus.models.changes import ScheduleTombstone
+from lumus.models.course import Course
+from lumus.models.idempotency import IdempotencyKey
+from lumus.models.jobs import JobLock
+from lumus.models.outbox import OutboxMessage
+from lumus.models.rollups import ScheduleRollup
+from lumus.models.schedule import BookingStatus, Schedule
+from lumus.utils.events import publish_schedule_event
+from lumus.utils.metrics import record_job_run
+from lumus.utils.outbox import enqueue_booking_notification
+
+
+def expire_pending_schedules(app):
+    """Cancel PENDING bookings whose day has passed
+
+    With PENDING_EXPIRY_HOURS set, bookings left unconfirmed for that long are
+    cancelled too, even if their day is still ahead.
+    """
+    condition = Schedule.date < date.today()
+    expiry_hours = app.config.get('PENDING_EXPIRY_HOURS')
+    if expiry_hours:
+        condition = or_(condition, Schedule.created_at < datetime.utcnow() - timedelta(hours=expiry_hours))
+    batch_size = app.config.get('JOB_BATCH_SIZE', 500)
+    expired = 0
+
+    while True:
+        schedules = Schedule.query.filter(
+            Schedule.status == BookingStatus.PENDING,
+            condition
+        ).order_by(Schedule.id).limit(batch_size).all()
+        if not schedules:
+            return expired
+
+        for schedule in schedules:
+            schedule.status = BookingStatus.CANCELLED
+        db.session.flush()
+
+        changes = []
+        for schedule in schedules:
+            result = schedule.to_dict()
+            enqueue_booking_notification('booking_cancelled', result)
+            changes.append(result)
+        db.session.commit()
+
+        for result in changes:
+            publish_schedule_event('updated', result)
+        expired += len(schedules)
+
+
+def reconcile_counters(app):
+    """Repair denormalised enrollment counts that drifted from the students table"""
+    return Course.recount_enrollments()
+
+
+def prune_sync_tombstones(app):
+    """Drop delta sync tombstones past their retention window"""
+    days = app.config.get('TOMBSTONE_RETENTION_DAYS', 30)
+    return ScheduleTombstone.prune(datetime.utcnow() - timedelta(days=days))
+
+
+def prune_outbox(app):
+    """Drop delivered notifications past their retention window"""
+    days = app.config.get('OUTBOX_RETENTION_DAYS', 14)
+    return OutboxMessage.prune_sent(datetime.utcnow() - timedelta(days=days))
+
+
+def prune_idempotency_keys(app):
+    """Drop idempotency records whose replay window has closed"""
+    return IdempotencyKey.prune()
+
+
+def rebuild_rollups(app):
+    """Recompute the daily schedule rollups to clear any drift"""
+    return ScheduleRollup.rebuild()
+
+
+DEFAULT_JOBS = {
+    'expire_pending_schedules': expire_pending_schedules,
+    'reconcile_counters': reconcile_counters,
+    'prune_sync_tombstones': prune_sync_tombstones,
+    'prune_outbox': prune_outbox,
+    'prune_idempotency_keys': prune_idempotency_keys,
+    'rebuild_rollups': rebuild_rollups
+}
+
+
+class JobScheduler:
+    """Runs due jobs on an interval; a JobLock lease makes each run happen on one worker only
+
+    Intervals come from JOB_INTERVALS (seconds); a job missing there or set to
+    0 is disabled.
+    """
+
+    def __init__(self, app, jobs=None):
+        self.app = app
+        self.jobs = dict(DEFAULT_JOBS if jobs is None else jobs)
+        self.holder = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._stop = threading.Event()
+        self._thread = None
+
+    def interval(self, name):
+        return (self.app.config.get('JOB_INTERVALS') or {}).get(name) or 0
+
+    def run_job(self, name, force=False):
+        """Run ``name`` if it is due (or ``force``) and this worker wins the lease
+
+        Returns ``None`` when another worker holds the job or it is not due,
+        otherwise ``(status, rows)``.
+        """
+        config = self.app.config
+        if not JobLock.acquire(name, self.holder, config.get('JOB_LEASE_SECONDS', 600), force=force):
+            return None
+
+        rows, error = 0, None
+        start = perf_counter()
+        try:
+            rows = self.jobs[name](self.app) or 0
+            status = 'success'
+        except Exception as e:
+            db.session.rollback()
+            status, error = 'error', e
+            self.app.logger.error(f"Job {name} failed: {str(e)}")
+        duration = perf_counter() - start
+
+        record_job_run(name, status, duration, rows)
+        if not JobLock.release(name, self.holder, self.interval(name) or 60, status, duration, error):
+            self.app.logger.warning(f"Job {name} outlived its lease; JOB_LEASE_SECONDS may be too short")
+        if status == 'success':
+            self.app.logger.info(f"Job {name} finished in {duration:.2f}s ({rows} rows)")
+
+        return status, rows
+
+    def run_pending(self):
+        """Run every enabled job that is due"""
+        results = {}
+        for name in self.jobs:
+            if self.interval(name) > 0:
+                results[name] = self.run_job(name)
+        return results
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name='job-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self):
+        """Check for due jobs every JOB_POLL_INTERVAL seconds until stop() is called"""
+        interval = self.app.config.get('JOB_POLL_INTERVAL', 30)
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    self.run_pending()
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Job scheduler error: {str(e)}")
+                finally:
+                    db.session.remove()
+            self._stop.wait(interval)
+
+
+def register_jobs(app):
+    """Start the in-process job scheduler when JOBS_ENABLED is set"""
+    if app.config.get('JOBS_ENABLED') and not app.config.get('TESTING'):
+        app.extensions['job_scheduler'] = JobScheduler(app).start()
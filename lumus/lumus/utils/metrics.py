@@ -0,0 +1,221 @@
+import os
+from time import perf_counter
+from flask import current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    REGISTRY
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from lumus.config.database import db
+from lumus.utils.instrumentation import get_query_stats
+
+
+REQUEST_LATENCY = Histogram(
+    'lumus_request_duration_seconds',
+    'Request latency by blueprint and endpoint',
+    ['blueprint', 'endpoint', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+REQUEST_COUNT = Counter(
+    'lumus_requests_total',
+    'Requests by blueprint, endpoint and status code',
+    ['blueprint', 'endpoint', 'method', 'status']
+)
+
+REQUEST_ERRORS = Counter(
+    'lumus_request_errors_total',
+    'Requests that ended with a 5xx status',
+    ['blueprint', 'endpoint', 'method']
+)
+
+REQUEST_QUERIES = Histogram(
+    'lumus_request_db_queries',
+    'SQL queries executed per request',
+    ['blueprint', 'endpoint'],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100)
+)
+
+POOL_SIZE = Gauge(
+    'lumus_db_pool_size',
+    'Configured SQLAlchemy connection pool size',
+    multiprocess_mode='livesum'
+)
+
+POOL_CHECKED_OUT = Gauge(
+    'lumus_db_pool_checked_out',
+    'SQLAlchemy connections currently checked out',
+    multiprocess_mode='livesum'
+)
+
+POOL_OVERFLOW = Gauge(
+    'lumus_db_pool_overflow',
+    'SQLAlchemy connections opened beyond the pool size',
+    multiprocess_mode='livesum'
+)
+
+CACHE_REQUESTS = Counter(
+    'lumus_cache_requests_total',
+    'Cache lookups by cache name and result (hit/miss)',
+    ['cache', 'result']
+)
+
+SSE_SUBSCRIBERS = Gauge(
+    'lumus_sse_subscribers',
+    'Open server-sent event streams',
+    multiprocess_mode='livesum'
+)
+
+OUTBOX_DELIVERIES = Counter(
+    'lumus_outbox_deliveries_total',
+    'Outbox delivery attempts by result (sent/retried/failed)',
+    ['result']
+)
+
+REQUESTS_SHED = Counter(
+    'lumus_requests_shed_total',
+    'Requests rejected before reaching the view, by reason (rate_limit/overload)',
+    ['endpoint', 'reason']
+)
+
+JOB_RUNS = Counter(
+    'lumus_job_runs_total',
+    'Periodic job runs by job and result (success/error)',
+    ['job', 'result']
+)
+
+JOB_DURATION = Histogram(
+    'lumus_job_duration_seconds',
+    'Periodic job run time by job',
+    ['job'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0)
+)
+
+JOB_ROWS = Counter(
+    'lumus_job_rows_total',
+    'Rows changed or deleted by periodic jobs',
+    ['job']
+)
+
+JOB_LAST_SUCCESS = Gauge(
+    'lumus_job_last_success_timestamp_seconds',
+    'Unix time of the last successful run of each periodic job',
+    ['job'],
+    multiprocess_mode='max'
+)
+
+BOOKING_CONFLICTS = Counter(
+    'lumus_booking_conflicts_total',
+    'Booking attempts that overlapped an existing confirmed booking',
+    ['lab_nickname']
+)
+
+
+def record_cache_lookup(cache, hit):
+    """Count a cache lookup as a hit or a miss"""
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def record_booking_conflict(lab_nickname):
+    """Count a booking conflict for the given lab"""
+    BOOKING_CONFLICTS.labels(lab_nickname=lab_nickname or 'unknown').inc()
+
+
+def record_job_run(job, result, duration, rows=0):
+    """Record one periodic job run"""
+    JOB_RUNS.labels(job=job, result=result).inc()
+    JOB_DURATION.labels(job=job).observe(duration)
+    if rows:
+        JOB_ROWS.labels(job=job).inc(rows)
+    if result == 'success':
+        JOB_LAST_SUCCESS.labels(job=job).set_to_current_time()
+
+
+def update_pool_metrics(pool=None, returning=False):
+    """Refresh connection pool gauges from ``pool`` (default: the current engine's)
+
+    Pool ``checkin`` listeners run before the connection is handed back, so
+    ``returning`` counts it as already returned.
+    """
+    pool = pool if pool is not None else db.engine.pool
+    size = getattr(pool, 'size', None)
+    if size is None or not hasattr(pool, 'checkedout'):
+        return
+
+    checked_out, overflow = pool.checkedout(), pool.overflow()
+    if returning:
+        checked_out -= 1
+        if overflow > 0 and pool.checkedin() >= size():
+            overflow -= 1
+
+    POOL_SIZE.set(size())
+    POOL_CHECKED_OUT.set(max(checked_out, 0))
+    POOL_OVERFLOW.set(max(overflow, 0))
+
+
+def _register_pool_metrics(engine):
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        update_pool_metrics(engine.pool)
+
+    @event.listens_for(engine, 'checkin')
+    def _on_checkin(dbapi_connection, connection_record):
+        update_pool_metrics(engine.pool, returning=True)
+
+
+def generate_metrics():
+    """Render metrics in the Prometheus text format, merging worker processes if enabled"""
+    update_pool_metrics()
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def _start_timer():
+    g._metrics_start_time = perf_counter()
+
+
+def _record_request(response):
+    start_time = g.get('_metrics_start_time')
+    if start_time is None or request.endpoint in current_app.config.get('METRICS_EXCLUDED_ENDPOINTS', ()):
+        return response
+
+    blueprint = request.blueprint or 'app'
+    endpoint = request.endpoint or 'unmatched'
+    method = request.method
+
+    REQUEST_LATENCY.labels(blueprint, endpoint, method).observe(perf_counter() - start_time)
+    REQUEST_COUNT.labels(blueprint, endpoint, method, str(response.status_code)).inc()
+
+    if response.status_code >= 500:
+        REQUEST_ERRORS.labels(blueprint, endpoint, method).inc()
+
+    if current_app.config.get('SQLALCHEMY_RECORD_QUERIES'):
+        query_count, _ = get_query_stats()
+        REQUEST_QUERIES.labels(blueprint, endpoint).observe(query_count)
+
+    return response
+
+
+def register_metrics(app):
+    """Register request metrics hooks with the Flask app"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+
+    # Every worker keeps its own pool gauges current; livesum adds them up at scrape time.
+    with app.app_context():
+        _register_pool_metrics(db.engine)
+        update_pool_metrics()
@@ -0,0 +1,202 @@
+import random
+import smtplib
+import threading
+from email.message import EmailMessage
+from flask import current_app
+from lumus.config.database import db
+from lumus.models.outbox import OutboxMessage, OutboxStatus
+from lumus.models.user import User
+from lumus.utils.metrics import OUTBOX_DELIVERIES
+
+
+NOTIFICATION_SUBJECTS = {
+    'booking_confirmation': 'Booking received: {course_code} in {lab_nickname} on {date}',
+    'booking_changed': 'Booking updated: {course_code} in {lab_nickname} on {date}',
+    'booking_cancelled': 'Booking cancelled: {course_code} in {lab_nickname} on {date}'
+}
+
+
+def _recipient_for(user_id):
+    if not user_id or not str(user_id).isdigit():
+        return None
+    user = User.query.get(int(user_id))
+    if not user or not user.is_active:
+        return None
+    return user.email
+
+
+def _render_body(kind, schedule):
+    status = str(schedule.get('status') or '').lower()
+    lines = [
+        f"Hello {schedule.get('user_name') or ''},",
+        '',
+        {
+            'booking_confirmation': 'We received your laboratory booking.',
+            'booking_changed': 'Your laboratory booking was updated.',
+            'booking_cancelled': 'Your laboratory booking was cancelled.'
+        }[kind],
+        '',
+        f"Lab: {schedule.get('lab_nickname')}",
+        f"Date: {schedule.get('date')}",
+        f"Times: {', '.join(schedule.get('times') or [])}",
+        f"Course: {schedule.get('course_code')}"
+    ]
+    if status and kind != 'booking_cancelled':
+        lines.append(f'Status: {status}')
+    if schedule.get('annotation'):
+        lines.append(f"Notes: {schedule['annotation']}")
+    return '\n'.join(lines) + '\n'
+
+
+def enqueue_booking_notification(kind, schedule):
+    """Queue a notification for ``schedule`` in the current transaction
+
+    Nothing is queued for guest bookings or users without an active account.
+    """
+    recipient = _recipient_for(schedule.get('user_id'))
+    if recipient is None:
+        return None
+
+    subject = NOTIFICATION_SUBJECTS[kind].format(
+        course_code=schedule.get('course_code'),
+        lab_nickname=schedule.get('lab_nickname'),
+        date=schedule.get('date')
+    )
+    return OutboxMessage.enqueue(
+        kind, recipient, subject, _render_body(kind, schedule), schedule_id=schedule.get('id')
+    )
+
+
+def backoff_seconds(attempts, base=30, cap=3600):
+    """Exponential backoff with jitter: roughly base, 2*base, 4*base ... up to cap"""
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _open_smtp(config):
+    smtp = smtplib.SMTP(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=config.get('MAIL_TIMEOUT', 10))
+    if config.get('MAIL_USE_TLS'):
+        smtp.starttls()
+    if config.get('MAIL_USERNAME'):
+        smtp.login(config['MAIL_USERNAME'], config.get('MAIL_PASSWORD') or '')
+    return smtp
+
+
+def _build_email(message, sender):
+    email = EmailMessage()
+    email['From'] = sender
+    email['To'] = message.recipient
+    email['Subject'] = message.subject
+    email['Message-ID'] = f'<outbox-{message.id}@lumus>'
+    email.set_content(message.body)
+    return email
+
+
+def dispatch_once(app=None):
+    """Deliver one batch of due outbox messages over a single SMTP connection"""
+    app = app or current_app._get_current_object()
+    config = app.config
+    result = {'sent': 0, 'retried': 0, 'failed': 0}
+
+    if not config.get('MAIL_SERVER'):
+        return result
+
+    messages = OutboxMessage.claim_batch(
+        limit=config.get('OUTBOX_BATCH_SIZE', 50),
+        lease_seconds=config.get('OUTBOX_LEASE_SECONDS', 300)
+    )
+    if not messages:
+        return result
+
+    max_attempts = config.get('OUTBOX_MAX_ATTEMPTS', 8)
+    base = config.get('OUTBOX_BACKOFF_BASE', 30)
+    cap = config.get('OUTBOX_BACKOFF_MAX', 3600)
+    sender = config.get('MAIL_DEFAULT_SENDER') or config.get('MAIL_USERNAME') or 'lumus@localhost'
+
+    def fail(message, error):
+        message.mark_failed(error, max_attempts, lambda attempts: backoff_seconds(attempts, base, cap))
+        outcome = 'failed' if message.status == OutboxStatus.FAILED else 'retried'
+        result[outcome] += 1
+        OUTBOX_DELIVERIES.labels(result=outcome).inc()
+
+    try:
+        smtp = _open_smtp(config)
+    except (OSError, smtplib.SMTPException) as e:
+        app.logger.warning(f"Outbox: could not connect to {config['MAIL_SERVER']}: {e}")
+        for message in messages:
+            fail(message, e)
+        db.session.commit()
+        return result
+
+    try:
+        for message in messages:
+            try:
+                smtp.send_message(_build_email(message, sender))
+            except (OSError, smtplib.SMTPException) as e:
+                fail(message, e)
+                # smtplib drops the socket on 421 and disconnects; nothing more can be sent
+                if smtp.sock is None or not isinstance(e, smtplib.SMTPException):
+                    break
+            else:
+                message.mark_sent()
+                result['sent'] += 1
+                OUTBOX_DELIVERIES.labels(result='sent').inc()
+            db.session.commit()
+    finally:
+        try:
+            smtp.quit()
+        except (OSError, smtplib.SMTPException):
+            pass
+
+    # Messages never tried before the connection dropped keep their attempt count
+    for message in messages:
+        if message.claimed_by:
+            message.release()
+    db.session.commit()
+
+    return result
+
+
+class OutboxDispatcher:
+    """Background thread that drains the outbox while the app runs"""
+
+    def __init__(self, app):
+        self.app = app
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name='outbox-dispatcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self):
+        """Poll and deliver until stop() is called"""
+        interval = self.app.config.get('OUTBOX_POLL_INTERVAL', 5)
+        batch_size = self.app.config.get('OUTBOX_BATCH_SIZE', 50)
+        while not self._stop.is_set():
+            delivered = 0
+            with self.app.app_context():
+                try:
+                    result = dispatch_once(self.app)
+                    delivered = sum(result.values())
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Outbox dispatch error: {str(e)}")
+                finally:
+                    db.session.remove()
+            if delivered < batch_size:
+                self._stop.wait(interval)
+
+
+def register_outbox(app):
+    """Start the in-process dispatcher when OUTBOX_DISPATCHER_ENABLED is set"""
+    if app.config.get('OUTBOX_DISPATCHER_ENABLED') and not app.config.get('TESTING'):
+        app.extensions['outbox_dispatcher'] = OutboxDispatcher(app).start()
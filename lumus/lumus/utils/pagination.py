@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from math import ceil
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from lumus.utils.metrics import record_cache_lookup
+
+
+COUNT_MODES = ('none', 'estimate', 'exact')
+
+_MAX_ENTRIES_PER_TABLE = 256
+_lock = threading.Lock()
+_count_cache = {}
+
+
+class Page:
+    """One page of results fetched with ``LIMIT per_page + 1``"""
+
+    def __init__(self, items, page, per_page, has_next, total=None):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_next = has_next
+        self.has_prev = page > 1
+        self.total = total
+
+    @property
+    def pages(self):
+        if self.total is None:
+            return None
+        return ceil(self.total / self.per_page) if self.per_page else 0
+
+    def to_dict(self):
+        return {
+            'page': self.page,
+            'per_page': self.per_page,
+            'total': self.total,
+            'pages': self.pages,
+            'has_next': self.has_next,
+            'has_prev': self.has_prev
+        }
+
+
+def _query_table(query):
+    entity = query.column_descriptions[0]['entity']
+    return entity.__table__.name
+
+
+def _cache_key(query):
+    compiled = query.statement.compile()
+    params = tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+    return str(compiled), params
+
+
+def _get_cached_count(table, key):
+    with _lock:
+        entry = _count_cache.get(table, {}).get(key)
+    if entry is None or entry[1] < time.monotonic():
+        return None
+    return entry[0]
+
+
+def _set_cached_count(table, key, total):
+    ttl = current_app.config.get('PAGINATION_COUNT_CACHE_TTL', 60)
+    with _lock:
+        entries = _count_cache.setdefault(table, OrderedDict())
+        entries[key] = (total, time.monotonic() + ttl)
+        entries.move_to_end(key)
+        while len(entries) > _MAX_ENTRIES_PER_TABLE:
+            entries.popitem(last=False)
+
+
+def invalidate_counts(*tables):
+    """Drop cached totals for ``tables`` (every table when none are given)"""
+    with _lock:
+        if not tables:
+            _count_cache.clear()
+        for table in tables:
+            _count_cache.pop(table, None)
+
+
+def count_mode(value=None):
+    """Resolve a ``count`` request argument to one of COUNT_MODES"""
+    value = (value or current_app.config.get('PAGINATION_COUNT_MODE', 'none')).lower()
+    if value not in COUNT_MODES:
+        raise ValueError(f"Invalid count mode: {value}. Use {', '.join(COUNT_MODES)}")
+    return value
+
+
+def paginate(query, page, per_page, count='none'):
+    """Fetch one page without COUNT(*) unless the total is requested
+
+    ``count='none'`` only reports ``has_next``; ``'exact'`` always counts;
+    ``'estimate'`` reuses a cached total for the same filters until a write
+    to the table invalidates it. The cache lives in each worker process, so
+    other workers may serve a total up to ``PAGINATION_COUNT_CACHE_TTL``
+    seconds old after a write.
+    """
+    page = max(page, 1)
+    offset = (page - 1) * per_page
+    rows = query.limit(per_page + 1).offset(offset).all()
+    items, has_next = rows[:per_page], len(rows) > per_page
+
+    total = None
+    if not has_next and (items or page == 1):
+        total = offset + len(items)
+
+    if count == 'none':
+        return Page(items, page, per_page, has_next, total)
+
+    table = _query_table(query)
+    key = _cache_key(query)
+
+    if total is None and count == 'estimate':
+        total = _get_cached_count(table, key)
+        record_cache_lookup('pagination_count', total is not None)
+
+    if total is None:
+        total = query.order_by(None).count()
+
+    _set_cached_count(table, key, total)
+    return Page(items, page, per_page, has_next, total)
+
+
+def _pending_tables(session):
+    return session.info.setdefault('pagination_dirty_tables', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_flushed_tables(session, flush_context):
+    tables = _pending_tables(session)
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(instance, '__tablename__', None)
+        if table:
+            tables.add(table)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_executed_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _pending_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_tables(session):
+    tables = session.info.pop('pagination_dirty_tables', None)
+    if tables:
+        invalidate_counts(*tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_tables(session):
+    session.info.pop('pagination_dirty_tables', None)
@@ -0,0 +1,202 @@
+import math
+import threading
+from abc import ABC, abstractmethod
+from time import monotonic
+from flask import current_app, g, jsonify, request
+from lumus.utils.metrics import REQUESTS_SHED
+
+
+PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400
+}
+
+
+def parse_limit(limit):
+    """Turn ``'60/minute'`` into ``(capacity, refill_per_second)``"""
+    count, _, period = str(limit).partition('/')
+    period = period.strip().lower().rstrip('s') or 'second'
+    if period not in PERIODS:
+        raise ValueError(f'Unsupported rate limit period: {limit}')
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period]
+
+
+class BucketStore(ABC):
+    """Holds token buckets; ``take`` spends one token and reports whether it was available"""
+
+    @abstractmethod
+    def take(self, key, capacity, rate):
+        """Return ``(allowed, remaining, retry_after_seconds)``"""
+
+
+class MemoryStore(BucketStore):
+    """Buckets in this process only; each worker enforces the limit on its own"""
+
+    def __init__(self, sweep_every=1000):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._sweep_every = sweep_every
+        self._calls = 0
+
+    def take(self, key, capacity, rate):
+        now = monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+
+            self._calls += 1
+            if self._calls >= self._sweep_every:
+                self._calls = 0
+                # A bucket that has refilled completely behaves like a new one
+                self._buckets = {
+                    key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+                }
+
+        retry_after = 0 if allowed else (1 - tokens) / rate
+        return allowed, int(tokens), retry_after
+
+
+class RedisStore(BucketStore):
+    """Buckets shared by every worker through Redis, updated atomically by a Lua script"""
+
+    SCRIPT = """
+    local now = redis.call('TIME')
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url, prefix='lumus:ratelimit:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def take(self, key, capacity, rate):
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[capacity, rate])
+        tokens = float(tokens)
+        retry_after = 0 if allowed else (1 - tokens) / rate
+        return bool(allowed), int(tokens), retry_after
+
+
+def create_store(url):
+    if not url or url == 'memory://':
+        return MemoryStore()
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStore(url)
+    raise ValueError(f'Unsupported rate limit storage URL: {url}')
+
+
+def client_address():
+    """The caller's address; the first X-Forwarded-For hop when RATELIMIT_TRUST_FORWARDED is set"""
+    if current_app.config.get('RATELIMIT_TRUST_FORWARDED'):
+        forwarded = request.headers.get('X-Forwarded-For', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.remote_addr or 'unknown'
+
+
+def _shed(reason, status, message, retry_after, headers=None):
+    REQUESTS_SHED.labels(endpoint=request.endpoint or 'unmatched', reason=reason).inc()
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    for name, value in (headers or {}).items():
+        response.headers[name] = value
+    return response
+
+
+class RateLimiter:
+    """Per-client, per-endpoint token buckets for the endpoints listed in RATE_LIMITS"""
+
+    def __init__(self, app):
+        self.limits = {
+            endpoint: parse_limit(limit)
+            for endpoint, limit in (app.config.get('RATE_LIMITS') or {}).items()
+        }
+        self.store = create_store(app.config.get('RATELIMIT_STORAGE_URL'))
+
+    def check(self):
+        limit = self.limits.get(request.endpoint)
+        if limit is None or request.method == 'OPTIONS':
+            return None
+
+        capacity, rate = limit
+        allowed, remaining, retry_after = self.store.take(
+            f'{request.endpoint}:{client_address()}', capacity, rate
+        )
+        g._rate_limit_headers = {
+            'X-RateLimit-Limit': str(capacity),
+            'X-RateLimit-Remaining': str(remaining)
+        }
+        if allowed:
+            return None
+        return _shed('rate_limit', 429, 'Too many requests', retry_after, g._rate_limit_headers)
+
+    def add_headers(self, response):
+        for name, value in (g.pop('_rate_limit_headers', None) or {}).items():
+            response.headers.setdefault(name, value)
+        return response
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests per worker and answers 503 once the cap is reached
+
+    A request waits up to ADMISSION_QUEUE_TIMEOUT seconds for a slot, so short
+    bursts queue briefly while sustained overload is shed before any query runs.
+    """
+
+    def __init__(self, app):
+        self.limit = app.config.get('ADMISSION_MAX_CONCURRENT')
+        self.timeout = app.config.get('ADMISSION_QUEUE_TIMEOUT', 0.1)
+        self.excluded = set(app.config.get('ADMISSION_EXCLUDED_ENDPOINTS') or ())
+        self._slots = threading.BoundedSemaphore(self.limit)
+
+    def acquire(self):
+        if request.endpoint in self.excluded or request.method == 'OPTIONS':
+            return None
+        if not self._slots.acquire(timeout=self.timeout):
+            return _shed('overload', 503, 'Server is busy, retry shortly', 1)
+        g._admission_slot = True
+        return None
+
+    def release(self, exc=None):
+        if g.pop('_admission_slot', False):
+            self._slots.release()
+
+
+def register_rate_limits(app):
+    """Install per-route rate limits and admission control ahead of every view
+
+    Rate limits run first so a throttled client never occupies a concurrency slot.
+    """
+    if app.config.get('RATELIMIT_ENABLED', True) and app.config.get('RATE_LIMITS'):
+        rate_limiter = RateLimiter(app)
+        app.before_request(rate_limiter.check)
+        app.after_request(rate_limiter.add_headers)
+        app.extensions['rate_limiter'] = rate_limiter
+
+    if app.config.get('ADMISSION_MAX_CONCURRENT'):
+        limiter = ConcurrencyLimiter(app)
+        app.before_request(limiter.acquire)
+        app.teardown_request(limiter.release)
+        app.extensions['concurrency_limiter'] = limiter
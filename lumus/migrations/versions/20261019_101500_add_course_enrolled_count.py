@@ -0,0 +1,31 @@
+"""Add enrolled_count to courses
+
+Revision ID: 20261019_101500
+Revises: 20250711_234404
+Create Date: 2026-10-19 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_101500'
+down_revision = '20250711_234404'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('enrolled_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE courses SET enrolled_count = "
+        "(SELECT COUNT(*) FROM students WHERE students.course_id = courses.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_column('enrolled_count')
@@ -0,0 +1,35 @@
+"""Add full-text search indexes for users, courses and students
+
+Revision ID: 20261019_103000
+Revises: 20261019_101500
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+from lumus.models.search import create_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_103000'
+down_revision = '20261019_101500'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_COLUMNS = {
+    'users': ['name', 'email'],
+    'courses': ['name', 'nickname', 'course_code'],
+    'students': ['name', 'email', 'registration_number']
+}
+
+
+def upgrade():
+    connection = op.get_bind()
+    for table_name, columns in SEARCH_COLUMNS.items():
+        create_search_index(connection, table_name, columns)
+
+
+def downgrade():
+    connection = op.get_bind()
+    for table_name, columns in SEARCH_COLUMNS.items():
+        drop_search_index(connection, table_name, columns)
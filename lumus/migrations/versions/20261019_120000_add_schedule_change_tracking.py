@@ -0,0 +1,63 @@
+"""Add schedule change sequence and tombstones
+
+Revision ID: 20261019_120000
+Revises: 20261019_103000
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_120000'
+down_revision = '20261019_103000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('schedule_change_counter',
+    sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('pruned_through', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_schedule_change_counter'))
+    )
+    op.create_table('schedule_tombstones',
+    sa.Column('schedule_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=True),
+    sa.Column('lab_nickname', sa.String(length=10), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_schedule_tombstones'))
+    )
+    with op.batch_alter_table('schedule_tombstones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_schedule_tombstones_change_seq'), ['change_seq'], unique=True)
+        batch_op.create_index(batch_op.f('ix_schedule_tombstones_schedule_id'), ['schedule_id'], unique=False)
+
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_schedules_change_seq'), ['change_seq'], unique=False)
+
+    op.execute("UPDATE schedules SET change_seq = id")
+    op.execute(
+        "INSERT INTO schedule_change_counter (id, value, pruned_through) "
+        "SELECT 1, COALESCE(MAX(id), 0), 0 FROM schedules"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_schedules_change_seq'))
+        batch_op.drop_column('change_seq')
+
+    with op.batch_alter_table('schedule_tombstones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_schedule_tombstones_schedule_id'))
+        batch_op.drop_index(batch_op.f('ix_schedule_tombstones_change_seq'))
+
+    op.drop_table('schedule_tombstones')
+    op.drop_table('schedule_change_counter')
@@ -0,0 +1,43 @@
+"""Add job_locks
+
+Revision ID: 20261019_140000
+Revises: 20261019_130000
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_140000'
+down_revision = '20261019_130000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_locks',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('holder', sa.String(length=100), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('next_run_at', sa.DateTime(), nullable=False),
+    sa.Column('last_started_at', sa.DateTime(), nullable=True),
+    sa.Column('last_finished_at', sa.DateTime(), nullable=True),
+    sa.Column('last_status', sa.String(length=20), nullable=True),
+    sa.Column('last_duration', sa.Float(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_job_locks'))
+    )
+    with op.batch_alter_table('job_locks', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_job_locks_name'), ['name'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('job_locks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_job_locks_name'))
+
+    op.drop_table('job_locks')
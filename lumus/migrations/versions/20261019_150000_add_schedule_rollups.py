@@ -0,0 +1,59 @@
+"""Add schedule_rollups
+
+Revision ID: 20261019_150000
+Revises: 20261019_140000
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_150000'
+down_revision = '20261019_140000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('schedule_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('dimension', sa.String(length=10), nullable=False),
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('bookings', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_schedule_rollups')),
+    sa.UniqueConstraint('day', 'dimension', 'key', name='uq_schedule_rollups_day_dimension_key')
+    )
+    with op.batch_alter_table('schedule_rollups', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_schedule_rollups_day'), ['day'], unique=False)
+
+    # Backfill from existing schedules; later writes keep the rows in step
+    rollups = sa.table('schedule_rollups',
+        sa.column('day'), sa.column('dimension'), sa.column('key'), sa.column('bookings'))
+    schedules = sa.table('schedules',
+        sa.column('date'), sa.column('lab_nickname'), sa.column('course_code'), sa.column('status'))
+    active = sa.or_(schedules.c.status.is_(None), schedules.c.status != 'CANCELLED')
+    status_key = sa.func.lower(sa.cast(sa.func.coalesce(schedules.c.status, 'CONFIRMED'), sa.String(20)))
+
+    for dimension, key, condition in (
+        ('lab', schedules.c.lab_nickname, active),
+        ('course', schedules.c.course_code, active),
+        ('status', status_key, sa.true())
+    ):
+        op.execute(rollups.insert().from_select(
+            ['day', 'dimension', 'key', 'bookings'],
+            sa.select(schedules.c.date, sa.literal(dimension), key, sa.func.count())
+            .where(condition)
+            .group_by(schedules.c.date, key)
+        ))
+
+
+def downgrade():
+    with op.batch_alter_table('schedule_rollups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_schedule_rollups_day'))
+
+    op.drop_table('schedule_rollups')
@@ -0,0 +1,36 @@
+"""Add version to schedules and courses
+
+Revision ID: 20261019_170000
+Revises: 20261019_160000
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from lumus.models.search import create_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_170000'
+down_revision = '20261019_160000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    # SQLite rebuilds the table to drop a column, which discards its FTS triggers
+    create_search_index(op.get_bind(), 'courses', ['name', 'nickname', 'course_code'])
+
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,38 @@
+"""Recreate full-text search indexes and triggers
+
+SQLite drops a table's triggers whenever a batch migration rebuilds it, which
+left some upgraded databases with a stale FTS index. Every statement is
+idempotent, and the index is rebuilt from the base tables.
+
+Revision ID: 20261019_180000
+Revises: 20261019_170000
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+from lumus.models.search import create_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_180000'
+down_revision = '20261019_170000'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_COLUMNS = {
+    'users': ['name', 'email'],
+    'courses': ['name', 'nickname', 'course_code'],
+    'students': ['name', 'email', 'registration_number']
+}
+
+
+def upgrade():
+    connection = op.get_bind()
+    for table_name, columns in SEARCH_COLUMNS.items():
+        create_search_index(connection, table_name, columns)
+
+
+def downgrade():
+    # The index belongs to 20261019_103000; nothing to undo here
+    pass
@@ -0,0 +1,30 @@
+"""Add calendar_token to users
+
+Revision ID: 20261019_190000
+Revises: 20261019_180000
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from lumus.models.search import create_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_190000'
+down_revision = '20261019_180000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('calendar_token', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('calendar_token')
+
+    # SQLite rebuilds the table to drop a column, which discards its FTS triggers
+    create_search_index(op.get_bind(), 'users', ['name', 'email'])
@@ -0,0 +1,56 @@
+import pytest
+from app import create_app
+from lumus.config.config import TestingConfig
+from lumus.config.database import db
+from lumus.models import Course, Lab, User, UserType
+
+
+ADMIN_EMAIL = 'admin@lumus.test'
+ADMIN_PASSWORD = 'admin-password'
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(app):
+    user = User(name='Admin', email=ADMIN_EMAIL, type=UserType.ADMIN)
+    user.set_password(ADMIN_PASSWORD)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(client, admin):
+    response = client.post('/api/auth/login', json={'email': ADMIN_EMAIL, 'password': ADMIN_PASSWORD})
+    data = response.get_json()
+    return {'Authorization': f"Bearer {data.get('access_token') or data.get('token')}"}
+
+
+@pytest.fixture
+def lab(app):
+    lab = Lab(nickname='LAB01', name='Laboratory 01', capacity=30)
+    db.session.add(lab)
+    db.session.commit()
+    return lab
+
+
+@pytest.fixture
+def course(app):
+    course = Course(name='Algorithms', nickname='ALG', course_code='ALG001', period='2026.1', capacity=2)
+    db.session.add(course)
+    db.session.commit()
+    return course
@@ -0,0 +1,83 @@
+from datetime import date, time
+from urllib.parse import urlsplit
+from lumus.config.database import db
+from lumus.models import Schedule, User, UserType
+from lumus.utils.calendar import slot_blocks
+
+
+def test_user_feed_requires_token(client, admin):
+    assert client.get(f'/api/users/{admin.id}/calendar.ics').status_code == 404
+    assert client.get(f'/api/users/{admin.id}/calendar.ics?token=guess').status_code == 404
+
+
+def test_user_feed_with_issued_token(client, auth_headers, admin):
+    response = client.post(f'/api/users/{admin.id}/calendar-token', headers=auth_headers)
+    url = urlsplit(response.get_json()['url'])
+
+    feed = client.get(f'{url.path}?{url.query}')
+
+    assert response.status_code == 200
+    assert feed.status_code == 200
+    assert feed.mimetype == 'text/calendar'
+
+
+def test_regenerating_token_revokes_old_feed(client, auth_headers, admin):
+    first = client.post(f'/api/users/{admin.id}/calendar-token', headers=auth_headers).get_json()['token']
+    client.post(f'/api/users/{admin.id}/calendar-token', headers=auth_headers)
+
+    assert client.get(f'/api/users/{admin.id}/calendar.ics?token={first}').status_code == 404
+
+
+def test_token_not_exposed_in_user_payload(client, auth_headers, admin):
+    client.post(f'/api/users/{admin.id}/calendar-token', headers=auth_headers)
+
+    response = client.get(f'/api/users/{admin.id}', headers=auth_headers)
+
+    assert 'calendar_token' not in response.get_json()['user']
+
+
+def test_cannot_issue_token_for_another_user(client, admin):
+    user = User(name='Bruno', email='bruno@lumus.test', type=UserType.USER)
+    user.set_password('bruno-password')
+    db.session.add(user)
+    db.session.commit()
+    login = client.post('/api/auth/login', json={'email': 'bruno@lumus.test', 'password': 'bruno-password'})
+    token = login.get_json().get('access_token') or login.get_json().get('token')
+
+    response = client.post(f'/api/users/{admin.id}/calendar-token',
+                           headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 403
+
+
+def test_feed_skips_slots_that_are_not_times(client, lab):
+    today = date.today()
+    db.session.add_all([
+        Schedule(date=today, times=['M1'], user_name='Ana', course_code='ALG001', lab_nickname=lab.nickname),
+        Schedule(date=today, times=['07:00', 'M2'], user_name='Ana', course_code='ALG001',
+                 lab_nickname=lab.nickname)
+    ])
+    db.session.commit()
+
+    response = client.get(f'/api/labs/{lab.nickname}/calendar.ics')
+
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert body.count('BEGIN:VEVENT') == 1
+    assert f"DTSTART:{today.strftime('%Y%m%d')}T070000Z" in body
+
+
+def test_slot_blocks_skips_unparseable_configured_slots():
+    assert slot_blocks(['07:00', 'M1', 'X'], ['07:00', 'M1', '08:30']) == [(time(7), time(7, 45))]
+
+
+def test_local_timezone_writes_floating_times(app, client, lab):
+    app.config['TIMEZONE'] = 'America/Sao_Paulo'
+    db.session.add(Schedule(date=date.today(), times=['07:00'], user_name='Ana', course_code='ALG001',
+                            lab_nickname=lab.nickname))
+    db.session.commit()
+
+    body = client.get(f'/api/labs/{lab.nickname}/calendar.ics').get_data(as_text=True)
+
+    assert 'TZID=' not in body
+    assert f"DTSTART:{date.today().strftime('%Y%m%d')}T070000\r\n" in body
@@ -0,0 +1,50 @@
+from lumus.config.database import db
+from lumus.models import Course
+
+
+def _create_student(client, headers, course_id, n):
+    return client.post('/api/students', headers=headers, json={
+        'name': f'Student {n}',
+        'email': f'student{n}@lumus.test',
+        'course_id': course_id,
+        'registration_number': f'R{n:04d}'
+    })
+
+
+def test_enrollment_stops_at_capacity(client, auth_headers, course):
+    assert _create_student(client, auth_headers, course.id, 1).status_code == 201
+    assert _create_student(client, auth_headers, course.id, 2).status_code == 201
+
+    response = _create_student(client, auth_headers, course.id, 3)
+
+    assert response.status_code == 409
+    db.session.expire_all()
+    assert db.session.get(Course, course.id).enrolled_count == 2
+
+
+def test_transfer_moves_the_seat(client, auth_headers, course):
+    other = Course(name='Databases', nickname='DB', course_code='DB001', period='2026.1', capacity=1)
+    db.session.add(other)
+    db.session.commit()
+    student_id = _create_student(client, auth_headers, course.id, 1).get_json()['id']
+
+    response = client.put(f'/api/students/{student_id}', headers=auth_headers, json={'course_id': other.id})
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert db.session.get(Course, course.id).enrolled_count == 0
+    assert db.session.get(Course, other.id).enrolled_count == 1
+
+
+def test_transfer_into_full_course_is_rejected(client, auth_headers, course):
+    other = Course(name='Databases', nickname='DB', course_code='DB001', period='2026.1', capacity=1)
+    db.session.add(other)
+    db.session.commit()
+    _create_student(client, auth_headers, other.id, 1)
+    student_id = _create_student(client, auth_headers, course.id, 2).get_json()['id']
+
+    response = client.put(f'/api/students/{student_id}', headers=auth_headers, json={'course_id': other.id})
+
+    assert response.status_code == 409
+    db.session.expire_all()
+    assert db.session.get(Course, course.id).enrolled_count == 1
@@ -0,0 +1,61 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app import create_app
+from lumus.config.config import TestingConfig
+from lumus.config.database import db
+from lumus.models import Course, CourseFullError, Student
+
+
+SEATS = 5
+ATTEMPTS = 40
+
+
+@pytest.fixture
+def shared_app(tmp_path):
+    # Threads need one database they can all see; :memory: is private to each connection.
+    # SQLite already serializes the transactions once the student INSERT takes its write
+    # lock, so point TEST_DATABASE_URL at PostgreSQL to exercise the conditional UPDATE itself.
+    url = os.environ.get('TEST_DATABASE_URL')
+
+    class _Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = url or f"sqlite:///{tmp_path / 'enrollment.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {} if url else {'connect_args': {'timeout': 30}}
+
+    app = create_app(_Config)
+    with app.app_context():
+        db.create_all()
+        course = Course(name='Race', nickname='RACE', course_code='RACE01', period='2026.1', capacity=SEATS)
+        db.session.add(course)
+        db.session.commit()
+        app.config['RACE_COURSE_ID'] = course.id
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+def test_concurrent_enrollment_never_overbooks(shared_app):
+    course_id = shared_app.config['RACE_COURSE_ID']
+    start = threading.Barrier(8)
+
+    def enroll(n):
+        if n < 8:
+            start.wait()
+        with shared_app.app_context():
+            try:
+                db.session.add(Student(name=f'Student {n}', email=f'race{n}@lumus.test', course_id=course_id))
+                db.session.commit()
+                return 'enrolled'
+            except CourseFullError:
+                db.session.rollback()
+                return 'full'
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(enroll, range(ATTEMPTS)))
+
+    with shared_app.app_context():
+        assert db.session.get(Course, course_id).enrolled_count == SEATS
+        assert Student.query.filter_by(course_id=course_id).count() == SEATS
+    assert outcomes.count('enrolled') == SEATS
+    assert outcomes.count('full') == ATTEMPTS - SEATS
@@ -0,0 +1,59 @@
+import pytest
+from lumus.config.database import db
+from lumus.models import Lab
+from lumus.utils.instrumentation import QueryBudgetExceeded, normalize_statement
+
+
+def test_server_timing_header(client, lab):
+    response = client.get('/api/labs')
+
+    assert response.status_code == 200
+    assert 'db;dur=' in response.headers['Server-Timing']
+
+
+def test_strict_mode_fails_requests_over_budget(app, client, lab):
+    db.session.add(Lab(nickname='LAB02', name='Laboratory 02', capacity=20))
+    db.session.commit()
+    app.config['SQL_QUERY_BUDGETS'] = {'lab.get_labs': 2}
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        client.get('/api/labs')
+
+    assert excinfo.value.endpoint == 'lab.get_labs'
+    assert excinfo.value.count > 2
+
+
+def test_budget_only_logged_outside_strict_mode(app, client, lab, caplog):
+    app.config['SQL_QUERY_BUDGET_STRICT'] = False
+    app.config['SQL_QUERY_BUDGETS'] = {'lab.get_labs': 0}
+
+    response = client.get('/api/labs')
+
+    assert response.status_code == 200
+    assert "Endpoint 'lab.get_labs' executed" in caplog.text
+
+
+def test_normalize_statement_collapses_in_lists():
+    statement = 'SELECT *\n  FROM students WHERE id IN (?, ?, ?)'
+
+    assert normalize_statement(statement) == 'SELECT * FROM students WHERE id IN (...)'
+
+
+@pytest.mark.parametrize('path', [
+    '/api/schedules',
+    '/api/schedules/changes?since=0',
+    '/api/schedules/summary',
+    '/api/courses',
+    '/api/students'
+])
+def test_list_endpoints_stay_within_budget(client, auth_headers, course, path):
+    response = client.get(path, headers=auth_headers)
+
+    assert response.status_code == 200
+
+
+def test_query_count_is_per_request(client, lab):
+    first = client.get('/api/labs').headers['Server-Timing']
+    second = client.get('/api/labs').headers['Server-Timing']
+
+    assert first.split('desc=')[1].split(',')[0] == second.split('desc=')[1].split(',')[0]
@@ -0,0 +1,130 @@
+import socket
+from datetime import datetime, timedelta
+import pytest
+from lumus.config.database import db
+from lumus.models import OutboxMessage, OutboxStatus
+from lumus.utils.outbox import dispatch_once
+
+aiosmtpd = pytest.importorskip('aiosmtpd')
+from aiosmtpd.controller import Controller  # noqa: E402
+
+
+class Mailbox:
+    """aiosmtpd handler that stores messages and can refuse them on demand"""
+
+    def __init__(self):
+        self.messages = []
+        self.replies = []
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.replies:
+            return self.replies.pop(0)
+        self.messages.append(envelope)
+        return '250 Message accepted for delivery'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def mailbox(app):
+    handler = Mailbox()
+    controller = Controller(handler, hostname='127.0.0.1', port=_free_port())
+    controller.start()
+    app.config.update(
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=controller.port,
+        MAIL_USE_TLS=False,
+        MAIL_USERNAME=None,
+        OUTBOX_BACKOFF_BASE=60,
+        OUTBOX_MAX_ATTEMPTS=2
+    )
+    yield handler
+    controller.stop()
+
+
+def _enqueue(count=1):
+    messages = [
+        OutboxMessage.enqueue('booking_confirmation', f'user{n}@lumus.test', f'Booking {n}', 'Hello\n')
+        for n in range(count)
+    ]
+    db.session.commit()
+    return messages
+
+
+def _make_due():
+    OutboxMessage.query.update({'next_attempt_at': datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+
+
+def test_delivers_due_messages(app, mailbox):
+    _enqueue(2)
+
+    result = dispatch_once(app)
+
+    assert result == {'sent': 2, 'retried': 0, 'failed': 0}
+    assert sorted(envelope.rcpt_tos[0] for envelope in mailbox.messages) == ['user0@lumus.test', 'user1@lumus.test']
+    assert {message.status for message in OutboxMessage.query.all()} == {OutboxStatus.SENT}
+
+
+def test_rejected_message_backs_off(app, mailbox):
+    mailbox.replies.append('451 Try again later')
+    message, = _enqueue()
+
+    result = dispatch_once(app)
+
+    assert result['retried'] == 1
+    db.session.refresh(message)
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert message.last_error
+    assert message.next_attempt_at >= datetime.utcnow() + timedelta(seconds=25)
+    assert dispatch_once(app) == {'sent': 0, 'retried': 0, 'failed': 0}
+
+    _make_due()
+    assert dispatch_once(app)['sent'] == 1
+    assert len(mailbox.messages) == 1
+
+
+def test_claimed_messages_are_not_claimed_again(app, mailbox):
+    _enqueue(2)
+    claimed = OutboxMessage.claim_batch(limit=10, lease_seconds=300)
+
+    result = dispatch_once(app)
+
+    assert len(claimed) == 2
+    assert result == {'sent': 0, 'retried': 0, 'failed': 0}
+    assert mailbox.messages == []
+
+
+def test_gives_up_after_max_attempts(app, mailbox):
+    mailbox.replies.extend(['554 Rejected', '554 Rejected'])
+    message, = _enqueue()
+
+    assert dispatch_once(app)['retried'] == 1
+    _make_due()
+    assert dispatch_once(app)['failed'] == 1
+
+    db.session.refresh(message)
+    assert message.status == OutboxStatus.FAILED
+    assert message.attempts == 2
+    _make_due()
+    assert dispatch_once(app) == {'sent': 0, 'retried': 0, 'failed': 0}
+
+
+def test_untried_messages_keep_their_attempts_when_the_server_hangs_up(app, mailbox):
+    mailbox.replies.append('421 Closing connection')
+    first, second, third = _enqueue(3)
+
+    result = dispatch_once(app)
+
+    assert result == {'sent': 0, 'retried': 1, 'failed': 0}
+    for message in (first, second, third):
+        db.session.refresh(message)
+    assert first.attempts == 1
+    assert (second.attempts, second.claimed_by) == (0, None)
+    assert (third.attempts, third.claimed_by) == (0, None)
+    assert dispatch_once(app)['sent'] == 2
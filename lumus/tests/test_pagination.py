@@ -0,0 +1,29 @@
+import pytest
+from lumus.config.database import db
+from lumus.models import Student
+
+
+@pytest.fixture
+def students(course):
+    course.capacity = 3
+    db.session.add_all([
+        Student(name=f'Student {n}', email=f'student{n}@lumus.test', course_id=course.id)
+        for n in range(3)
+    ])
+    db.session.commit()
+
+
+def test_total_is_omitted_by_default(client, auth_headers, students):
+    response = client.get('/api/students?per_page=2', headers=auth_headers)
+
+    pagination = response.get_json()['pagination']
+    assert response.status_code == 200
+    assert pagination['has_next'] is True
+    assert pagination['total'] is None
+
+
+@pytest.mark.parametrize('count', ['exact', 'estimate'])
+def test_total_is_opt_in(client, auth_headers, students, count):
+    response = client.get(f'/api/students?per_page=2&count={count}', headers=auth_headers)
+
+    assert response.get_json()['pagination']['total'] == 3
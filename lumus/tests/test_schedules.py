@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.orm.exc import StaleDataError
+from lumus.config.database import db
+from lumus.models import Course, IdempotencyKey, Schedule, ScheduleRollup
+
+
+@pytest.fixture
+def booking(course, lab):
+    return {
+        'date': (date.today() + timedelta(days=3)).isoformat(),
+        'times': ['M1', 'M2'],
+        'user_name': 'Ana',
+        'course_code': course.course_code,
+        'lab_nickname': lab.nickname
+    }
+
+
+def _rollups():
+    return {
+        (row.day, row.dimension, row.key): row.bookings
+        for row in ScheduleRollup.query.all() if row.bookings
+    }
+
+
+def test_idempotent_retry_replays_the_first_response(client, booking):
+    headers = {'Idempotency-Key': 'booking-1'}
+
+    first = client.post('/api/schedules', json=booking, headers=headers)
+    retry = client.post('/api/schedules', json=booking, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json() == first.get_json()
+    assert Schedule.query.count() == 1
+    assert IdempotencyKey.query.count() == 1
+
+
+def test_idempotency_key_reused_with_another_body(client, booking):
+    headers = {'Idempotency-Key': 'booking-1'}
+    client.post('/api/schedules', json=booking, headers=headers)
+
+    response = client.post('/api/schedules', json=dict(booking, times=['N1']), headers=headers)
+
+    assert response.status_code == 422
+    assert Schedule.query.count() == 1
+
+
+def test_failed_validation_does_not_use_up_the_key(client, booking):
+    headers = {'Idempotency-Key': 'booking-1'}
+
+    assert client.post('/api/schedules', json=dict(booking, date='tomorrow'), headers=headers).status_code == 400
+    assert client.post('/api/schedules', json=booking, headers=headers).status_code == 201
+
+
+def test_update_with_stale_if_match_is_rejected(client, auth_headers, booking):
+    schedule_id = client.post('/api/schedules', json=booking).get_json()['id']
+    etag = client.get(f'/api/schedules/{schedule_id}', headers=auth_headers).headers['ETag']
+
+    first = client.put(f'/api/schedules/{schedule_id}', json={'annotation': 'first'},
+                       headers={**auth_headers, 'If-Match': etag})
+    second = client.put(f'/api/schedules/{schedule_id}', json={'annotation': 'second'},
+                        headers={**auth_headers, 'If-Match': etag})
+
+    assert first.status_code == 200
+    assert first.headers['ETag'] != etag
+    assert second.status_code == 412
+    assert db.session.get(Schedule, schedule_id).annotation == 'first'
+
+
+def test_concurrent_course_edit_loses(app, course):
+    stale = db.session.get(Course, course.id)
+    db.session.execute(
+        Course.__table__.update().where(Course.__table__.c.id == course.id).values(version=Course.version + 1)
+    )
+    stale.name = 'Renamed'
+
+    with pytest.raises(StaleDataError):
+        db.session.commit()
+
+
+def test_rollups_follow_schedule_changes(client, auth_headers, booking):
+    schedule_id = client.post('/api/schedules', json=booking).get_json()['id']
+    other_id = client.post('/api/schedules', json=dict(booking, times=['N1'])).get_json()['id']
+    moved = (date.today() + timedelta(days=4)).isoformat()
+    client.put(f'/api/schedules/{schedule_id}', json={'date': moved}, headers=auth_headers)
+    client.put(f'/api/schedules/{other_id}', json={'status': 'cancelled'}, headers=auth_headers)
+    client.delete(f'/api/schedules/{schedule_id}', headers=auth_headers)
+    incremental = _rollups()
+
+    ScheduleRollup.rebuild()
+
+    assert incremental == _rollups()
+
+
+def test_overlapping_booking_is_rejected_and_counted(client, booking):
+    labels = {'lab_nickname': booking['lab_nickname']}
+    before = REGISTRY.get_sample_value('lumus_booking_conflicts_total', labels) or 0
+    client.post('/api/schedules', json=dict(booking, status='confirmed'))
+
+    response = client.post('/api/schedules', json=dict(booking, times=['M2', 'M3']))
+
+    assert response.status_code == 409
+    assert response.get_json()['conflict']['times'] == ['M1', 'M2']
+    assert REGISTRY.get_sample_value('lumus_booking_conflicts_total', labels) == before + 1
+    assert Schedule.query.count() == 1
+
+
+def test_moving_a_booking_onto_a_confirmed_one_is_rejected(client, auth_headers, booking):
+    client.post('/api/schedules', json=dict(booking, status='confirmed'))
+    other = client.post('/api/schedules', json=dict(booking, times=['M3'])).get_json()
+
+    response = client.put(f"/api/schedules/{other['id']}", json={'times': ['M1']}, headers=auth_headers)
+
+    assert response.status_code == 409
+    assert db.session.get(Schedule, other['id']).times == ['M3']
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+import pytest
+from lumus.config.database import db
+from lumus.models import Schedule, Student
+
+
+@pytest.fixture
+def timetable(course, lab):
+    students = [
+        Student(name=f'Student {n}', email=f'student{n}@lumus.test', course_id=course.id)
+        for n in range(2)
+    ]
+    today = date.today()
+    db.session.add_all(students + [
+        Schedule(date=today + timedelta(days=offset), times=['M1'], user_name='Ana',
+                 course_code=course.course_code, lab_nickname=lab.nickname)
+        for offset in (1, 2, 30)
+    ] + [
+        Schedule(date=today, times=['M1'], user_name='Bruno', course_code='OTHER', lab_nickname=lab.nickname)
+    ])
+    db.session.commit()
+    return students
+
+
+def test_course_timetable_lists_schedules_once(client, auth_headers, course, timetable):
+    end = (date.today() + timedelta(days=7)).isoformat()
+
+    response = client.get(f'/api/courses/{course.id}/timetable?end={end}', headers=auth_headers)
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['total_schedules'] == 2
+    assert data['total_students'] == 2
+    assert all('schedules' not in student for student in data['students'])
+
+
+def test_student_timetable(client, auth_headers, course, timetable):
+    response = client.get(f'/api/students/{timetable[0].id}/timetable', headers=auth_headers)
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['student']['id'] == timetable[0].id
+    assert data['total'] == 3
+
+
+def test_unknown_student_timetable(client, auth_headers):
+    assert client.get('/api/students/999/timetable', headers=auth_headers).status_code == 404
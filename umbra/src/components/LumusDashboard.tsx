@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '../components/ui/card';
 import { Button } from '../components/ui/button';
-import { authService, coursesService, studentsService, schedulesService, type User, type Course, type Student, type Schedule } from '../services/lumusService';
+import { authService, coursesService, studentsService, schedulesService, type User, type Course, type Student, type Schedule, type ScheduleSummary } from '../services/lumusService';
 
 interface DashboardProps {
   user: User;
@@ -12,6 +12,7 @@ export const LumusDashboard: React.FC<DashboardProps> = ({ user, onLogout }) =>
   const [courses, setCourses] = useState<Course[]>([]);
   const [students, setStudents] = useState<Student[]>([]);
   const [schedules, setSchedules] = useState<Schedule[]>([]);
+  const [summary, setSummary] = useState<ScheduleSummary | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
@@ -36,6 +37,10 @@ export const LumusDashboard: React.FC<DashboardProps> = ({ user, onLogout }) =>
       const schedulesResponse = await schedulesService.getSchedules({ per_page: 5 });
       setSchedules(schedulesResponse.data);
 
+      // Booking totals come from the daily rollups, not from the bookings themselves
+      const summaryResponse = await schedulesService.getSummary();
+      setSummary(summaryResponse);
+
     } catch (err: any) {
       console.error('Dashboard data loading error:', err);
       setError('Failed to load dashboard data. Please try again.');
@@ -152,9 +157,9 @@ export const LumusDashboard: React.FC<DashboardProps> = ({ user, onLogout }) =>
               <div className="h-4 w-4 text-muted-foreground">🏫</div>
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold">{schedules.length}</div>
+              <div className="text-2xl font-bold">{summary ? summary.bookings : schedules.length}</div>
               <p className="text-xs text-muted-foreground">
-                Recent lab bookings
+                {summary ? `Active lab bookings, ${summary.by_status.pending ?? 0} pending` : 'Recent lab bookings'}
               </p>
             </CardContent>
           </Card>
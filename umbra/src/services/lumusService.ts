@@ -41,6 +41,37 @@ api.interceptors.response.use(
   }
 );
 
+const CREATE_SCHEDULE_ATTEMPTS = 3;
+
+// Timeouts, dropped connections, server errors and in-progress idempotent requests;
+// a 409 that names a conflicting booking will not go away on retry
+const isRetryableError = (error: unknown): boolean => {
+  if (!axios.isAxiosError(error)) {
+    return false;
+  }
+  const status = error.response?.status;
+  if (status === 409) {
+    return !error.response?.data?.conflict;
+  }
+  return status === undefined || status >= 500;
+};
+
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost); getRandomValues works everywhere
+const newIdempotencyKey = (): string => {
+  if (typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+};
+
+// Updates sent with the version that was loaded fail with 412 if someone else saved first
+const ifMatch = (version?: number): Record<string, string> =>
+  version === undefined ? {} : { 'If-Match': `"${version}"` };
+
 // Types for API requests and responses
 export interface LoginData {
   email: string;
@@ -76,6 +107,7 @@ export interface Course {
   period: string;
   capacity: number;
   description?: string;
+  version: number;
   created_at: string;
   updated_at: string;
 }
@@ -103,6 +135,7 @@ export interface Schedule {
   lab_nickname: string;
   status: 'PENDING' | 'CONFIRMED' | 'CANCELLED';
   user_id: string;
+  version: number;
   created_at: string;
   updated_at: string;
 }
@@ -122,13 +155,24 @@ export interface AuthResponse {
   permissions: string[];
 }
 
+export interface ScheduleSummary {
+  start: string | null;
+  end: string | null;
+  bookings: number;
+  by_status: Record<string, number>;
+  by_lab: Record<string, number>;
+  by_course: Record<string, number>;
+  daily: { date: string; bookings: number; by_lab: Record<string, number> }[];
+}
+
 export interface PaginatedResponse<T> {
   data: T[];
   pagination: {
     page: number;
-    pages: number;
+    pages: number | null;
     per_page: number;
-    total: number;
+    total: number | null;
+    has_next: boolean;
   };
 }
 
@@ -244,8 +288,8 @@ export const coursesService = {
     return response.data;
   },
 
-  async updateCourse(id: number, data: Partial<Course>): Promise<Course> {
-    const response = await api.put(`/courses/${id}`, data);
+  async updateCourse(id: number, data: Partial<Course>, version?: number): Promise<Course> {
+    const response = await api.put(`/courses/${id}`, data, { headers: ifMatch(version) });
     return response.data;
   },
 
@@ -318,18 +362,36 @@ export const schedulesService = {
     };
   },
 
+  async getSummary(params?: { start?: string; end?: string }): Promise<ScheduleSummary> {
+    const response = await api.get('/schedules/summary', { params });
+    return response.data;
+  },
+
   async getSchedule(id: number): Promise<Schedule> {
     const response = await api.get(`/schedules/${id}`);
     return response.data;
   },
 
-  async createSchedule(data: Partial<Schedule>): Promise<Schedule> {
-    const response = await api.post('/schedules', data);
-    return response.data;
+  async createSchedule(data: Partial<Schedule>, idempotencyKey: string = newIdempotencyKey()): Promise<Schedule> {
+    // Every attempt sends the same key, so a retry after a lost response replays
+    // the booking that was already made instead of creating a second one
+    for (let attempt = 1; ; attempt++) {
+      try {
+        const response = await api.post('/schedules', data, {
+          headers: { 'Idempotency-Key': idempotencyKey },
+        });
+        return response.data;
+      } catch (error) {
+        if (attempt >= CREATE_SCHEDULE_ATTEMPTS || !isRetryableError(error)) {
+          throw error;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 500 * attempt));
+      }
+    }
   },
 
-  async updateSchedule(id: number, data: Partial<Schedule>): Promise<Schedule> {
-    const response = await api.put(`/schedules/${id}`, data);
+  async updateSchedule(id: number, data: Partial<Schedule>, version?: number): Promise<Schedule> {
+    const response = await api.put(`/schedules/${id}`, data, { headers: ifMatch(version) });
     return response.data;
   },
 